@@ -183,6 +183,17 @@ class CutOffIndicatorAction(Action):
         return isinstance(other, CutOffIndicatorAction)
 
 
+class BudgetExhaustedIndicatorAction(Action):
+    def __init__(self):
+        super().__init__("BudgetExhausted")
+
+    def is_noop(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, BudgetExhaustedIndicatorAction)
+
+
 class NoOpAction(Action):
     def __init__(self):
         super().__init__("NoOp")
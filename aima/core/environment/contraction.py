@@ -0,0 +1,427 @@
+from array import array
+from heapq import heappush, heappop
+import math
+import struct
+import sys
+from aima.core.environment.map import MoveToAction, MapGoalTestFunction, MapStepCostFunction
+from aima.core.search import utils
+from aima.core.search.framework import Search, Node, QueueSearch
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Contraction hierarchies for fast route queries on static maps.
+
+ A hierarchy is built once from an ExtendableMap: locations are ordered by importance and contracted one by one from
+ the least important. When a location is contracted, a shortcut link is added between its neighbours for every
+ shortest path that goes through it, so distances between remaining locations don't change. After that every shortest
+ path can be found by two small Dijkstra searches that move only to more important locations, one from a start and one
+ backward from a goal, which meet at the most important location of the path.
+
+ Shortcuts remember the location they skip, so a found path is unpacked to real map links. Links are priced as
+ MapStepCostFunction does, and queries return the same paths as AStarSearch with MapStepCostFunction, unless a map has
+ several shortest paths between the same locations.
+
+ A hierarchy can be saved to a binary file with save() and loaded with load() without building it again.
+"""
+
+
+class ContractionHierarchy:
+    """
+        Upward links of a contracted map. Every link goes from a less important location to a more important one:
+        forward links are used by a search from a start and backward links (reversed links into a location) by a
+        search from a goal. Links are stored in compressed sparse rows: links of location i are at positions
+        [offsets[i], offsets[i + 1]) of targets, costs and middles arrays. Middle of a shortcut is an id of the
+        location it skips, middle of a map link is -1.
+    """
+    # file header: magic, number of locations, number of forward and backward links and length of location names
+    _HEADER = struct.Struct("<4s4xQQQQ")
+    _MAGIC = b"ACHM"
+
+    def __init__(self, locations, forward, backward):
+        """
+        ContractionHierarchy constructor. Hierarchies should be created with build() or load().
+
+        :param locations (list of str): locations, index of a location is its id
+        :param forward (tuple): arrays (offsets, targets, costs, middles) of forward links
+        :param backward (tuple): arrays (offsets, targets, costs, middles) of backward links
+        """
+        self._locations = locations
+        self._ids = dict((location, i) for i, location in enumerate(locations))
+        self._forward = forward
+        self._backward = backward
+
+    @classmethod
+    def build(cls, map, witness_limit=500):
+        """
+        Build a hierarchy of a map. Locations are contracted in order of their edge difference (number of added
+        shortcuts minus number of removed links) plus a number of already contracted neighbours, so that contraction
+        is spread evenly over a map.
+
+        :param map (ExtendableMap): map to build a hierarchy of
+        :param witness_limit (int): max number of locations settled by a search for a path that makes a shortcut
+        unnecessary. If a search is stopped, a shortcut is added anyway, so small limits make a hierarchy bigger but
+        never wrong.
+        :return (ContractionHierarchy): built hierarchy
+        """
+        locations = sorted(map.get_locations())
+        ids = dict((location, i) for i, location in enumerate(locations))
+        n = len(locations)
+
+        # links between not contracted locations, a dict of target id -> (cost, middle id) for every location
+        outgoing = [{} for i in range(n)]
+        incoming = [{} for i in range(n)]
+        links = map.links
+        for from_location in locations:
+            u = ids[from_location]
+            for to_location, distance in links.get_edges(from_location):
+                v = ids[to_location]
+                if u == v:
+                    continue
+                cost = cls._link_cost(distance)
+                if v not in outgoing[u] or cost < outgoing[u][v][0]:
+                    outgoing[u][v] = (cost, -1)
+                    incoming[v][u] = (cost, -1)
+
+        contracted_neighbours = [0] * n
+        forward = [[] for i in range(n)]
+        backward = [[] for i in range(n)]
+
+        def shortcuts(v):
+            """ Get shortcuts (from, to, cost) that are needed if location v is contracted """
+            result = []
+            if not outgoing[v]:
+                return result
+            max_out = max(cost for cost, middle in outgoing[v].values())
+            for u, (in_cost, in_middle) in incoming[v].items():
+                limit = in_cost + max_out
+                witness = cls._witness_search(outgoing, u, v, limit, witness_limit)
+                for w, (out_cost, out_middle) in outgoing[v].items():
+                    if w == u:
+                        continue
+                    cost = in_cost + out_cost
+                    if witness.get(w, math.inf) > cost:
+                        result.append((u, w, cost))
+            return result
+
+        def priority(v):
+            return len(shortcuts(v)) - len(incoming[v]) - len(outgoing[v]) + contracted_neighbours[v]
+
+        queue = [(priority(v), v) for v in range(n)]
+        queue.sort()
+        while queue:
+            old_priority, v = heappop(queue)
+            # priorities change when neighbours are contracted, so they are updated lazily
+            new_priority = priority(v)
+            if queue and new_priority > queue[0][0]:
+                heappush(queue, (new_priority, v))
+                continue
+
+            for u, w, cost in shortcuts(v):
+                if w not in outgoing[u] or cost < outgoing[u][w][0]:
+                    outgoing[u][w] = (cost, v)
+                    incoming[w][u] = (cost, v)
+
+            # remaining links of a contracted location lead to more important locations
+            for w, (cost, middle) in outgoing[v].items():
+                forward[v].append((w, cost, middle))
+                del incoming[w][v]
+                contracted_neighbours[w] += 1
+            for u, (cost, middle) in incoming[v].items():
+                backward[v].append((u, cost, middle))
+                del outgoing[u][v]
+                contracted_neighbours[u] += 1
+            outgoing[v] = {}
+            incoming[v] = {}
+
+        return cls(locations, cls._to_rows(forward), cls._to_rows(backward))
+
+    @staticmethod
+    def _link_cost(distance):
+        if distance is None or distance <= 0:
+            return MapStepCostFunction.constant_cost
+        return distance
+
+    @staticmethod
+    def _witness_search(outgoing, start, excluded, limit, settle_limit):
+        """
+        Dijkstra search from a location among not contracted locations except one.
+
+        :return (dict): costs of paths to locations that are not longer than a limit
+        """
+        cost = {start: 0}
+        frontier = [(0, start)]
+        settled = 0
+        while frontier and settled < settle_limit:
+            path_cost, u = heappop(frontier)
+            if path_cost > cost[u]:
+                continue
+            if path_cost > limit:
+                break
+            settled += 1
+            for w, (link_cost, middle) in outgoing[u].items():
+                if w == excluded:
+                    continue
+                new_cost = path_cost + link_cost
+                if new_cost < cost.get(w, math.inf):
+                    cost[w] = new_cost
+                    heappush(frontier, (new_cost, w))
+        return cost
+
+    @staticmethod
+    def _to_rows(links):
+        offsets = array("q", [0])
+        targets = array("i")
+        costs = array("d")
+        middles = array("i")
+        for location_links in links:
+            for target, cost, middle in location_links:
+                targets.append(target)
+                costs.append(cost)
+                middles.append(middle)
+            offsets.append(len(targets))
+        return offsets, targets, costs, middles
+
+    def save(self, path):
+        """
+        Save a hierarchy to a file. Numbers are saved in little-endian byte order.
+
+        :param path (str): path of a file
+        :return: None
+        """
+        names = [location.encode("utf-8") for location in self._locations]
+        name_offsets = array("q", [0])
+        for name in names:
+            name_offsets.append(name_offsets[-1] + len(name))
+
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, len(names), len(self._forward[1]), len(self._backward[1]),
+                                      name_offsets[-1]))
+            self._write_array(f, name_offsets)
+            f.write(b"".join(names))
+            for rows in (self._forward, self._backward):
+                for values in rows:
+                    self._write_array(f, values)
+
+    @staticmethod
+    def _write_array(f, values):
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a hierarchy saved with save().
+
+        :param path (str): path of a file
+        :return (ContractionHierarchy): loaded hierarchy
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < cls._HEADER.size:
+            raise ValueError(path + " is not a contraction hierarchy")
+        magic, n, forward_links, backward_links, names_length = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError(path + " is not a contraction hierarchy")
+
+        position = cls._HEADER.size
+
+        def read_array(typecode, length):
+            nonlocal position
+            values = array(typecode)
+            end = position + values.itemsize * length
+            if end > len(data):
+                raise ValueError(path + " is truncated")
+            values.frombytes(data[position:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            position = end
+            return values
+
+        name_offsets = read_array("q", n + 1)
+        names = data[position:position + names_length]
+        position += names_length
+        locations = [names[name_offsets[i]:name_offsets[i + 1]].decode("utf-8") for i in range(n)]
+
+        rows = []
+        for links in (forward_links, backward_links):
+            rows.append((read_array("q", n + 1), read_array("i", links), read_array("d", links),
+                         read_array("i", links)))
+        if position != len(data):
+            raise ValueError(path + " has unexpected data at the end")
+
+        return cls(locations, rows[0], rows[1])
+
+    def get_locations(self):
+        return list(self._locations)
+
+    def get_number_of_links(self):
+        """
+        :return (int): number of upward links including shortcuts
+        """
+        return len(self._forward[1]) + len(self._backward[1])
+
+    def is_location(self, location):
+        return location in self._ids
+
+    def query(self, from_location, to_location):
+        """
+        Find the cheapest path between locations with a bidirectional Dijkstra search on upward links.
+
+        :param from_location (str): start location
+        :param to_location (str): goal location
+        :return: tuple (cost, list of locations of a path without a start location, number of expanded locations), or
+        None if there is no path between locations
+        """
+        source = self._ids.get(from_location)
+        target = self._ids.get(to_location)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return 0, [], 0
+
+        costs = ({source: 0}, {target: 0})
+        parents = ({source: None}, {target: None})
+        frontiers = ([(0, source)], [(0, target)])
+        rows = (self._forward, self._backward)
+        settled = (set(), set())
+        best = math.inf
+        meeting = None
+        expanded = 0
+
+        while frontiers[0] or frontiers[1]:
+            # a search can stop when its cheapest location is not cheaper than the best path, since all paths found
+            # later go through more expensive locations
+            side = None
+            for i in (0, 1):
+                if frontiers[i] and frontiers[i][0][0] < best and \
+                        (side is None or frontiers[i][0][0] < frontiers[side][0][0]):
+                    side = i
+            if side is None:
+                break
+
+            path_cost, u = heappop(frontiers[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            expanded += 1
+
+            other_cost = costs[1 - side].get(u)
+            if other_cost is not None and path_cost + other_cost < best:
+                best = path_cost + other_cost
+                meeting = u
+
+            offsets, targets, link_costs, middles = rows[side]
+            cost = costs[side]
+            parent = parents[side]
+            for i in range(offsets[u], offsets[u + 1]):
+                w = targets[i]
+                new_cost = path_cost + link_costs[i]
+                if new_cost < cost.get(w, math.inf):
+                    cost[w] = new_cost
+                    parent[w] = (u, i)
+                    heappush(frontiers[side], (new_cost, w))
+
+        if meeting is None:
+            return None
+
+        # links from a start to a meeting location and from the meeting location to a goal
+        path = []
+        u = meeting
+        while parents[0][u] is not None:
+            previous, i = parents[0][u]
+            path.append((previous, u, self._forward[3][i]))
+            u = previous
+        path.reverse()
+        u = meeting
+        while parents[1][u] is not None:
+            next_location, i = parents[1][u]
+            path.append((u, next_location, self._backward[3][i]))
+            u = next_location
+
+        locations = []
+        for u, w, middle in path:
+            self._unpack(u, w, middle, locations)
+        return best, [self._locations[i] for i in locations], expanded
+
+    def _unpack(self, u, w, middle, locations):
+        """
+        Append ids of locations of a link's path without its first location.
+        """
+        stack = [(u, w, middle)]
+        while stack:
+            u, w, middle = stack.pop()
+            if middle < 0:
+                locations.append(w)
+            else:
+                # path of the second half is appended after path of the first half
+                stack.append((middle, w, self._find_middle(middle, w)))
+                stack.append((u, middle, self._find_middle(u, middle)))
+
+    def _find_middle(self, u, w):
+        """
+        Find middle of a link from u to w. It's a forward link of u if w is more important than u, otherwise it's a
+        backward link of w.
+        """
+        for source, target, (offsets, targets, costs, middles) in ((u, w, self._forward), (w, u, self._backward)):
+            for i in range(offsets[source], offsets[source + 1]):
+                if targets[i] == target:
+                    return middles[i]
+        raise ValueError("No link between " + self._locations[u] + " and " + self._locations[w])
+
+
+class ContractionHierarchySearch(Search):
+    """
+        Search that answers map queries with a contraction hierarchy. Action, result and step cost functions of a
+        problem are not used and problem's goal test should be a MapGoalTestFunction. It returns MoveToActions for
+        every real map link of a path.
+    """
+    METRIC_NODES_EXPANDED = QueueSearch.METRIC_NODES_EXPANDED
+    METRIC_PATH_COST = QueueSearch.METRIC_PATH_COST
+
+    def __init__(self, hierarchy):
+        """
+        ContractionHierarchySearch constructor
+
+        :param hierarchy (ContractionHierarchy): hierarchy of a map
+        """
+        self._hierarchy = hierarchy
+        self._metrics = {}
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        self._metrics[self.METRIC_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_PATH_COST] = 0
+
+    def get_metrics(self):
+        return self._metrics
+
+    def search(self, problem):
+        """
+        Search for the cheapest path from the problem's initial location to a goal location.
+
+        :param problem: problem on a map with MapGoalTestFunction goal test
+        :return: list of actions to reach the goal, a list with a NoOpAction if initial location is a goal or an empty
+        list if failed to find a solution.
+        """
+        goal_test = problem.get_goal_test()
+        if not isinstance(goal_test, MapGoalTestFunction):
+            raise ValueError("Contraction hierarchy search needs a MapGoalTestFunction goal test")
+
+        self.clear_instrumentation()
+        start = problem.get_initial_state()
+        if start == goal_test.goal:
+            return utils.actions_from_nodes([Node(start)])
+
+        result = self._hierarchy.query(start, goal_test.goal)
+        if result is None:
+            return self._failure()
+
+        cost, locations, expanded = result
+        self._metrics[self.METRIC_NODES_EXPANDED] = expanded
+        self._metrics[self.METRIC_PATH_COST] = cost
+        return [MoveToAction(location) for location in locations]
@@ -0,0 +1,457 @@
+import math
+from heapq import heappush, heappop
+from aima.core.environment.map import MoveToAction, MapGoalTestFunction
+from aima.core.search import utils
+from aima.core.search.framework import StepCostFunction, HeuristicFunction, ActionFunction, Search, Node, \
+    BudgetExhausted, QueueSearch
+from aima.core.util.datastructure import XYLocation
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Maps of uniform-cost grids. Locations are XYLocations of free cells, an agent moves to one of 4 neighbour cells
+ (north, south, east, west) or, on 8-connected grids, also to one of 4 diagonal cells. A straight move costs 1 and a
+ diagonal one costs sqrt(2). A diagonal move is possible only if both straight cells it passes are free, so agents don't
+ cut corners of blocked cells.
+
+ GridMap has the same methods as ExtendableMap that are used by MapEnvironment, and GridActionFunction,
+ GridStepCostFunction and MapResultFunction make a Problem for any search. JumpPointSearch finds optimal paths on grids
+ much faster than A*, since it doesn't expand cells of symmetric paths.
+"""
+
+SQRT2 = math.sqrt(2)
+
+
+class GridMap:
+    """
+        Rectangular grid where every cell is either free or blocked. Occupancy is stored in a bit array, one bit per
+        cell, so large grids take little memory.
+    """
+    def __init__(self, width, height, diagonal=False):
+        """
+        GridMap constructor. All cells of a new grid are free.
+
+        :param width (int): number of columns
+        :param height (int): number of rows
+        :param diagonal (bool): True if an agent can move diagonally (8-connected grid), False for a 4-connected grid
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Grid should have at least one cell")
+
+        self.width = width
+        self.height = height
+        self.diagonal = diagonal
+        self._blocked = bytearray((width * height + 7) // 8)
+
+    def is_blocked_at(self, x, y):
+        """
+        :return (bool): True if a cell is blocked or is out of a grid
+        """
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return True
+        index = y * self.width + x
+        return (self._blocked[index >> 3] >> (index & 7)) & 1 == 1
+
+    def set_blocked_at(self, x, y, blocked=True):
+        index = y * self.width + x
+        if blocked:
+            self._blocked[index >> 3] |= 1 << (index & 7)
+        else:
+            self._blocked[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def set_blocked(self, location, blocked=True):
+        """
+        Block or free a cell.
+
+        :param location (XYLocation): location of a cell
+        :param blocked (bool): True to block a cell, False to free it
+        :return: None
+        """
+        if not self._is_inside(location.x, location.y):
+            raise ValueError("Location " + str(location) + " is out of a grid")
+        self.set_blocked_at(location.x, location.y, blocked)
+
+    def get_locations(self):
+        """
+        :return (list): locations of free cells row by row
+        """
+        return [XYLocation(x, y) for y in range(self.height) for x in range(self.width)
+                if not self.is_blocked_at(x, y)]
+
+    def is_location(self, location):
+        return isinstance(location, XYLocation) and not self.is_blocked_at(location.x, location.y)
+
+    def get_locations_linked_to(self, location):
+        """
+        :param location (XYLocation):
+        :return (list): locations of free cells where an agent can move from a location
+        """
+        return [XYLocation(x, y) for x, y, cost in self.iter_neighbours(location.x, location.y)]
+
+    def get_distance(self, from_location, to_location):
+        """
+        :return (float): cost of a move between neighbour cells, or None if an agent can't move between them
+        """
+        if self.is_blocked_at(from_location.x, from_location.y):
+            return None
+        for x, y, cost in self.iter_neighbours(from_location.x, from_location.y):
+            if x == to_location.x and y == to_location.y:
+                return cost
+        return None
+
+    def iter_neighbours(self, x, y):
+        """
+        :return (iterator): tuples (x, y, cost of a move) of cells where an agent can move from a cell
+        """
+        blocked = self.is_blocked_at
+        for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+            if not blocked(x + dx, y + dy):
+                yield x + dx, y + dy, 1
+
+        if self.diagonal:
+            for dx, dy in ((1, -1), (1, 1), (-1, 1), (-1, -1)):
+                if not blocked(x + dx, y + dy) and not blocked(x + dx, y) and not blocked(x, y + dy):
+                    yield x + dx, y + dy, SQRT2
+
+    def _is_inside(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+
+def create_grid_map(rows, diagonal=False, blocked="#"):
+    """
+    Create a grid from its picture.
+
+    :param rows (list of str): rows of a grid from top to bottom, all rows should have the same length
+    :param diagonal (bool): True if an agent can move diagonally
+    :param blocked (str): character of blocked cells, other characters are free cells
+    :return (GridMap): new grid
+    """
+    grid = GridMap(len(rows[0]), len(rows), diagonal)
+    for y, row in enumerate(rows):
+        if len(row) != grid.width:
+            raise ValueError("All rows should have the same length")
+        for x, cell in enumerate(row):
+            if cell == blocked:
+                grid.set_blocked_at(x, y)
+    return grid
+
+
+class GridActionFunction(ActionFunction):
+    def __init__(self, grid):
+        self.grid = grid
+
+    def actions(self, state):
+        return [MoveToAction(XYLocation(x, y)) for x, y, cost in self.grid.iter_neighbours(state.x, state.y)]
+
+
+class GridStepCostFunction(StepCostFunction):
+    def c(self, state, action, newState):
+        if state.x != newState.x and state.y != newState.y:
+            return SQRT2
+        return 1
+
+
+class ManhattanHeuristicFunction(HeuristicFunction):
+    """
+        Exact distance to a goal on a 4-connected grid without blocked cells.
+    """
+    def __init__(self, goal):
+        self.goal = goal
+
+    def h(self, state):
+        return abs(state.x - self.goal.x) + abs(state.y - self.goal.y)
+
+
+class OctileHeuristicFunction(HeuristicFunction):
+    """
+        Exact distance to a goal on an 8-connected grid without blocked cells: diagonal moves while both coordinates
+        differ, straight moves after that.
+    """
+    def __init__(self, goal):
+        self.goal = goal
+
+    def h(self, state):
+        dx = abs(state.x - self.goal.x)
+        dy = abs(state.y - self.goal.y)
+        return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def grid_heuristic_function(grid, goal):
+    """
+    :return (HeuristicFunction): octile heuristic for 8-connected grids and Manhattan heuristic for 4-connected grids
+    """
+    return OctileHeuristicFunction(goal) if grid.diagonal else ManhattanHeuristicFunction(goal)
+
+
+class JumpPointSearch(Search):
+    """
+        A* on a grid that expands only jump points. Many paths of the same cost lead to a cell on a grid, e.g. all
+        orderings of the same north and east moves. Jump point search considers only one of them: from a cell it moves
+        straight (or diagonally) while no other path through the cell can be shorter, and stops at a goal or at a
+        cell next to a blocked cell where the path has to turn (a jump point). Cells between jump points are never
+        added to a frontier.
+
+        On 8-connected grids straight jumps look for forced turns around blocked cells and diagonal jumps stop at cells
+        from which a straight jump finds a jump point. On 4-connected grids horizontal jumps stop at cells where a path
+        has to turn vertically, and vertical jumps stop at cells from which a horizontal jump finds a jump point.
+
+        Found paths are optimal. A solution contains a MoveToAction for every cell of a path, not only for jump
+        points, so it can be executed by MapEnvironment agents. Problem's goal test should be a MapGoalTestFunction.
+    """
+    METRIC_NODES_EXPANDED = QueueSearch.METRIC_NODES_EXPANDED
+    METRIC_QUEUE_SIZE = QueueSearch.METRIC_QUEUE_SIZE
+    METRIC_MAX_QUEUE_SIZE = QueueSearch.METRIC_MAX_QUEUE_SIZE
+    METRIC_PATH_COST = QueueSearch.METRIC_PATH_COST
+
+    def __init__(self, grid):
+        """
+        JumpPointSearch constructor
+
+        :param grid (GridMap): grid to search in
+        """
+        self._grid = grid
+        self._budget = None
+        self._metrics = {}
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        self._metrics[self.METRIC_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_MAX_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_PATH_COST] = 0
+
+    def get_metrics(self):
+        return self._metrics
+
+    def get_budget(self):
+        return self._budget
+
+    def set_budget(self, budget):
+        self._budget = budget
+
+    def search(self, problem):
+        """
+        Search for the cheapest path from the problem's initial location to a goal location.
+
+        :param problem: problem on a grid with MapGoalTestFunction goal test
+        :return: list of actions to reach the goal, a list with a NoOpAction if initial location is a goal or an empty
+        list if failed to find a solution.
+        """
+        goal_test = problem.get_goal_test()
+        if not isinstance(goal_test, MapGoalTestFunction):
+            raise ValueError("Jump point search needs a MapGoalTestFunction goal test")
+
+        self.clear_instrumentation()
+        grid = self._grid
+        start = problem.get_initial_state()
+        goal = goal_test.goal
+        start_cell = (start.x, start.y)
+        goal_cell = (goal.x, goal.y)
+
+        if start_cell == goal_cell:
+            return utils.actions_from_nodes([Node(start)])
+        if grid.is_blocked_at(start.x, start.y) or grid.is_blocked_at(goal.x, goal.y):
+            return self._failure()
+
+        h = grid_heuristic_function(grid, goal).h
+        jump = self._jump_diagonal if grid.diagonal else self._jump_straight
+        budget = self._budget
+
+        cost = {start_cell: 0}
+        parent = {start_cell: None}
+        closed = set()
+        counter = 0
+        frontier = [(h(start), 0, counter, start_cell)]
+        max_queue_size = 1
+        nodes_expanded = 0
+
+        try:
+            while frontier:
+                f, negative_g, _, cell = heappop(frontier)
+                if cell in closed:
+                    continue
+
+                if cell == goal_cell:
+                    self._metrics[self.METRIC_PATH_COST] = cost[cell]
+                    return self._solution(parent, cell)
+
+                if budget is not None:
+                    budget.expanded(cost.__len__)
+                closed.add(cell)
+                nodes_expanded += 1
+
+                x, y = cell
+                for nx, ny in self._directions(cell, parent[cell]):
+                    jump_point = jump(nx, ny, x, y, goal_cell)
+                    if jump_point is None or jump_point in closed:
+                        continue
+
+                    jx, jy = jump_point
+                    new_cost = cost[cell] + self._distance(x, y, jx, jy)
+                    old_cost = cost.get(jump_point)
+                    if old_cost is not None and old_cost <= new_cost:
+                        continue
+
+                    cost[jump_point] = new_cost
+                    parent[jump_point] = cell
+                    counter += 1
+                    heappush(frontier, (new_cost + h(XYLocation(jx, jy)), -new_cost, counter, jump_point))
+
+                if len(frontier) > max_queue_size:
+                    max_queue_size = len(frontier)
+        except BudgetExhausted:
+            return self._budget_exhausted()
+        finally:
+            self._metrics[self.METRIC_NODES_EXPANDED] = nodes_expanded
+            self._metrics[self.METRIC_QUEUE_SIZE] = len(frontier)
+            self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
+
+        return self._failure()
+
+    def _directions(self, cell, parent_cell):
+        """
+        Get cells in directions a search should jump from a cell: all neighbours for a start cell, otherwise natural
+        and forced neighbours in a direction of the move from a parent.
+
+        :return (list): tuples (x, y) of neighbour cells
+        """
+        x, y = cell
+        blocked = self._grid.is_blocked_at
+        if parent_cell is None:
+            return [(nx, ny) for nx, ny, step_cost in self._grid.iter_neighbours(x, y)]
+
+        dx = (x > parent_cell[0]) - (x < parent_cell[0])
+        dy = (y > parent_cell[1]) - (y < parent_cell[1])
+        directions = []
+
+        if not self._grid.diagonal:
+            if dx != 0:
+                candidates = [(x + dx, y), (x, y - 1), (x, y + 1)]
+            else:
+                candidates = [(x, y + dy), (x - 1, y), (x + 1, y)]
+            return [(nx, ny) for nx, ny in candidates if not blocked(nx, ny)]
+
+        if dx != 0 and dy != 0:
+            vertical = not blocked(x, y + dy)
+            horizontal = not blocked(x + dx, y)
+            if vertical:
+                directions.append((x, y + dy))
+            if horizontal:
+                directions.append((x + dx, y))
+            if vertical and horizontal and not blocked(x + dx, y + dy):
+                directions.append((x + dx, y + dy))
+        elif dx != 0:
+            ahead = not blocked(x + dx, y)
+            for side in (-1, 1):
+                if not blocked(x, y + side):
+                    if ahead and not blocked(x + dx, y + side):
+                        directions.append((x + dx, y + side))
+                    directions.append((x, y + side))
+            if ahead:
+                directions.append((x + dx, y))
+        else:
+            ahead = not blocked(x, y + dy)
+            for side in (-1, 1):
+                if not blocked(x + side, y):
+                    if ahead and not blocked(x + side, y + dy):
+                        directions.append((x + side, y + dy))
+                    directions.append((x + side, y))
+            if ahead:
+                directions.append((x, y + dy))
+
+        return directions
+
+    def _jump_straight(self, x, y, px, py, goal_cell):
+        """
+        Jump on a 4-connected grid from a cell (px, py) through a neighbour cell (x, y).
+
+        :return: tuple (x, y) of a jump point, or None if a jump ends in a blocked cell
+        """
+        blocked = self._grid.is_blocked_at
+        dx = x - px
+        dy = y - py
+
+        while True:
+            if blocked(x, y):
+                return None
+            if (x, y) == goal_cell:
+                return x, y
+
+            if dx != 0:
+                if (not blocked(x, y - 1) and blocked(x - dx, y - 1)) or \
+                        (not blocked(x, y + 1) and blocked(x - dx, y + 1)):
+                    return x, y
+            else:
+                if (not blocked(x - 1, y) and blocked(x - 1, y - dy)) or \
+                        (not blocked(x + 1, y) and blocked(x + 1, y - dy)):
+                    return x, y
+                # vertical moves stop where a horizontal jump finds a jump point
+                if self._jump_straight(x + 1, y, x, y, goal_cell) is not None or \
+                        self._jump_straight(x - 1, y, x, y, goal_cell) is not None:
+                    return x, y
+
+            x += dx
+            y += dy
+
+    def _jump_diagonal(self, x, y, px, py, goal_cell):
+        """
+        Jump on an 8-connected grid from a cell (px, py) through a neighbour cell (x, y).
+
+        :return: tuple (x, y) of a jump point, or None if a jump ends in a blocked cell
+        """
+        blocked = self._grid.is_blocked_at
+        dx = x - px
+        dy = y - py
+
+        while True:
+            if blocked(x, y):
+                return None
+            if (x, y) == goal_cell:
+                return x, y
+
+            if dx != 0 and dy != 0:
+                # diagonal moves stop where a straight jump finds a jump point
+                if self._jump_diagonal(x + dx, y, x, y, goal_cell) is not None or \
+                        self._jump_diagonal(x, y + dy, x, y, goal_cell) is not None:
+                    return x, y
+                # corners of blocked cells can't be cut
+                if blocked(x + dx, y) or blocked(x, y + dy):
+                    return None
+            elif dx != 0:
+                if (not blocked(x, y - 1) and blocked(x - dx, y - 1)) or \
+                        (not blocked(x, y + 1) and blocked(x - dx, y + 1)):
+                    return x, y
+            else:
+                if (not blocked(x - 1, y) and blocked(x - 1, y - dy)) or \
+                        (not blocked(x + 1, y) and blocked(x + 1, y - dy)):
+                    return x, y
+
+            x += dx
+            y += dy
+
+    @staticmethod
+    def _distance(x1, y1, x2, y2):
+        """ Cost of a straight or diagonal jump between cells """
+        dx = abs(x1 - x2)
+        dy = abs(y1 - y2)
+        return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+    def _solution(self, parent, cell):
+        jump_points = []
+        while cell is not None:
+            jump_points.append(cell)
+            cell = parent[cell]
+        jump_points.reverse()
+
+        # cells between jump points are restored to move one cell at a time
+        actions = []
+        for (x1, y1), (x2, y2) in zip(jump_points, jump_points[1:]):
+            dx = (x2 > x1) - (x2 < x1)
+            dy = (y2 > y1) - (y2 < y1)
+            x, y = x1, y1
+            while (x, y) != (x2, y2):
+                x += dx
+                y += dy
+                actions.append(MoveToAction(XYLocation(x, y)))
+        return actions
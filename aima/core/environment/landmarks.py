@@ -0,0 +1,200 @@
+from array import array
+from heapq import heappush, heappop
+import math
+from aima.core.environment.map import MapStepCostFunction
+from aima.core.search.framework import HeuristicFunction
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ ALT heuristic (A*, landmarks and triangle inequality) for maps.
+
+ Distances from a few landmark locations to every location and from every location to landmarks are computed once
+ with Dijkstra searches. By triangle inequality, a path from a location v to a goal t is not shorter than
+ d(L, t) - d(L, v) and d(v, L) - d(t, L) for every landmark L, and the largest of these bounds is an admissible and
+ consistent heuristic. It uses real road lengths, so it's usually much closer to the real distance than a straight
+ line distance of MapHeuristicFunction, and it doesn't need positions of locations.
+
+ If NumPy is installed, distances are kept in NumPy arrays and bounds of all landmarks are computed at once, otherwise
+ distances are kept in arrays of the array module.
+"""
+
+
+class Landmarks:
+    """
+        Distances between landmarks and all locations of a map. Locations have ids in order of get_locations(),
+        distance of a location that can't be reached is infinite.
+    """
+    def __init__(self, locations, landmarks, from_landmarks, to_landmarks):
+        """
+        Landmarks constructor. Landmarks should be created with build().
+
+        :param locations (list): locations of a map, index of a location is its id
+        :param landmarks (list): ids of landmark locations
+        :param from_landmarks: distances from landmarks to locations, k distances of location i start at i * k
+        :param to_landmarks: distances from locations to landmarks in the same order
+        """
+        self._locations = locations
+        self._ids = dict((location, i) for i, location in enumerate(locations))
+        self._landmarks = landmarks
+        self._from_landmarks = from_landmarks
+        self._to_landmarks = to_landmarks
+
+    @classmethod
+    def build(cls, map, number_of_landmarks=8, first_landmark=None):
+        """
+        Select landmarks with farthest point strategy and compute their distances. Every next landmark is the location
+        that is farthest from already selected landmarks, so landmarks lie on the borders of a map. Locations that
+        can't be reached from the first location are selected only if there are no other locations left, so landmarks
+        aren't wasted on small unconnected parts of a map.
+
+        :param map (ExtendableMap): map to compute distances in
+        :param number_of_landmarks (int): max number of landmarks
+        :param first_landmark: location from which the farthest location is selected as the first landmark, by default
+        the first location in sorted order
+        :return (Landmarks): landmarks of a map
+        """
+        locations = sorted(map.get_locations())
+        ids = dict((location, i) for i, location in enumerate(locations))
+        n = len(locations)
+
+        outgoing = [[] for i in range(n)]
+        incoming = [[] for i in range(n)]
+        links = map.links
+        for from_location in locations:
+            u = ids[from_location]
+            for to_location, distance in links.get_edges(from_location):
+                cost = cls._link_cost(distance)
+                outgoing[u].append((ids[to_location], cost))
+                incoming[ids[to_location]].append((u, cost))
+
+        landmarks = []
+        from_landmarks = []
+        to_landmarks = []
+        if n > 0:
+            start = ids[first_landmark] if first_landmark is not None else 0
+            # distance from the nearest selected landmark, the start location isn't a landmark
+            nearest = cls._dijkstra(outgoing, start)
+            while len(landmarks) < min(number_of_landmarks, n):
+                landmark = max((i for i in range(n) if i not in landmarks),
+                               key=lambda i: nearest[i] if nearest[i] < math.inf else -1)
+                landmarks.append(landmark)
+                from_landmark = cls._dijkstra(outgoing, landmark)
+                from_landmarks.append(from_landmark)
+                to_landmarks.append(cls._dijkstra(incoming, landmark))
+                if len(landmarks) == 1:
+                    nearest = from_landmark
+                else:
+                    nearest = [min(a, b) for a, b in zip(nearest, from_landmark)]
+
+        return cls(locations, landmarks, cls._by_location(from_landmarks, n), cls._by_location(to_landmarks, n))
+
+    @staticmethod
+    def _link_cost(distance):
+        if distance is None or distance <= 0:
+            return MapStepCostFunction.constant_cost
+        return distance
+
+    @staticmethod
+    def _dijkstra(adjacency, source):
+        """
+        :return (list): costs of the cheapest paths from a source to every location
+        """
+        cost = [math.inf] * len(adjacency)
+        cost[source] = 0
+        frontier = [(0, source)]
+        while frontier:
+            path_cost, u = heappop(frontier)
+            if path_cost > cost[u]:
+                continue
+            for w, link_cost in adjacency[u]:
+                new_cost = path_cost + link_cost
+                if new_cost < cost[w]:
+                    cost[w] = new_cost
+                    heappush(frontier, (new_cost, w))
+        return cost
+
+    @staticmethod
+    def _by_location(distances, n):
+        """
+        Transpose distances of landmarks, so that distances of a location to all landmarks lie together.
+        """
+        if numpy is not None:
+            return numpy.array(distances, dtype=numpy.float64).reshape(len(distances), n).T.copy()
+
+        k = len(distances)
+        result = array("d", bytes(8 * n * k))
+        for l, landmark_distances in enumerate(distances):
+            result[l::k] = array("d", landmark_distances)
+        return result
+
+    def get_landmarks(self):
+        return [self._locations[i] for i in self._landmarks]
+
+    def get_location_id(self, location):
+        """
+        :return (int): id of a location or None if a location isn't in a map
+        """
+        return self._ids.get(location)
+
+    def get_distances(self, location):
+        """
+        :return: tuple (distances from landmarks to a location, distances from a location to landmarks)
+        """
+        i = self._ids[location]
+        if numpy is not None:
+            return self._from_landmarks[i], self._to_landmarks[i]
+
+        k = len(self._landmarks)
+        return self._from_landmarks[i * k:(i + 1) * k], self._to_landmarks[i * k:(i + 1) * k]
+
+
+class LandmarkHeuristicFunction(HeuristicFunction):
+    """
+        ALT heuristic of a map with a goal location. It returns 0 for locations that aren't in a map, and infinity for
+        locations from which a goal can't be reached according to distances of landmarks.
+    """
+    def __init__(self, landmarks, goal):
+        """
+        LandmarkHeuristicFunction constructor
+
+        :param landmarks (Landmarks): landmarks of a map
+        :param goal: goal location
+        """
+        self.landmarks = landmarks
+        self.goal = goal
+        if landmarks.get_location_id(goal) is None:
+            self._goal_distances = None
+        else:
+            self._goal_distances = landmarks.get_distances(goal)
+
+    def h(self, state):
+        if self._goal_distances is None or self.landmarks.get_location_id(state) is None:
+            return 0
+
+        goal_from, goal_to = self._goal_distances
+        state_from, state_to = self.landmarks.get_distances(state)
+
+        if numpy is not None:
+            # bounds of landmarks that reach neither of locations are NaN (inf - inf) and are ignored by fmax
+            with numpy.errstate(invalid="ignore"):
+                bounds = numpy.fmax(goal_from - state_from, state_to - goal_to)
+            return float(numpy.fmax.reduce(bounds, initial=0.0))
+
+        best = 0
+        for i in range(len(goal_from)):
+            if goal_from[i] != state_from[i]:
+                bound = goal_from[i] - state_from[i]
+                if bound > best:
+                    best = bound
+            if state_to[i] != goal_to[i]:
+                bound = state_to[i] - goal_to[i]
+                if bound > best:
+                    best = bound
+        return best
@@ -2,7 +2,8 @@ import math
 from math import sin, cos
 from aima.core.agent import Action, PerceptToStateFunction, DynamicPercept
 from aima.core.search.framework import StepCostFunction, HeuristicFunction, ResultFunction, GoalTest, ActionFunction
-from aima.core.util.datastructure import LabeledGraph, Point2D
+from aima.core.search.uninformed import DijkstraSearch
+from aima.core.util.datastructure import LabeledGraph, FrozenLabeledGraph, Point2D
 from aima.core.agent import Environment
 
 __author__ = 'Ivan Mushketik'
@@ -19,6 +20,7 @@ class ExtendableMap:
         self.location_positions = {}
 
     def add_location(self, location):
+        self._check_not_frozen()
         self.links.add_vertex(location)
 
     def get_locations(self):
@@ -34,16 +36,20 @@ class ExtendableMap:
         return self.links.get_edge(from_location, to_location)
 
     def add_unidirectional_link(self, from_location, to_location, distance):
+        self._check_not_frozen()
         self.links.set_edge(from_location, to_location, distance)
 
     def add_bidirectional_link(self, from_location, to_location, distance):
+        self._check_not_frozen()
         self.links.set_edge(from_location, to_location, distance)
         self.links.set_edge(to_location, from_location, distance)
 
     def remove_unidirectional_link(self, from_location, to_location):
+        self._check_not_frozen()
         self.links.remove_edge(from_location, to_location)
 
     def remove_bidirectional_link(self, from_location, to_location):
+        self._check_not_frozen()
         self.links.remove_edge(from_location, to_location)
         self.links.remove_edge(to_location, from_location)
 
@@ -55,9 +61,27 @@ class ExtendableMap:
 
     def set_dist_and_dir_to_ref_location(self, location, dist, dir):
         coordinates = Point2D(-sin(dir * math.pi / 180) * dist, cos(dir * math.pi / 180) * dist)
-        self.links.add_vertex(location)
+        self.add_location(location)
         self.location_positions[location] = coordinates
 
+    def freeze(self):
+        """
+        Replace links of a map with a FrozenLabeledGraph. It takes much less memory than dicts of a LabeledGraph and
+        maps with frozen links are faster to search, but locations and links can't be added or removed after that,
+        methods that change them raise ValueError. Distances keep their types if all of them are integers or all of
+        them are floats.
+
+        :return: None
+        """
+        self.links = self.links.freeze()
+
+    def is_frozen(self):
+        return isinstance(self.links, FrozenLabeledGraph)
+
+    def _check_not_frozen(self):
+        if self.is_frozen():
+            raise ValueError("Map is frozen, its locations and links can't be changed")
+
 class MapStepCostFunction(StepCostFunction):
     constant_cost = 1
 
@@ -126,9 +150,52 @@ class MapActionFunction(ActionFunction):
         self.map = map
 
     def actions(self, state):
+        links = self.map.links
+        if isinstance(links, FrozenLabeledGraph):
+            # frozen links of a location are a slice of targets array
+            i = links.get_vertex_id(state)
+            if i is None:
+                return []
+            get_vertex = links.get_vertex
+            return [MoveToAction(get_vertex(target)) for target in links.targets[links.offsets[i]:links.offsets[i + 1]]]
+
         return [MoveToAction(location) for location in self.map.get_locations_linked_to(state)]
 
 
+class MapReverseActionFunction(ActionFunction):
+    """
+        Action function for a backward search on a map. It returns moves to locations from which a specified location
+        can be reached, so it can be used with MapResultFunction. Index of predecessors is built when an object is
+        created, so a new object should be created if map links were changed.
+    """
+    def __init__(self, map):
+        self.map = map
+        self._predecessors = {}
+
+        links = map.links
+        for from_location in links.vertexes():
+            for to_location in links.get_successors(from_location):
+                self._predecessors.setdefault(to_location, []).append(from_location)
+
+    def actions(self, state):
+        return [MoveToAction(location) for location in self._predecessors.get(state, [])]
+
+
+class MapDijkstraSearch(DijkstraSearch):
+    """
+        Uniform cost search on a map that runs directly on map links. It returns MoveToActions and uses the same step
+        costs as MapStepCostFunction.
+    """
+    def __init__(self, map):
+        super().__init__(map.links, MoveToAction)
+
+    def _edge_cost(self, distance):
+        if distance is None or distance <= 0:
+            return MapStepCostFunction.constant_cost
+
+        return distance
+
+
 class MapEnvironmentState:
     def __init__(self):
         self.agent_location = {}
@@ -0,0 +1,413 @@
+from array import array
+from collections.abc import Mapping, Sequence
+import csv
+import math
+import mmap
+import struct
+import sys
+from aima.core.environment.map import ExtendableMap
+from aima.core.util.datastructure import FrozenLabeledGraph, Point2D
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Binary file format of maps that is loaded with mmap, so loading time doesn't depend on a size of a map.
+
+ All numbers are little-endian, every section starts at a multiple of 8 bytes:
+
+   * header: magic "AMAP", version, flags, number of locations n, number of links m and length of the string table
+   * string table: n + 1 offsets (uint64) of location names in a block of UTF-8 names. Names are sorted by their bytes,
+     so a location is found with a binary search and its id is its index in the table
+   * links in compressed sparse rows: n + 1 offsets (uint64) of rows, m target ids (uint32) and m distances (float64).
+     Links of a row are sorted by target ids
+   * positions (if HAS_POSITIONS flag is set): n pairs of x and y (float32), NaN if a location has no position
+
+ save_map() exports an ExtendableMap, import_edge_list() converts a text or CSV file with links line by line without
+ creating a map, and load_map() returns a read only ExtendableMap which links are a MappedLabeledGraph.
+"""
+
+_HEADER = struct.Struct("<4sII4xQQQ")
+_MAGIC = b"AMAP"
+_VERSION = 1
+HAS_POSITIONS = 1
+
+
+def _padding(size):
+    return -size % 8
+
+
+def _write_array(f, values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    data = values.tobytes()
+    f.write(data)
+    f.write(bytes(_padding(len(data))))
+
+
+def _write_map(path, names, offsets, targets, distances, positions):
+    """
+    Write sections of a map file.
+
+    :param names (list of bytes): sorted UTF-8 names of locations
+    :param offsets (array): offsets of rows, "Q" array
+    :param targets (array): target ids of links, "I" array
+    :param distances (array): distances of links, "d" array
+    :param positions (array): x and y of every location, "f" array, or None if a map has no positions
+    """
+    name_offsets = array("Q", [0])
+    for name in names:
+        name_offsets.append(name_offsets[-1] + len(name))
+
+    with open(path, "wb") as f:
+        flags = HAS_POSITIONS if positions is not None else 0
+        f.write(_HEADER.pack(_MAGIC, _VERSION, flags, len(names), len(targets), name_offsets[-1]))
+        _write_array(f, name_offsets)
+        f.write(b"".join(names))
+        f.write(bytes(_padding(name_offsets[-1])))
+        _write_array(f, offsets)
+        _write_array(f, targets)
+        _write_array(f, distances)
+        if positions is not None:
+            _write_array(f, positions)
+
+
+def _link_distance(label):
+    # MapStepCostFunction treats links without a distance as links with non-positive distance
+    if label is None:
+        return 0.0
+    if not isinstance(label, (int, float)):
+        raise ValueError("Distance of a link should be a number, got " + repr(label))
+    return float(label)
+
+
+def save_map(map, path):
+    """
+    Save a map to a binary map file. Links without distance are saved with zero distance, so that
+    MapStepCostFunction gives them the same cost. Positions of locations that have no links aren't saved.
+
+    :param map (ExtendableMap): map with str locations
+    :param path (str): path of a file
+    :return: None
+    """
+    locations = list(map.get_locations())
+    for location in locations:
+        if not isinstance(location, str):
+            raise ValueError("Locations should be strings, got " + repr(location))
+
+    locations.sort(key=lambda location: location.encode("utf-8"))
+    ids = dict((location, i) for i, location in enumerate(locations))
+
+    offsets = array("Q", [0])
+    targets = array("I")
+    distances = array("d")
+    for location in locations:
+        for target, label in sorted((ids[to_location], _link_distance(label))
+                                    for to_location, label in map.links.get_edges(location)):
+            targets.append(target)
+            distances.append(label)
+        offsets.append(len(targets))
+
+    positions = None
+    if map.location_positions:
+        positions = array("f")
+        for location in locations:
+            position = map.location_positions.get(location)
+            if position is None:
+                positions.extend((math.nan, math.nan))
+            else:
+                positions.extend((position.x, position.y))
+
+    _write_map(path, [location.encode("utf-8") for location in locations], offsets, targets, distances, positions)
+
+
+def _read_rows(path, delimiter):
+    """
+    Read rows of a text file: columns are split by whitespace if a delimiter is None, otherwise it's read as CSV.
+    Empty lines and lines that start with # are skipped.
+
+    :return (iterator): tuples (line number, list of columns)
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = (line.split() for line in f) if delimiter is None else csv.reader(f, delimiter=delimiter)
+        for line_number, row in enumerate(rows, 1):
+            if not row or row[0].startswith("#"):
+                continue
+            yield line_number, row
+
+
+def import_edge_list(links_path, path, delimiter=None, bidirectional=False, positions_path=None):
+    """
+    Convert a text file with links to a binary map file. Every line of a links file has a start location, an end
+    location and a distance, e.g. "Arad Sibiu 140" or "Arad,Sibiu,140" with delimiter ",". If there are several links
+    between the same locations, the last one is used, as in ExtendableMap.
+
+    File is read line by line and links are kept in arrays, so a map isn't created in memory.
+
+    :param links_path (str): path of a links file
+    :param path (str): path of a binary map file to write
+    :param delimiter (str): column delimiter of a CSV file, or None if columns are separated by whitespace
+    :param bidirectional (bool): True if every link of a file is a bidirectional link
+    :param positions_path (str): path of a file with lines "location x y" in the same format, or None. Positions of
+    locations that have no links are skipped.
+    :return (int): number of locations in a map
+    """
+    ids = {}
+    sources = array("I")
+    targets = array("I")
+    distances = array("d")
+
+    for line_number, row in _read_rows(links_path, delimiter):
+        if len(row) < 3:
+            raise ValueError(links_path + ":" + str(line_number) + ": expected start, end and distance")
+        try:
+            distance = float(row[2])
+        except ValueError:
+            raise ValueError(links_path + ":" + str(line_number) + ": wrong distance " + repr(row[2]))
+
+        source = ids.setdefault(row[0], len(ids))
+        target = ids.setdefault(row[1], len(ids))
+        sources.append(source)
+        targets.append(target)
+        distances.append(distance)
+        if bidirectional:
+            sources.append(target)
+            targets.append(source)
+            distances.append(distance)
+
+    names = [name.encode("utf-8") for name in ids]
+    del ids
+    order = sorted(range(len(names)), key=names.__getitem__)
+    new_ids = array("I", bytes(4 * len(names)))
+    for new_id, old_id in enumerate(order):
+        new_ids[old_id] = new_id
+    names = [names[old_id] for old_id in order]
+
+    # counting sort of links by their start locations keeps links of a row in file order
+    counts = array("Q", bytes(8 * (len(names) + 1)))
+    for source in sources:
+        counts[new_ids[source] + 1] += 1
+    for i in range(len(names)):
+        counts[i + 1] += counts[i]
+
+    positions_in_rows = array("Q", counts)
+    row_targets = array("I", bytes(4 * len(targets)))
+    row_distances = array("d", bytes(8 * len(targets)))
+    for source, target, distance in zip(sources, targets, distances):
+        source = new_ids[source]
+        i = positions_in_rows[source]
+        row_targets[i] = new_ids[target]
+        row_distances[i] = distance
+        positions_in_rows[source] += 1
+    del sources, targets, distances, positions_in_rows
+
+    # rows are sorted by targets and only the last of links with the same target is kept
+    offsets = array("Q", [0])
+    result_targets = array("I")
+    result_distances = array("d")
+    for i in range(len(names)):
+        row = {}
+        for j in range(counts[i], counts[i + 1]):
+            row[row_targets[j]] = row_distances[j]
+        for target in sorted(row):
+            result_targets.append(target)
+            result_distances.append(row[target])
+        offsets.append(len(result_targets))
+    del row_targets, row_distances
+
+    positions = None
+    if positions_path is not None:
+        name_ids = dict((name, i) for i, name in enumerate(names))
+        positions = array("f", [math.nan]) * (2 * len(names))
+        for line_number, row in _read_rows(positions_path, delimiter):
+            if len(row) < 3:
+                raise ValueError(positions_path + ":" + str(line_number) + ": expected location, x and y")
+            i = name_ids.get(row[0].encode("utf-8"))
+            if i is not None:
+                positions[2 * i] = float(row[1])
+                positions[2 * i + 1] = float(row[2])
+
+    _write_map(path, names, offsets, result_targets, result_distances, positions)
+    return len(names)
+
+
+def load_map(path):
+    """
+    Map a binary map file into memory. Only a header is read, so it takes the same time for maps of any size. Map
+    can't be changed, map.links.close() unmaps a file.
+
+    :param path (str): path of a file written by save_map() or import_edge_list()
+    :return (ExtendableMap): map with MappedLabeledGraph links
+    """
+    links = MappedLabeledGraph(path)
+    map = ExtendableMap()
+    map.links = links
+    map.location_positions = MappedPositions(links)
+    return map
+
+
+class MappedLabeledGraph(FrozenLabeledGraph):
+    """
+        FrozenLabeledGraph which arrays are views of a memory mapped map file. Vertexes are location names, their ids
+        are positions in a sorted string table.
+    """
+    def __init__(self, path):
+        """
+        MappedLabeledGraph constructor
+
+        :param path (str): path of a binary map file
+        """
+        self._path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._map_sections(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _map_sections(self, path):
+        data = self._mmap
+        if len(data) < _HEADER.size:
+            raise ValueError(path + " is not a map file")
+        magic, version, flags, n, m, names_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(path + " is not a map file")
+        if version != _VERSION:
+            raise ValueError(path + " has unsupported version " + str(version))
+
+        self._views = []
+        self._size = n
+        position = _HEADER.size
+
+        def view(typecode, count):
+            nonlocal position
+            end = position + array(typecode).itemsize * count
+            if end > len(data):
+                raise ValueError(path + " is truncated")
+            if sys.byteorder == "little":
+                values = memoryview(data)[position:end].cast(typecode)
+                self._views.append(values)
+            else:
+                values = array(typecode, data[position:end])
+                values.byteswap()
+            position = end + _padding(end)
+            return values
+
+        self._name_offsets = view("Q", n + 1)
+        self._names_start = position
+        position += names_length + _padding(names_length)
+        self.offsets = view("Q", n + 1)
+        self.targets = view("I", m)
+        self.labels = view("d", m)
+        self._positions = view("f", 2 * n) if flags & HAS_POSITIONS else None
+
+    def close(self):
+        """
+        Unmap a map file. Graph can't be used after that. Results of methods of a graph are copies, but if a caller
+        keeps slices of its arrays, a file can't be unmapped, BufferError is raised and a graph stays usable.
+
+        :return: None
+        """
+        try:
+            for values in getattr(self, "_views", ()):
+                values.release()
+            self._mmap.close()
+        except BufferError:
+            # some views were released already, so all of them are created again
+            self._map_sections(self._path)
+            raise
+        self._views = []
+
+    def get_edges(self, vertex):
+        # labels are copied, a zip over a slice of a view would keep a file mapped while it's alive
+        i = self.get_vertex_id(vertex)
+        if i is None:
+            return []
+        start, end = self.offsets[i], self.offsets[i + 1]
+        get_vertex = self.get_vertex
+        return list(zip([get_vertex(target) for target in self.targets[start:end]], self.labels[start:end].tolist()))
+
+    def _name(self, vertex_id):
+        start = self._names_start
+        return self._mmap[start + self._name_offsets[vertex_id]:start + self._name_offsets[vertex_id + 1]]
+
+    def vertexes(self):
+        return MappedVertexes(self)
+
+    def get_vertex(self, vertex_id):
+        return self._name(vertex_id).decode("utf-8")
+
+    def get_vertex_id(self, vertex):
+        if not isinstance(vertex, str):
+            return None
+
+        name = vertex.encode("utf-8")
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._size and self._name(low) == name:
+            return low
+        return None
+
+    def get_position(self, vertex_id):
+        """
+        :return: tuple (x, y) of a location with an id, or None if it has no position
+        """
+        if self._positions is None:
+            return None
+        x, y = self._positions[2 * vertex_id], self._positions[2 * vertex_id + 1]
+        if math.isnan(x):
+            return None
+        return x, y
+
+
+class MappedVertexes(Sequence):
+    """
+        Read only sequence of locations of a MappedLabeledGraph in order of their ids.
+    """
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __len__(self):
+        return self._graph._size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Location index out of range")
+        return self._graph.get_vertex(i)
+
+    def __contains__(self, vertex):
+        return self._graph.get_vertex_id(vertex) is not None
+
+
+class MappedPositions(Mapping):
+    """
+        Read only mapping of locations to Point2D positions stored in a map file.
+    """
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, location):
+        i = self._graph.get_vertex_id(location)
+        position = None if i is None else self._graph.get_position(i)
+        if position is None:
+            raise KeyError(location)
+        return Point2D(position[0], position[1])
+
+    def __iter__(self):
+        graph = self._graph
+        return (graph.get_vertex(i) for i in range(graph._size) if graph.get_position(i) is not None)
+
+    def __len__(self):
+        return sum(1 for location in self)
@@ -1,7 +1,7 @@
 from aima.core.agent import Action
 from aima.core.search.framework import HeuristicFunction, GoalTest, ActionFunction, ResultFunction
 from aima.core.search.local import StateConverter
-from aima.core.util.datastructure import XYLocation
+from aima.core.util.datastructure import XYLocation, ZobristTable
 
 __author__ = 'Ivan Mushketik'
 __docformat__ = 'restructuredtext en'
@@ -11,13 +11,24 @@ class NQueensBoard:
     Queen board that represent state of the N-Queen board task. Each state is a square matrix with size N. Each element
     of the matrix contains either QUEEN or EMPTY. Element state can be accessed either by specifing number of row and column
     or by specifying (x, y) coordinates. X increases left to right and Y increases top to bottom with zero based index.
+
+    Boards are hashable: Zobrist hash of a board is updated by methods that add and remove queens, so squares should
+    be changed only with these methods.
     """
     EMPTY = 0
     QUEEN = 1
 
+    # Zobrist tables by board size
+    _zobrist_tables = {}
+
     def __init__(self, size):
         self.squares = [ [0 for j in range(0, size)] for i in range(0, size)]
         self.size = size
+        self._hash = 0
+
+        self._zobrist = self._zobrist_tables.get(size)
+        if self._zobrist is None:
+            self._zobrist = self._zobrist_tables[size] = ZobristTable(size * size, 1)
 
     def clean(self):
         """
@@ -28,6 +39,12 @@ class NQueensBoard:
         for r in range(0, self.size):
             for c in range(0, self.size):
                 self.squares[r][c] = 0
+        self._hash = 0
+
+    def _set_square(self, r, c, value):
+        if self.squares[r][c] != value:
+            self.squares[r][c] = value
+            self._hash ^= self._zobrist.get(r * self.size + c)
 
     def set_board(self, locations):
         """
@@ -47,7 +64,7 @@ class NQueensBoard:
         :param location (XYLocation): location to set queen into.
         :return: None
         """
-        self.squares[location.y][location.x] = self.QUEEN
+        self._set_square(location.y, location.x, self.QUEEN)
 
     def remove_queen_from(self, location):
         """
@@ -56,7 +73,7 @@ class NQueensBoard:
         :param location (XYLocation): location to remove queen from.
         :return: None
         """
-        self.squares[location.y][location.x] = self.EMPTY
+        self._set_square(location.y, location.x, self.EMPTY)
 
     def move_queen_to(self, location):
         """
@@ -66,8 +83,8 @@ class NQueensBoard:
         :return: None
         """
         for r in range(0, self.size):
-            self.squares[r][location.x] = self.EMPTY
-        self.squares[location.y][location.x] = self.QUEEN
+            self._set_square(r, location.x, self.EMPTY)
+        self._set_square(location.y, location.x, self.QUEEN)
 
     def move_queen(self, from_location, to_location):
         """
@@ -241,6 +258,15 @@ class NQueensBoard:
 
         return str
 
+    def get_key(self):
+        """
+        Get hashable key of a board. Boards are equal if and only if their keys are equal, so a key can be used to keep
+        boards in dicts and sets.
+
+        :return (bytes): squares of a board row by row
+        """
+        return b"".join(bytes(row) for row in self.squares)
+
     def __str__(self):
         return self.get_board_pic()
 
@@ -248,15 +274,11 @@ class NQueensBoard:
         if not isinstance(other, NQueensBoard):
             return False
 
-        if self.size != other.size:
-            return False
-
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.queen_exists_at_square(r, c) != other.queen_exists_at_square(r, c):
-                    return False
+        # boards with different hashes are different, so squares are compared only for equal hashes
+        return self._hash == other._hash and self.size == other.size and self.squares == other.squares
 
-        return True
+    def __hash__(self):
+        return self._hash
 
 class AttackingPairHeuristic(HeuristicFunction):
     def h(self, board):
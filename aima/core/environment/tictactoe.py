@@ -1,6 +1,6 @@
 from aima.core.agent import Environment
 from aima.core.search.adversarial import UtilityFunction, TerminalStateFunction, SuccessorFunction
-from aima.core.util.datastructure import XYLocation
+from aima.core.util.datastructure import XYLocation, ZobristTable
 
 __author__ = 'Ivan Mushketik'
 __docformat__ = 'restructuredtext en'
@@ -9,13 +9,21 @@ class TicTacToeBoard:
     """
     Tic-tac-toe board class that stores tic-tac-toe game state. State is stored as an 2-dimensional array.
     Each element of this array can be either O, or X, or empty
+
+    Boards are hashable: Zobrist hash of a board is updated by methods that mark cells, so cells should be changed
+    only with these methods.
     """
     O = "O"
     X = "X"
     EMPTY = "_"
 
+    # indexes of non-empty values in a Zobrist table
+    _VALUES = {X: 0, O: 1}
+    _zobrist = ZobristTable(9, 2)
+
     def __init__(self):
         self.board = [[self.EMPTY, self.EMPTY, self.EMPTY] for i in range(3)]
+        self._hash = 0
 
     def is_empty(self, row, col):
         """
@@ -45,7 +53,7 @@ class TicTacToeBoard:
         :param row (int):
         :param col (int):
         """
-        self.board[row][col] = self.X
+        self.set_value(row, col, self.X)
 
     def markO(self, row, col):
         """
@@ -54,7 +62,7 @@ class TicTacToeBoard:
         :param row (int):
         :param col (int):
         """
-        self.board[row][col] = self.O
+        self.set_value(row, col, self.O)
 
     def is_any_column_complete(self):
         """
@@ -117,6 +125,11 @@ class TicTacToeBoard:
         :param col (int):
         :param value {X, O, EMPTY}:
         """
+        old_value = self.board[row][col]
+        if old_value != self.EMPTY:
+            self._hash ^= self._zobrist.get(row * 3 + col, self._VALUES[old_value])
+        if value != self.EMPTY:
+            self._hash ^= self._zobrist.get(row * 3 + col, self._VALUES[value])
         self.board[row][col] = value
 
     def clone_board(self):
@@ -126,10 +139,8 @@ class TicTacToeBoard:
         :return (TicTacToeBoard): clone of the current tic-tac-toe board
         """
         new_board = TicTacToeBoard()
-
-        for r in range(3):
-            for c in range(3):
-                new_board.board[r][c] = self.board[r][c]
+        new_board.board = [list(row) for row in self.board]
+        new_board._hash = self._hash
 
         return new_board
 
@@ -166,16 +177,22 @@ class TicTacToeBoard:
     def line_through_board(self):
         return self.is_any_column_complete() or self.is_any_row_complete() or self.is_diagonal_complete()
 
+    def get_key(self):
+        """
+        Get canonical key of a board. Boards are equal if and only if their keys are equal.
+
+        :return (str): cells of a board row by row
+        """
+        return "".join("".join(row) for row in self.board)
+
     def __eq__(self, other):
         if not isinstance(other, TicTacToeBoard):
             return False
 
-        for r in range(3):
-            for c in range(3):
-                if self.board[r][c] != other.board[r][c]:
-                    return False
+        return self._hash == other._hash and self.board == other.board
 
-        return True
+    def __hash__(self):
+        return self._hash
 
     def __str__(self):
         result = ""
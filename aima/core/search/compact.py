@@ -0,0 +1,368 @@
+from array import array
+from aima.core.agent import NoOpAction
+from aima.core.search.framework import Search, QueueSearch
+from aima.core.util.datastructure import FIFOQueue, LIFOQueue, PriorityQueue
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Searches that don't create Node objects. Every state is interned to a dense integer id and search tree is stored
+ column by column in arrays: state id, parent node, action index and path cost of every node. A node of a search tree
+ is just an index in these arrays, so a frontier holds integers and a node takes about 25 bytes instead of a Python
+ object with references that live as long as the node does.
+
+ Action index of a node is a position of its action in a list returned by the action function for the parent's state.
+ Actions are restored only for a solution path by calling the action function again, so action function should
+ return actions in the same order for the same state.
+
+ These searches accept the same framework.Problem as other searches and return the same lists of actions as
+ QueueSearch.search() with GraphSearch.
+"""
+
+
+class StateInterner:
+    """
+        Maps states to dense integer ids (0, 1, 2, ...) in the order states are interned.
+    """
+    def __init__(self, state_key=None):
+        """
+        StateInterner constructor
+
+        :param state_key: function that returns hashable key of a state. It should be set if states are unhashable or
+        if different state objects should be treated as the same state. By default a state is its own key.
+        """
+        self._state_key = state_key
+        self._ids = {}
+        self._states = []
+
+    def intern(self, state):
+        """
+        Get id of a state. New id is assigned to a state that wasn't interned before.
+
+        :param state: state to intern
+        :return (int): id of a state
+        """
+        key = state if self._state_key is None else self._state_key(state)
+        state_id = self._ids.get(key)
+        if state_id is None:
+            state_id = len(self._states)
+            self._ids[key] = state_id
+            self._states.append(state)
+        return state_id
+
+    def get_state(self, state_id):
+        """
+        :param state_id (int): id returned by intern()
+        :return: state that was interned first with this id
+        """
+        return self._states[state_id]
+
+    def __len__(self):
+        return len(self._states)
+
+
+class IntegerStateInterner(StateInterner):
+    """
+        Interner for problems where states are already non-negative integers (e.g. numbered cells of a grid map). State
+        is its own id, so no mapping is stored.
+    """
+    def __init__(self):
+        super().__init__()
+        self._size = 0
+
+    def intern(self, state):
+        if state >= self._size:
+            self._size = state + 1
+        return state
+
+    def get_state(self, state_id):
+        return state_id
+
+    def __len__(self):
+        return self._size
+
+
+class NodeStore:
+    """
+        Search tree stored in arrays. Node is identified by its index, root node has no parent (-1). Indexes are stored
+        as 32-bit integers, so a tree can hold up to 2^31 nodes.
+    """
+    NO_PARENT = -1
+
+    def __init__(self):
+        self.states = array('i')
+        self.parents = array('i')
+        self.actions = array('i')
+        self.path_costs = array('d')
+
+    def add(self, state_id, parent, action_index, path_cost):
+        """
+        Add a node to a search tree.
+
+        :param state_id (int): id of a node's state
+        :param parent (int): index of a parent node or NO_PARENT
+        :param action_index (int): index of an action among actions possible in the parent's state
+        :param path_cost (float): cost of a path from the root node
+        :return (int): index of a new node
+        """
+        self.states.append(state_id)
+        self.parents.append(parent)
+        self.actions.append(action_index)
+        self.path_costs.append(path_cost)
+        return len(self.states) - 1
+
+    def get_path_cost(self, node):
+        return self.path_costs[node]
+
+    def get_depth(self, node):
+        depth = 0
+        parents = self.parents
+        while parents[node] != self.NO_PARENT:
+            node = parents[node]
+            depth += 1
+        return depth
+
+    def get_path_from_root(self, node):
+        """
+        :param node (int): index of a node
+        :return (list): indexes of nodes from the root node to a specified one
+        """
+        path = [node]
+        parents = self.parents
+        while parents[node] != self.NO_PARENT:
+            node = parents[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+    def __len__(self):
+        return len(self.states)
+
+
+class CompactGraphSearch(Search):
+    """
+        Graph search that stores search tree in a NodeStore. Frontier holds indexes of nodes, so any queue from
+        aima.core.util.datastructure can be used: FIFO for breadth first search, LIFO for depth first search and a
+        priority queue ordered by a node path cost for uniform cost search.
+
+        It expands nodes in the same order as GraphSearch does with the same frontier discipline and reports the same
+        metrics.
+    """
+    METRIC_NODES_EXPANDED = QueueSearch.METRIC_NODES_EXPANDED
+    METRIC_QUEUE_SIZE = QueueSearch.METRIC_QUEUE_SIZE
+    METRIC_MAX_QUEUE_SIZE = QueueSearch.METRIC_MAX_QUEUE_SIZE
+    METRIC_PATH_COST = QueueSearch.METRIC_PATH_COST
+    METRIC_NODES_STORED = "nodesStored"
+
+    # state status
+    _UNSEEN = 0
+    _IN_FRONTIER = 1
+    _EXPLORED = 2
+
+    def __init__(self, interner_factory=StateInterner):
+        """
+        CompactGraphSearch constructor
+
+        :param interner_factory: function that creates a new StateInterner for every search
+        """
+        self._interner_factory = interner_factory
+        self._check_goal_before_adding_to_frontier = False
+        self._metrics = {}
+        self._store = NodeStore()
+        self._interner = None
+        self._actions_function = None
+        self.clear_instrumentation()
+
+    def is_check_goal_before_adding_to_frontier(self):
+        return self._check_goal_before_adding_to_frontier
+
+    def set_check_goal_before_adding_to_frontier(self, check_before_adding):
+        self._check_goal_before_adding_to_frontier = check_before_adding
+
+    def clear_instrumentation(self):
+        self._metrics[self.METRIC_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_MAX_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_PATH_COST] = 0
+        self._metrics[self.METRIC_NODES_STORED] = 0
+
+    def get_metrics(self):
+        return self._metrics
+
+    def get_node_store(self):
+        """
+        :return (NodeStore): search tree of the last search
+        """
+        return self._store
+
+    def create_priority_frontier(self):
+        """
+        Create a frontier for uniform cost search: node with the lowest path cost is popped first. It should be used
+        only with this search object.
+
+        :return (PriorityQueue): empty frontier
+        """
+        return PriorityQueue(key=self._node_path_cost)
+
+    def search(self, problem, frontier):
+        """
+        Search for a solution saving indexes of new nodes to a frontier.
+
+        :param problem: problem to solve
+        :param frontier (Datastructures.Queue): queue that implements certain discipline
+        :return: list of actions to reach a goal state, a list with a NoOpAction if initial state is a goal state or
+        an empty list if failed to find a solution.
+        """
+        self.clear_instrumentation()
+        self._store = store = NodeStore()
+        self._interner = interner = self._interner_factory()
+
+        is_goal_state = problem.get_goal_test().is_goal_state
+        self._actions_function = actions_function = problem.get_action_function().actions
+        result_function = problem.get_result_function().result
+        step_cost_function = problem.get_step_cost_function().c
+        check_before_adding = self._check_goal_before_adding_to_frontier
+        replace_costlier = isinstance(frontier, PriorityQueue)
+
+        # status of every state and a frontier node of every state in frontier, both indexed by state id
+        status = bytearray()
+        frontier_node = array('i')
+
+        initial_state = problem.get_initial_state()
+        root_state_id = interner.intern(initial_state)
+        root = store.add(root_state_id, NodeStore.NO_PARENT, -1, 0)
+        if check_before_adding and is_goal_state(initial_state):
+            return self._solution(root)
+
+        self._grow(status, frontier_node, len(interner))
+        status[root_state_id] = self._IN_FRONTIER
+        frontier_node[root_state_id] = root
+        frontier.add(root)
+
+        nodes_expanded = 0
+        max_queue_size = 1
+        try:
+            while not frontier.is_empty():
+                node = frontier.pop()
+                state_id = store.states[node]
+                state = interner.get_state(state_id)
+
+                if not check_before_adding and is_goal_state(state):
+                    return self._solution(node)
+
+                status[state_id] = self._EXPLORED
+                node_cost = store.path_costs[node]
+                nodes_expanded += 1
+
+                for action_index, action in enumerate(actions_function(state)):
+                    new_state = result_function(state, action)
+                    cost = node_cost + step_cost_function(state, action, new_state)
+
+                    new_state_id = interner.intern(new_state)
+                    if new_state_id >= len(status):
+                        self._grow(status, frontier_node, len(interner))
+
+                    new_state_status = status[new_state_id]
+                    if new_state_status == self._EXPLORED:
+                        continue
+                    if new_state_status == self._IN_FRONTIER:
+                        old_node = frontier_node[new_state_id]
+                        if not replace_costlier or store.path_costs[old_node] <= cost:
+                            continue
+                        frontier.remove(old_node)
+
+                    child = store.add(new_state_id, node, action_index, cost)
+                    status[new_state_id] = self._IN_FRONTIER
+                    frontier_node[new_state_id] = child
+
+                    if check_before_adding and is_goal_state(new_state):
+                        return self._solution(child)
+                    frontier.add(child)
+
+                queue_size = frontier.length()
+                if queue_size > max_queue_size:
+                    max_queue_size = queue_size
+        finally:
+            self._metrics[self.METRIC_NODES_EXPANDED] = nodes_expanded
+            self._metrics[self.METRIC_QUEUE_SIZE] = frontier.length()
+            self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
+            self._metrics[self.METRIC_NODES_STORED] = len(store)
+
+        return self._failure()
+
+    def _solution(self, node):
+        self._metrics[self.METRIC_PATH_COST] = self._store.get_path_cost(node)
+
+        store = self._store
+        path = store.get_path_from_root(node)
+        if len(path) == 1:
+            return [NoOpAction()]
+
+        actions = []
+        for i in range(1, len(path)):
+            parent_state = self._interner.get_state(store.states[path[i - 1]])
+            actions.append(list(self._actions_function(parent_state))[store.actions[path[i]]])
+        return actions
+
+    def _node_path_cost(self, node):
+        return self._store.path_costs[node]
+
+    @staticmethod
+    def _grow(status, frontier_node, size):
+        """ Extend per-state arrays so that they can be indexed by ids up to size - 1 """
+        missing = max(size, 2 * len(status)) - len(status)
+        status.extend(bytes(missing))
+        frontier_node.extend(array('i', bytes(4 * missing)))
+
+
+class CompactBreadthFirstSearch(Search):
+    """
+        Breadth first search on top of CompactGraphSearch. Returns the same solutions as BreadthFirstSearch with
+        GraphSearch.
+    """
+    def __init__(self, search=None):
+        if search is None:
+            search = CompactGraphSearch()
+        self._search = search
+        search.set_check_goal_before_adding_to_frontier(True)
+
+    def search(self, problem):
+        return self._search.search(problem, FIFOQueue())
+
+    def get_metrics(self):
+        return self._search.get_metrics()
+
+
+class CompactDepthFirstSearch(Search):
+    """
+        Depth first search on top of CompactGraphSearch. Returns the same solutions as DepthFirstSearch with
+        GraphSearch.
+    """
+    def __init__(self, search=None):
+        if search is None:
+            search = CompactGraphSearch()
+        self._search = search
+
+    def search(self, problem):
+        return self._search.search(problem, LIFOQueue())
+
+    def get_metrics(self):
+        return self._search.get_metrics()
+
+
+class CompactUniformCostSearch(Search):
+    """
+        Uniform cost search on top of CompactGraphSearch. Node with the lowest path cost is explored first, and a
+        frontier node is replaced if a cheaper path to its state is found.
+    """
+    def __init__(self, search=None):
+        if search is None:
+            search = CompactGraphSearch()
+        self._search = search
+
+    def search(self, problem):
+        return self._search.search(problem, self._search.create_priority_frontier())
+
+    def get_metrics(self):
+        return self._search.get_metrics()
@@ -1,7 +1,8 @@
 from abc import ABCMeta
-from aima.core.agent import CutOffIndicatorAction
+from time import perf_counter
+from aima.core.agent import CutOffIndicatorAction, BudgetExhaustedIndicatorAction
 from aima.core.search import utils
-from aima.core.util.datastructure import PriorityQueue
+from aima.core.util.datastructure import PriorityQueue, LRUCache
 
 __author__ = 'Ivan Mushketik'
 __docformat__ = 'restructuredtext en'
@@ -83,7 +84,7 @@ class Problem:
         return self._initialState
 
     def is_goal_state(self, state):
-        return self._goalTest.isGoalTest(state)
+        return self._goalTest.is_goal_state(state)
 
     def get_goal_test(self):
         return self._goalTest
@@ -97,12 +98,48 @@ class Problem:
     def get_step_cost_function(self):
         return self._stepCostFunction
 
+class BidirectionalProblem(Problem):
+    """
+        Problem with a single known goal state that can be searched both from the initial state and from the goal state.
+
+        Reverse action and result functions describe backward steps: reverse_result(state, reverse_action) is a state
+        from which the state can be reached in one forward step. If they aren't specified, the problem is assumed to be
+        reversible and forward functions are used in both directions.
+    """
+    def __init__(self, initialState, goalState, actionsFunction, resultFunction, goalTest, stepCostFunction=None,
+                 reverseActionsFunction=None, reverseResultFunction=None):
+        super().__init__(initialState, actionsFunction, resultFunction, goalTest, stepCostFunction)
+        self._goalState = goalState
+
+        if reverseActionsFunction is not None:
+            self._reverseActionsFunction = reverseActionsFunction
+        else:
+            self._reverseActionsFunction = actionsFunction
+
+        if reverseResultFunction is not None:
+            self._reverseResultFunction = reverseResultFunction
+        else:
+            self._reverseResultFunction = resultFunction
+
+    def get_goal_state(self):
+        return self._goalState
+
+    def get_reverse_action_function(self):
+        return self._reverseActionsFunction
+
+    def get_reverse_result_function(self):
+        return self._reverseResultFunction
+
 # Artificial Intelligence A Modern Approach (3rd Edition): Figure 3.10, page 79
 class Node:
     """
     Node that is created during search in state space. Each node refers a state in a state space, parent node,
     path cost of reaching this node's state and action that was done to explore this node's state.
+
+    Searches keep a lot of nodes alive, so node has no instance dict and stores its depth to build path in linear time.
     """
+    __slots__ = ("_state", "_parent", "_action", "_pathCost", "_depth")
+
     def __init__(self, state, stepCost=0, parent=None, action=None):
         self._state = state        
         self._parent = parent
@@ -110,8 +147,10 @@ class Node:
         
         if parent is not None:
             self._pathCost = parent._pathCost + stepCost
+            self._depth = parent._depth + 1
         else:
             self._pathCost = stepCost
+            self._depth = 0
             
     def get_state(self):
         return self._state
@@ -124,22 +163,39 @@ class Node:
     
     def get_path_cost(self):
         return self._pathCost
+
+    def get_depth(self):
+        """
+        :return (int): number of nodes between the root node and a current one (0 for the root node).
+        """
+        return self._depth
     
     def is_root_node(self):
         return self._parent is None
 
+    def iter_path_to_root(self):
+        """
+        Iterate over nodes from a current node up to the root node.
+
+        :return: iterator over nodes starting with a current one.
+        """
+        node = self
+        while node is not None:
+            yield node
+            node = node._parent
+
     def get_path_from_root(self):
         """
         Get nodes that were explored to reach current node
 
         :return (list): list of nodes from root node to a current one.
         """
-        node = self;
-        path = []
-        
-        while node is not None:
-            path.insert(0, node)
-            node = node.get_parent()
+        path = [None] * (self._depth + 1)
+
+        i = self._depth
+        for node in self.iter_path_to_root():
+            path[i] = node
+            i -= 1
         
         return path
     
@@ -159,12 +215,136 @@ class PathCostFunction:
         return node.get_path_cost()
 
 
+class BudgetExhausted(Exception):
+    """
+        Raised when a search budget is exhausted. Searches catch it and return a budget exhausted result.
+    """
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class SearchBudget:
+    """
+        Limits of a search run: wall-clock deadline, max number of expanded nodes and max number of nodes in memory. A
+        search can also be cancelled from another thread with cancel().
+
+        Searches check a budget every time they expand a node, and when it's exhausted they stop and return a result
+        that is recognized by Search.is_budget_exhausted(). Metrics of a search describe the work done before it
+        stopped. A budget counts expansions of all searches that use it, so one budget can limit several searches
+        (e.g. iterations of an iterative deepening search or both directions of a bidirectional search).
+    """
+    REASON_TIME = "time"
+    REASON_EXPANSIONS = "expansions"
+    REASON_NODES = "nodes"
+    REASON_CANCELLED = "cancelled"
+
+    def __init__(self, time_limit=None, max_expansions=None, max_nodes=None, clock=perf_counter):
+        """
+        SearchBudget constructor. Time limit is counted from a moment when a budget is created or restarted.
+
+        :param time_limit (float): max time in seconds, or None if time is not limited
+        :param max_expansions (int): max number of expanded nodes, or None if it is not limited
+        :param max_nodes (int): max number of nodes that a search keeps in memory, or None if it is not limited
+        :param clock: function that returns current time in seconds
+        """
+        self.time_limit = time_limit
+        self.max_expansions = max_expansions
+        self.max_nodes = max_nodes
+        self._clock = clock
+        self.restart()
+
+    def restart(self):
+        """ Start counting time and expansions from zero """
+        self._deadline = None if self.time_limit is None else self._clock() + self.time_limit
+        self._expansions = 0
+        self._cancelled = False
+        self._reason = None
+
+    def cancel(self):
+        """ Ask searches that use this budget to stop before the next expansion """
+        self._cancelled = True
+
+    def get_expansions(self):
+        return self._expansions
+
+    def is_exhausted(self):
+        """
+        :return (bool): True if a search was stopped by this budget
+        """
+        return self._reason is not None
+
+    def get_exhausted_reason(self):
+        """
+        :return (str): one of REASON_ constants, or None if a budget wasn't exhausted
+        """
+        return self._reason
+
+    def expanded(self, nodes_in_memory=None):
+        """
+        Count an expansion of a node and check the budget. Searches call it before a node is expanded.
+
+        :param nodes_in_memory: function that returns a number of nodes a search keeps in memory, it's called only if
+        a number of nodes is limited
+        :return: None
+        :raise BudgetExhausted: if the budget is exhausted
+        """
+        if self._cancelled:
+            self._exhausted(self.REASON_CANCELLED)
+        if self.max_expansions is not None and self._expansions >= self.max_expansions:
+            self._exhausted(self.REASON_EXPANSIONS)
+        if self._deadline is not None and self._clock() >= self._deadline:
+            self._exhausted(self.REASON_TIME)
+        if self.max_nodes is not None and nodes_in_memory is not None:
+            self.check_nodes(nodes_in_memory())
+        self._expansions += 1
+
+    def check_nodes(self, nodes):
+        """
+        Check that a search doesn't keep more nodes in memory than allowed.
+
+        :param nodes (int): number of nodes in memory
+        :raise BudgetExhausted: if there are too many nodes
+        """
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            self._exhausted(self.REASON_NODES)
+
+    def _exhausted(self, reason):
+        self._reason = reason
+        raise BudgetExhausted(reason)
+
+
 class NodeExpander:
     METRIC_NODES_EXPANDED = "nodesExpanded"
 
     def __init__(self):
         self._metrics = {}
         self._metrics[NodeExpander.METRIC_NODES_EXPANDED] = 0
+
+        self._problem = None
+        self._actions_function = None
+        self._result_function = None
+        self._step_cost_function = None
+        self._budget = None
+
+    def get_budget(self):
+        return self._budget
+
+    def set_budget(self, budget):
+        """
+        Set budget that is checked before every expansion of a node.
+
+        :param budget (SearchBudget): budget, or None if a search isn't limited
+        :return: None
+        """
+        self._budget = budget
+
+    def _get_nodes_in_memory(self):
+        """
+        Get number of nodes a search keeps in memory, it's used to check a budget. Searches that keep more than a few
+        nodes should override it.
+        """
+        return 0
             
     def clear_instrumentation(self):
         self._metrics[NodeExpander.METRIC_NODES_EXPANDED] = 0
@@ -183,22 +363,46 @@ class NodeExpander:
         :param problem:
         :return (list): list of nodes with reachable states
         """
-        childNodes = []
+        return list(self.iter_expand_node(node, problem))
 
-        currentState = node.get_state()
-        actionFunction = problem.get_action_function()
-        resultFunction = problem.get_result_function()
-        stepCostFunction = problem.get_step_cost_function()
+    def iter_expand_node(self, node, problem):
+        """
+        Expand a node lazily: child node is created only when it is requested from a returned iterator, so a search can
+        stop expansion (e.g. when a goal node is found) without creating the rest of children.
 
-        for action in actionFunction.actions(currentState):
-            newState = resultFunction.result(currentState, action)
-            cost = stepCostFunction.c(currentState, action, newState)
-            newNode = Node(newState, cost, node, action)
+        :param node: node to explore
+        :param problem:
+        :return (iterator): iterator over nodes with reachable states
+        """
+        if problem is not self._problem:
+            self._bind_problem(problem)
+        if self._budget is not None:
+            self._budget.expanded(self._get_nodes_in_memory)
+
+        self._metrics[NodeExpander.METRIC_NODES_EXPANDED] += 1
+        return self._generate_child_nodes(node)
+
+    def _bind_problem(self, problem):
+        """
+        Cache problem's functions, so that they aren't looked up for every expanded node. Searches should call it once
+        before a search starts.
+
+        :param problem: problem which nodes are going to be expanded
+        :return: None
+        """
+        self._problem = problem
+        self._actions_function = problem.get_action_function().actions
+        self._result_function = problem.get_result_function().result
+        self._step_cost_function = problem.get_step_cost_function().c
 
-            childNodes.append(newNode)
+    def _generate_child_nodes(self, node):
+        current_state = node.get_state()
+        result_function = self._result_function
+        step_cost_function = self._step_cost_function
 
-        self._metrics[NodeExpander.METRIC_NODES_EXPANDED] = self._metrics[NodeExpander.METRIC_NODES_EXPANDED] + 1
-        return childNodes
+        for action in self._actions_function(current_state):
+            new_state = result_function(current_state, action)
+            yield Node(new_state, step_cost_function(current_state, action, new_state), node, action)
 
 
 class Search(metaclass=ABCMeta):
@@ -231,10 +435,23 @@ class Search(metaclass=ABCMeta):
         """
         return len(result) == 0
 
+    def is_budget_exhausted(self, result):
+        """
+        Check if search ended because its budget was exhausted
+
+        :param result: result of a search
+        :return (bool): True if a budget was exhausted, False otherwise
+        """
+        return (len(result) == 1) and (result[0] == BudgetExhaustedIndicatorAction())
+
     def _cutoff(self):
         """ Return array with a single action that represents that search ended because cut off occured """
         return (CutOffIndicatorAction(),)
 
+    def _budget_exhausted(self):
+        """ Return array with a single action that represents that search ended because its budget was exhausted """
+        return (BudgetExhaustedIndicatorAction(),)
+
     def _failure(self):
         """ Return list that represents that search ended because of failure """
         return []
@@ -254,6 +471,7 @@ class QueueSearch(NodeExpander, Search):
         super().__init__()
         self._check_goal_before_adding_to_frontier = False
         self._frontier = None
+        self._instrumentation = None
         
         self._metrics[self.METRIC_QUEUE_SIZE] = 0
         self._metrics[self.METRIC_PATH_COST] = 0
@@ -271,6 +489,10 @@ class QueueSearch(NodeExpander, Search):
         """
         self._frontier = frontier
         self.clear_instrumentation()
+        self._bind_problem(problem)
+
+        if self._instrumentation is not None:
+            return self._instrumented_search(problem, frontier, self._instrumentation)
 
         root = Node(problem.get_initial_state())
         # check root node before adding to a queue
@@ -279,33 +501,115 @@ class QueueSearch(NodeExpander, Search):
                 self._set_path_cost(root.get_path_cost())
                 return utils.actions_from_nodes(root.get_path_from_root())
 
-        self._add_to_frontier(root)
-        self._set_new_queue_size()
-        # while frontier isn't empty there are still states to check
-        while not self._frontier.is_empty():
-            node_to_expand  = self._pop_node_from_frontier()
-            self._set_new_queue_size()
+        check_before_adding = self._check_goal_before_adding_to_frontier
+        add_to_frontier = self._add_to_frontier
+        pop_node_from_frontier = self._pop_node_from_frontier
+
+        add_to_frontier(root)
+        # queue sizes are kept in local variables and saved to metrics when a search ends
+        queue_size = max_queue_size = frontier.length()
+        try:
+            # while frontier isn't empty there are still states to check
+            while not frontier.is_empty():
+                node_to_expand = pop_node_from_frontier()
+                queue_size = frontier.length()
+
+                # if state shouldn't be checked before adding it's time to check it now
+                if not check_before_adding:
+                    if utils.is_goal_state(problem, node_to_expand):
+                        self._set_path_cost(node_to_expand.get_path_cost())
+                        return utils.actions_from_nodes(node_to_expand.get_path_from_root())
+
+                # Get new nodes, check them and add to a frontier
+                for fn in self.get_resulting_nodes_to_add_to_frontier(node_to_expand, problem):
+                    if check_before_adding:
+                        if utils.is_goal_state(problem, fn):
+                            self._set_path_cost(fn.get_path_cost())
+                            return utils.actions_from_nodes(fn.get_path_from_root())
+
+                    add_to_frontier(fn)
+
+                queue_size = frontier.length()
+                if queue_size > max_queue_size:
+                    max_queue_size = queue_size
+        except BudgetExhausted:
+            return self._budget_exhausted()
+        finally:
+            self._metrics[self.METRIC_QUEUE_SIZE] = queue_size
+            self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
 
-            # if state shouldn't be checked before adding it's time to check it now
-            if not self._check_goal_before_adding_to_frontier:
-                if utils.is_goal_state(problem, node_to_expand):
-                    self._set_path_cost(node_to_expand.get_path_cost())
-                    return utils.actions_from_nodes(node_to_expand.get_path_from_root())
+        # if we are here, all frontier is empty and a goal state wasn't found. Search failed
+        return self._failure()
 
-            # Get new nodes, check them and add to a frontier
-            for fn in self.get_resulting_nodes_to_add_to_frontier(node_to_expand, problem):
-                if self._check_goal_before_adding_to_frontier:
-                    if utils.is_goal_state(problem, fn):
-                        self._set_path_cost(fn.get_path_cost())
-                        return utils.actions_from_nodes(fn.get_path_from_root())
+    def _instrumented_search(self, problem, frontier, instrumentation):
+        """
+        The same search as search() that reports time of every phase and node events to an instrumentation.
+        """
+        clock = instrumentation.clock
+        instrumentation.start()
 
-                self._add_to_frontier(fn)
+        root = Node(problem.get_initial_state())
+        if self._check_goal_before_adding_to_frontier:
+            if instrumentation.goal_test(problem, root):
+                self._set_path_cost(root.get_path_cost())
+                instrumentation.stop()
+                return utils.actions_from_nodes(root.get_path_from_root())
 
-            self._set_new_queue_size()
+        check_before_adding = self._check_goal_before_adding_to_frontier
+        instrumentation.insert(self._add_to_frontier, root)
+        queue_size = max_queue_size = frontier.length()
+        try:
+            while not frontier.is_empty():
+                node_to_expand = instrumentation.pop(self._pop_node_from_frontier)
+                queue_size = frontier.length()
+
+                if not check_before_adding:
+                    if instrumentation.goal_test(problem, node_to_expand):
+                        self._set_path_cost(node_to_expand.get_path_cost())
+                        return utils.actions_from_nodes(node_to_expand.get_path_from_root())
+
+                instrumentation.expanded(node_to_expand)
+                # children are generated lazily, so expansion time is a time of getting every child
+                children = iter(self.get_resulting_nodes_to_add_to_frontier(node_to_expand, problem))
+                while True:
+                    start = clock()
+                    fn = next(children, None)
+                    instrumentation.add_phase_time(instrumentation.PHASE_EXPAND, clock() - start)
+                    if fn is None:
+                        break
+
+                    if check_before_adding:
+                        if instrumentation.goal_test(problem, fn):
+                            self._set_path_cost(fn.get_path_cost())
+                            return utils.actions_from_nodes(fn.get_path_from_root())
+
+                    instrumentation.insert(self._add_to_frontier, fn)
+
+                queue_size = frontier.length()
+                if queue_size > max_queue_size:
+                    max_queue_size = queue_size
+        except BudgetExhausted:
+            return self._budget_exhausted()
+        finally:
+            self._metrics[self.METRIC_QUEUE_SIZE] = queue_size
+            self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
+            instrumentation.stop()
 
-        # if we are here, all frontier is empty and a goal state wasn't found. Search failed
         return self._failure()
 
+    def get_instrumentation(self):
+        return self._instrumentation
+
+    def set_instrumentation(self, instrumentation):
+        """
+        Set instrumentation that profiles searches. Without instrumentation a search runs a loop without any
+        profiling calls.
+
+        :param instrumentation (SearchInstrumentation): instrumentation, or None to turn profiling off
+        :return: None
+        """
+        self._instrumentation = instrumentation
+
     def is_check_goal_before_adding_to_frontier(self):
         return self._check_goal_before_adding_to_frontier
 
@@ -313,6 +617,14 @@ class QueueSearch(NodeExpander, Search):
         self._check_goal_before_adding_to_frontier = check_before_adding
 
     def get_resulting_nodes_to_add_to_frontier(self, node_to_expand, problem):
+        """
+        Expand a node and return new nodes that should be added to a frontier. Returned nodes may be produced lazily,
+        and every node is added to a frontier before the next one is requested.
+
+        :param node_to_expand: node to expand
+        :param problem: problem to solve
+        :return (iterable): nodes to add to a frontier
+        """
         raise NotImplementedError("Queue search is an abstract class")
 
     def clear_instrumentation(self):
@@ -321,14 +633,6 @@ class QueueSearch(NodeExpander, Search):
         self._metrics[self.METRIC_PATH_COST] = 0
         self._metrics[self.METRIC_MAX_QUEUE_SIZE] = 0
 
-    def _set_new_queue_size(self):
-        size = self._frontier.length()
-        self._metrics[self.METRIC_QUEUE_SIZE] = size
-
-        max_size = self._metrics[self.METRIC_MAX_QUEUE_SIZE]
-        if size > max_size:
-            self._metrics[self.METRIC_MAX_QUEUE_SIZE] = size
-
     def get_queue_size(self):
         return self._metrics[self.METRIC_QUEUE_SIZE]
 
@@ -349,6 +653,15 @@ class QueueSearch(NodeExpander, Search):
 
     def _add_to_frontier(self, to_add):
         self._frontier.add(to_add)
+
+    def _get_nodes_in_memory(self):
+        return self._frontier.length()
+
+    def __getstate__(self):
+        # frontier is a state of the last search, it may hold local key functions that can't be pickled
+        state = dict(self.__dict__)
+        state["_frontier"] = None
+        return state
         
  # Artificial Intelligence A Modern Approach (3rd Edition): Figure 3.7, page 77.
  # function TREE-SEARCH(problem) returns a solution, or failure
@@ -367,7 +680,7 @@ class TreeSearch(QueueSearch):
         super().__init__()
 
     def get_resulting_nodes_to_add_to_frontier(self, node_to_expand, problem):
-        return self.expand_node(node_to_expand, problem)
+        return self.iter_expand_node(node_to_expand, problem)
 
 
  # Artificial Intelligence A Modern Approach (3rd Edition): Figure 3.7, page 77.
@@ -388,12 +701,30 @@ class GraphSearch(QueueSearch):
     """
         When this search expand a node it checks if new node's state was explored before. If it was already explored
         new node doesn't added to frontier.
+
+        Explored set and frontier map are keyed by states' keys. By default a state is its own key, so states should
+        be hashable and equal states should have equal hashes. For other states a state key function should be set,
+        e.g. one that returns a canonical tuple or bytes of a state (NQueensBoard.get_key).
     """
-    def __init__(self):
+    def __init__(self, state_key=None):
+        """
+        GraphSearch constructor
+
+        :param state_key: function that returns hashable key of a state, equal states should have equal keys. By
+        default a state is its own key.
+        """
         super().__init__()
         self._explored = set([])
         self._frontier_state = {}
         self._comparator = None
+        self._node_key = None
+        self._state_key = state_key
+
+    def get_state_key(self):
+        return self._state_key
+
+    def set_state_key(self, state_key):
+        self._state_key = state_key
 
     def get_node_comparator(self):
         return self._comparator
@@ -401,6 +732,18 @@ class GraphSearch(QueueSearch):
     def set_node_comparator(self, comparator):
         self._comparator = comparator
 
+    def get_node_key(self):
+        return self._node_key
+
+    def set_node_key(self, node_key):
+        """
+        Set function that calculates priority of a node. If it is set, it's used instead of a node comparator to decide
+        if a new node should replace a node with the same state in a frontier.
+
+        :param node_key: priority function, or None to use node comparator
+        """
+        self._node_key = node_key
+
     def search(self, problem, frontier):
         self._explored = set([])
         self._frontier_state = {}
@@ -408,62 +751,151 @@ class GraphSearch(QueueSearch):
 
     def _pop_node_from_frontier(self):
         to_remove = super()._pop_node_from_frontier()
-        if to_remove.get_state() in self._frontier_state.keys():
-            del self._frontier_state[to_remove.get_state()]
+        self._frontier_state.pop(self._key(to_remove.get_state()), None)
         return to_remove
 
     def _remove_node_from_frontier(self, to_remove):
         removed = super()._remove_node_from_frontier(to_remove)
         if removed:
-            del self._frontier_state[to_remove.get_state()]
+            del self._frontier_state[self._key(to_remove.get_state())]
 
         return removed
 
-    def get_resulting_nodes_to_add_to_frontier(self, node_to_expand, problem):
-        add_to_frontier = []
-        self._explored.add(node_to_expand.get_state())
+    def _key(self, state):
+        return state if self._state_key is None else self._state_key(state)
 
-        for cfn in self.expand_node(node_to_expand, problem):
-            yes_add_to_frontier = False
+    def _get_nodes_in_memory(self):
+        # explored states are kept too
+        return self._frontier.length() + len(self._explored)
 
-            # If node wasn't expanded before - add it to frontier
-            if cfn.get_state() not in self._frontier_state.keys() and cfn.get_state() not in self._explored:
-                yes_add_to_frontier = True
-            # If node was expanded and we want to replace nodes with a smaller state cost ...
-            elif cfn.get_state() in self._frontier_state.keys() and self._comparator != None:
-                frontier_node = self._frontier_state[cfn.get_state()]
+    def get_resulting_nodes_to_add_to_frontier(self, node_to_expand, problem):
+        self._explored.add(self._key(node_to_expand.get_state()))
+        return self._iter_new_frontier_nodes(self.iter_expand_node(node_to_expand, problem))
 
+    def _iter_new_frontier_nodes(self, child_nodes):
+        """
+        Filter expanded nodes, leaving only ones that should be added to a frontier. This generator expects that every
+        returned node is added to a frontier before the next one is requested.
+        """
+        frontier_state = self._frontier_state
+        explored = self._explored
+        can_replace = self._comparator is not None or self._node_key is not None
+        state_key = self._state_key
+
+        for cfn in child_nodes:
+            key = cfn.get_state()
+            if state_key is not None:
+                key = state_key(key)
+
+            if key not in frontier_state:
+                # If node wasn't expanded before - add it to frontier
+                if key in explored:
+                    continue
+            else:
+                # If node is in frontier and we want to replace nodes with a smaller state cost ...
+                if not can_replace:
+                    continue
+
+                frontier_node = frontier_state[key]
                 # ... and new node's state cost is less that old node's state cost ...
-                if self._comparator(cfn, frontier_node) < 0:
-                    # ... add it to frontier
-                    yes_add_to_frontier = True
+                if not self._is_better_than_frontier_node(cfn, frontier_node):
+                    continue
 
-                    self._remove_node_from_frontier(frontier_node)
+                # ... replace old node with a new one
+                self._remove_node_from_frontier(frontier_node)
 
-                    add_to_frontier.remove(frontier_node)
+            frontier_state[key] = cfn
+            yield cfn
 
-            if yes_add_to_frontier:
-                add_to_frontier.append(cfn)
-                self._frontier_state[cfn.get_state()] = cfn
+    def _is_better_than_frontier_node(self, node, frontier_node):
+        if self._node_key is None:
+            return self._comparator.compare(node, frontier_node) < 0
 
-        return add_to_frontier
+        frontier_priority = None
+        if isinstance(self._frontier, PriorityQueue) and self._frontier.get_key_function() is self._node_key:
+            frontier_priority = self._frontier.get_priority(frontier_node)
+        if frontier_priority is None:
+            frontier_priority = self._node_key(frontier_node)
+
+        return self._node_key(node) < frontier_priority
+
+    def __getstate__(self):
+        # comparator and key are set by a priority search for every search, so a pickled search doesn't need them
+        state = super().__getstate__()
+        state["_explored"] = set([])
+        state["_frontier_state"] = {}
+        state["_comparator"] = None
+        state["_node_key"] = None
+        return state
 
 
 class PrioritySearch(Search):
     """
         Base class for searches that use priority queues in queue searches.
+
+        Nodes can be ordered either by a comparator or by a priority key. Priority key of a node is calculated only once
+        when it is added to a frontier, so subclasses should prefer keys to comparators.
     """
+    METRIC_PRIORITY_EVALUATIONS = "priorityEvaluations"
+    METRIC_PRIORITY_EVALUATIONS_SAVED = "priorityEvaluationsSaved"
+
     def __init__(self, queue_search):
         self._search = queue_search
+        self._frontier = None
         super().__init__()
 
     def search(self, problem):
         comparator = self._get_comparator()
+        key = self._get_priority_key()
 
         if isinstance(self._search, GraphSearch):
             self._search.set_node_comparator(comparator)
+            self._search.set_node_key(key)
+
+        self._frontier = self._create_frontier(comparator, key)
+        return self._search.search(problem, self._frontier)
+
+    def get_budget(self):
+        return self._search.get_budget()
+
+    def set_budget(self, budget):
+        self._search.set_budget(budget)
+
+    def get_metrics(self):
+        """
+        Get metrics of a queue search extended with number of calculations of nodes' priorities. Number of saved
+        calculations is an estimate of how many more times a comparator would evaluate nodes if it was used instead of
+        cached priority keys (a comparator evaluates both nodes on every comparison).
+
+        :return (dict): search's metrics
+        """
+        metrics = dict(self._search.get_metrics())
+
+        evaluations = 0
+        saved = 0
+        if isinstance(self._frontier, PriorityQueue):
+            evaluations = self._frontier.get_key_evaluations()
+            if self._get_priority_key() is not None:
+                saved = max(0, 2 * self._frontier.get_heap_levels() - evaluations)
 
-        return self._search.search(problem, PriorityQueue(comparator))
+        metrics[self.METRIC_PRIORITY_EVALUATIONS] = evaluations
+        metrics[self.METRIC_PRIORITY_EVALUATIONS_SAVED] = saved
+        return metrics
+
+    def _create_frontier(self, comparator, key):
+        """
+            Create priority queue that is used as a frontier
+
+            :param comparator: comparator to order nodes in a frontier
+            :param key: function that calculates priority of a node, or None if only comparator should be used
+            :return (Queue): empty frontier
+        """
+        return PriorityQueue(comparator, key)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_frontier"] = None
+        return state
 
     def _get_comparator(self):
         """
@@ -471,6 +903,15 @@ class PrioritySearch(Search):
         """
         raise NotImplementedError()
 
+    def _get_priority_key(self):
+        """
+            Get function that calculates priority of a node (node with the lowest priority is explored first). Priority
+            can be a tuple, e.g. evaluation function result and a tie-breaker.
+
+            :return: priority function, or None if nodes should be ordered by a comparator
+        """
+        return None
+
 # Artificial Intelligence A Modern Approach (3rd Edition): page 92
 class EvaluationFunction(metaclass=ABCMeta):
     def f(self, node):
@@ -479,4 +920,75 @@ class EvaluationFunction(metaclass=ABCMeta):
 # Artificial Intelligence A Modern Approach (3rd Edition): page 92
 class HeuristicFunction(metaclass=ABCMeta):
     def h(self, state):
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+
+class CachingHeuristicFunction(HeuristicFunction):
+    """
+        Heuristic function that remembers values of another heuristic function, so that an expensive heuristic is
+        calculated only once for a state. It can be used by any search that accepts a HeuristicFunction, and the same
+        object can be shared by several searches on the same problem.
+
+        Cache is bounded: when it is full, a value of the least recently used state is evicted.
+    """
+    DEFAULT_MAXSIZE = 100000
+
+    _MISSING = object()
+
+    def __init__(self, heuristic_function, maxsize=DEFAULT_MAXSIZE, state_key=None):
+        """
+        CachingHeuristicFunction constructor
+
+        :param heuristic_function (HeuristicFunction): heuristic function which values are cached
+        :param maxsize (int): max number of cached values, or None if number of values is unbounded
+        :param state_key: function that returns hashable key of a state. It should be set if states are unhashable
+        (e.g. NQueensBoard.get_key for NQueensBoard). By default a state is its own key.
+        """
+        self._heuristic_function = heuristic_function
+        self._maxsize = maxsize
+        self._state_key = state_key
+        self.clear()
+
+    def h(self, state):
+        key = state if self._state_key is None else self._state_key(state)
+
+        value = self._cache.get(key, self._MISSING)
+        if value is self._MISSING:
+            self._misses += 1
+            value = self._heuristic_function.h(state)
+            if self._maxsize is None:
+                self._cache[key] = value
+            else:
+                self._cache.put(key, value)
+        else:
+            self._hits += 1
+
+        return value
+
+    def clear(self):
+        """
+        Remove all cached values and reset counters.
+
+        :return: None
+        """
+        self._cache = {} if self._maxsize is None else LRUCache(self._maxsize)
+        self._hits = 0
+        self._misses = 0
+
+    def get_heuristic_function(self):
+        return self._heuristic_function
+
+    def get_hits(self):
+        """
+        :return (int): number of values that were returned from a cache
+        """
+        return self._hits
+
+    def get_misses(self):
+        """
+        :return (int): number of values that were calculated by a wrapped heuristic function
+        """
+        return self._misses
+
+    def get_cache_size(self):
+        return len(self._cache)
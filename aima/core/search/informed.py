@@ -1,5 +1,9 @@
+import math
+from heapq import heappush, heappop, heapify
+from time import perf_counter
 from aima.core.search import utils
-from aima.core.search.framework import PrioritySearch, EvaluationFunction, PathCostFunction, NodeExpander, Search, Node
+from aima.core.search.framework import PrioritySearch, EvaluationFunction, PathCostFunction, NodeExpander, Search, Node, \
+    BudgetExhausted
 from aima.core.util.other import Comparator, PlusInfinity
 
 __author__ = 'Ivan Mushketik'
@@ -27,6 +31,15 @@ class BestFirstSearch(PrioritySearch):
         comparator = BFSComparator()
         return comparator
 
+    def _get_priority_key(self):
+        ef = self._evaluation_function
+
+        # Among nodes with equal evaluation the deepest one (with the largest path cost) is explored first
+        def priority(node):
+            return (ef.f(node), -node.get_path_cost())
+
+        return priority
+
 
 # Artificial Intelligence A Modern Approach (3rd Edition): page 92.
 class GreedyBestFirstSearchEvaluationFunction(EvaluationFunction):
@@ -34,7 +47,7 @@ class GreedyBestFirstSearchEvaluationFunction(EvaluationFunction):
         self._heuristic_function = heuristic_function
 
     def f(self, node):
-        return self._heuristic_function.f(node)
+        return self._heuristic_function.h(node.get_state())
 
 
 # Artificial Intelligence A Modern Approach (3rd Edition): page 92.
@@ -43,7 +56,7 @@ class GreedyBestFirstSearch(BestFirstSearch):
         BGFS explores nodes with better heuristic function evaluation first.
     """
     def __init__(self, queue_search, heuristic_function):
-        super().__init__(queue_search, GreedyBestFirstSearchEvaluationFunction())
+        super().__init__(queue_search, GreedyBestFirstSearchEvaluationFunction(heuristic_function))
         
 
 # Artificial Intelligence A Modern Approach (3rd Edition): page 93.
@@ -69,6 +82,25 @@ class AStarEvaluationFunction(EvaluationFunction):
         return self._path_cost_function.g(node) + self._heuristic_function.h(node.get_state())
 
 
+class WeightedAStarEvaluationFunction(AStarEvaluationFunction):
+    """
+        A* evaluation function with an inflated heuristic: f(n) = g(n) + w * h(n). With an admissible heuristic a
+        solution found with it costs at most w times more than an optimal one.
+    """
+    def __init__(self, heuristic_function, weight=1.0):
+        super().__init__(heuristic_function)
+        self.weight = weight
+
+    def g(self, node):
+        return self._path_cost_function.g(node)
+
+    def h(self, node):
+        return self._heuristic_function.h(node.get_state())
+
+    def f(self, node):
+        return self.g(node) + self.weight * self.h(node)
+
+
 # Artificial Intelligence A Modern Approach (3rd Edition): page 93.
 class AStarSearch(BestFirstSearch):
     """
@@ -116,7 +148,8 @@ class SearchResult:
 # Figure 3.26 The algorithm for recursive best-first search.
 class RecursiveBestFirstSearch(NodeExpander, Search):
     """
-        Version of A* algorithm that using linear space
+        Version of A* algorithm that using linear space. Only successors of nodes on the current recursion path are
+        kept in memory, and their number is checked against a budget.
     """
     MAX_RECURSIVE_DEPTH = "maxRecursiveDepth"
     PATH_COST = "pathCost"
@@ -124,6 +157,7 @@ class RecursiveBestFirstSearch(NodeExpander, Search):
     def __init__(self, evaluation_function):
         super().__init__()
         self._evaluation_function = evaluation_function
+        self._nodes = 0
 
     def clear_instrumentation(self):
         super().clear_instrumentation()
@@ -136,7 +170,11 @@ class RecursiveBestFirstSearch(NodeExpander, Search):
 
         # RBFS(problem, MAKE-NODE(INITIAL-STATE[problem]), infinity)
         root_node = Node(problem.get_initial_state())
-        sr = self._rbfs(problem, root_node, self._evaluation_function.f(root_node), PlusInfinity(), 0)
+        self._nodes = 0
+        try:
+            sr = self._rbfs(problem, root_node, self._evaluation_function.f(root_node), PlusInfinity(), 0)
+        except BudgetExhausted:
+            return self._budget_exhausted()
 
         if sr.found_solution():
             goal_node = sr.get_solution()
@@ -165,23 +203,28 @@ class RecursiveBestFirstSearch(NodeExpander, Search):
 		# update f with value from previous search, if any
         f = [max(self._evaluation_function.f(node), node_f) for node in successors]
 
-        # repeat
-        while True:
-            # best <- the lowest f-value node in successors
-            best_index = self._get_best_f_value_index(f)
-            # if best.f > f_limit then return failure, best.f
-            if f[best_index] > f_limit:
-                return SearchResult(None, f[best_index])
-
-            # if best.f > f_limit then return failure, best.f
-            alt_index = self._get_next_best_f_value_index(f, best_index)
-            # result, best.f <- RBFS(problem, best, min(f_limit, alternative))
-            sr = self._rbfs(problem, successors[best_index], f[best_index], min(f_limit, f[alt_index]), recursive_depth + 1)
-            f[best_index] = sr.get_f_cost_limit()
-
-            # if result != failure then return result
-            if sr.found_solution():
-                return sr
+        # successors are kept in memory until a node's recursion returns
+        self._nodes += len(successors)
+        try:
+            # repeat
+            while True:
+                # best <- the lowest f-value node in successors
+                best_index = self._get_best_f_value_index(f)
+                # if best.f > f_limit then return failure, best.f
+                if f[best_index] > f_limit:
+                    return SearchResult(None, f[best_index])
+
+                # if best.f > f_limit then return failure, best.f
+                alt_index = self._get_next_best_f_value_index(f, best_index)
+                # result, best.f <- RBFS(problem, best, min(f_limit, alternative))
+                sr = self._rbfs(problem, successors[best_index], f[best_index], min(f_limit, f[alt_index]), recursive_depth + 1)
+                f[best_index] = sr.get_f_cost_limit()
+
+                # if result != failure then return result
+                if sr.found_solution():
+                    return sr
+        finally:
+            self._nodes -= len(successors)
 
     def _get_best_f_value_index(self, f):
         """
@@ -219,5 +262,587 @@ class RecursiveBestFirstSearch(NodeExpander, Search):
         if recursive_depth > max_recursive_depth:
             self._metrics[self.MAX_RECURSIVE_DEPTH] = recursive_depth
 
+    def _get_nodes_in_memory(self):
+        return self._nodes
+
+
+
+# Artificial Intelligence A Modern Approach (3rd Edition): page 99.
+class IterativeDeepeningAStarSearch(NodeExpander, Search):
+    """
+        IDA* works like iterative deepening search, but cutoff is a limit of f-cost instead of depth. Every iteration
+        is a depth first search that doesn't expand nodes with f-cost greater than the current limit, the next limit is
+        the smallest f-cost of a cut off node.
+
+        Depth first search uses an explicit stack of children iterators, so only nodes of the current path are kept in
+        memory and depth isn't limited by Python's recursion limit. Nodes with states that are already on the current
+        path are skipped.
+    """
+    PATH_COST = "pathCost"
+    METRIC_PEAK_NODES = "peakNodes"
+    METRIC_ITERATIONS = "iterations"
+
+    def __init__(self, evaluation_function, state_key=None):
+        """
+        IterativeDeepeningAStarSearch constructor
+
+        :param evaluation_function (EvaluationFunction): function that estimates cost of a solution through a node
+        :param state_key: function that returns hashable key of a state that is used to find cycles. By default a
+        state is its own key.
+        """
+        super().__init__()
+        self._evaluation_function = evaluation_function
+        self._state_key = state_key
+        self._stack = []
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        super().clear_instrumentation()
+        self._metrics[self.PATH_COST] = 0
+        self._metrics[self.METRIC_PEAK_NODES] = 0
+        self._metrics[self.METRIC_ITERATIONS] = 0
+
+    def get_path_cost(self):
+        return self._metrics[self.PATH_COST]
+
+    def get_peak_nodes(self):
+        return self._metrics[self.METRIC_PEAK_NODES]
+
+    def search(self, problem):
+        self.clear_instrumentation()
+        self._bind_problem(problem)
+
+        f = self._evaluation_function.f
+        root = Node(problem.get_initial_state())
+        limit = f(root)
+
+        while True:
+            self._metrics[self.METRIC_ITERATIONS] += 1
+            try:
+                goal_node, limit = self._limited_search(problem, root, limit)
+            except BudgetExhausted:
+                return self._budget_exhausted()
+
+            if goal_node is not None:
+                self._metrics[self.PATH_COST] = goal_node.get_path_cost()
+                return utils.actions_from_nodes(goal_node.get_path_from_root())
+            if limit == math.inf:
+                return self._failure()
+
+    def _limited_search(self, problem, root, limit):
+        """
+        Depth first search that doesn't expand nodes with f-cost greater than a limit.
+
+        :return: goal node or None if it wasn't found, and the smallest f-cost of a cut off node (infinity if no nodes
+        were cut off)
+        """
+        is_goal_state = problem.get_goal_test().is_goal_state
+        f = self._evaluation_function.f
+
+        if is_goal_state(root.get_state()):
+            return root, limit
+
+        next_limit = math.inf
+        path_keys = {self._key(root.get_state())}
+        # every frame is a node of the current path and an iterator over its children that weren't explored yet
+        stack = self._stack = [(root, self.iter_expand_node(root, problem))]
+        peak_nodes = self._metrics[self.METRIC_PEAK_NODES]
+
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+
+            if child is None:
+                stack.pop()
+                path_keys.discard(self._key(node.get_state()))
+                continue
+
+            child_f = f(child)
+            if child_f > limit:
+                if child_f < next_limit:
+                    next_limit = child_f
+                continue
+
+            state = child.get_state()
+            key = self._key(state)
+            if key in path_keys:
+                continue
+            if is_goal_state(state):
+                self._metrics[self.METRIC_PEAK_NODES] = max(peak_nodes, len(stack) + 1)
+                return child, limit
+
+            path_keys.add(key)
+            stack.append((child, self.iter_expand_node(child, problem)))
+            if len(stack) > peak_nodes:
+                peak_nodes = len(stack)
+
+        self._metrics[self.METRIC_PEAK_NODES] = peak_nodes
+        return None, next_limit
+
+    def _get_nodes_in_memory(self):
+        return len(self._stack)
+
+    def _key(self, state):
+        return state if self._state_key is None else self._state_key(state)
+
+
+class _SMAStarEntry:
+    """
+        Node of an SMA* search tree with its backed up f-cost
+    """
+    __slots__ = ("node", "index", "f", "parent", "children", "forgotten", "version")
+
+    def __init__(self, node, index, f, parent):
+        self.node = node
+        # position of a node among children of its parent, it's used to regenerate forgotten children only
+        self.index = index
+        self.f = f
+        self.parent = parent
+        # children in memory, or None if a node is a leaf
+        self.children = None
+        # backed up f-costs of children that aren't in memory by their indexes
+        self.forgotten = {}
+        # incremented every time an entry is added to a frontier, older heap items are outdated
+        self.version = 0
+
+
+class SimplifiedMemoryBoundedAStarSearch(NodeExpander, Search):
+    """
+        SMA* works like A* until a number of nodes in memory reaches a specified limit. To add new nodes it drops the
+        worst leaf (the one with the highest f-cost, and the shallowest among those) and backs up its f-cost to its
+        parent. A node with forgotten children stays in a frontier with the best f-cost of forgotten children, and they
+        are regenerated only if it becomes the best choice again.
+
+        Like RBFS, a node remembers backed up f-costs of its forgotten children, so a regenerated child doesn't repeat
+        exploration of a subtree that was found to be worse. Children with states that are already on the path to a
+        node are cycles, so they are skipped. SMA* finds an optimal solution if the path to it fits into
+        memory. If no solution can be reached with the node limit, search fails. Action function should return actions
+        in the same order for the same state.
+    """
+    PATH_COST = "pathCost"
+    METRIC_PEAK_NODES = "peakNodes"
+    METRIC_NODES_DROPPED = "nodesDropped"
+
+    def __init__(self, evaluation_function, max_nodes):
+        """
+        SimplifiedMemoryBoundedAStarSearch constructor
+
+        :param evaluation_function (EvaluationFunction): function that estimates cost of a solution through a node
+        :param max_nodes (int): max number of nodes in memory, at least 2
+        """
+        if max_nodes < 2:
+            raise ValueError("At least 2 nodes are required")
+
+        super().__init__()
+        self._evaluation_function = evaluation_function
+        self._max_nodes = max_nodes
+        self.clear_instrumentation()
 
+    def clear_instrumentation(self):
+        super().clear_instrumentation()
+        self._metrics[self.PATH_COST] = 0
+        self._metrics[self.METRIC_PEAK_NODES] = 0
+        self._metrics[self.METRIC_NODES_DROPPED] = 0
 
+    def get_path_cost(self):
+        return self._metrics[self.PATH_COST]
+
+    def get_peak_nodes(self):
+        return self._metrics[self.METRIC_PEAK_NODES]
+
+    def search(self, problem):
+        self.clear_instrumentation()
+        self._bind_problem(problem)
+
+        is_goal_state = problem.get_goal_test().is_goal_state
+        f = self._evaluation_function.f
+
+        # Frontier is a heap of leaves and of nodes with forgotten children (the lowest f-cost, the deepest first).
+        # Leaves are also kept in a heap of candidates to drop (the highest f-cost, the shallowest first). Both heaps
+        # remove entries lazily.
+        self._frontier = []
+        self._worst_leaves = []
+        self._counter = 0
+        self._nodes = 1
+
+        root_node = Node(problem.get_initial_state())
+        self._add_to_frontier(_SMAStarEntry(root_node, 0, f(root_node), None))
+        self._metrics[self.METRIC_PEAK_NODES] = 1
+
+        try:
+            return self._memory_bounded_search(problem, is_goal_state, f)
+        except BudgetExhausted:
+            return self._budget_exhausted()
+
+    def _memory_bounded_search(self, problem, is_goal_state, f):
+        while True:
+            best = self._pop_entry(self._frontier)
+            if best is None or self._get_priority(best) == math.inf:
+                return self._failure()
+
+            if best.children is None:
+                if is_goal_state(best.node.get_state()):
+                    self._metrics[self.PATH_COST] = best.node.get_path_cost()
+                    return utils.actions_from_nodes(best.node.get_path_from_root())
+                kept = []
+            else:
+                kept = best.children
+
+            # generate children that aren't in memory, f-cost of a child can't be lower than f-cost of its parent
+            # (pathmax) or its backed up f-cost
+            in_memory = {child.index for child in kept}
+            forgotten = best.forgotten
+            candidates = []
+            for index, child in enumerate(self.iter_expand_node(best.node, problem)):
+                if index in in_memory or self._is_on_path(child.get_state(), best):
+                    continue
+                child_f = max(f(child), best.f, forgotten.get(index, best.f))
+                candidates.append(_SMAStarEntry(child, index, child_f, best))
+
+            # make room for new children dropping the worst leaves of other nodes
+            while self._nodes + len(candidates) > self._max_nodes and self._drop_worst_leaf(best):
+                pass
+
+            # new children compete for the rest of memory with children in memory that are leaves
+            pool = candidates + [child for child in kept if child.children is None]
+            pool.sort(key=lambda entry: entry.f)
+            slots = self._max_nodes - self._nodes + len(pool) - len(candidates)
+
+            best.children = [child for child in kept if child.children is not None]
+            forgotten.clear()
+            for position, entry in enumerate(pool):
+                if position < slots:
+                    if entry.version == 0:
+                        self._nodes += 1
+                        self._add_to_frontier(entry)
+                    best.children.append(entry)
+                else:
+                    if entry.version != 0:
+                        # a leaf in memory is replaced with a better new child
+                        entry.version += 1
+                        self._nodes -= 1
+                    self._metrics[self.METRIC_NODES_DROPPED] += 1
+                    forgotten[entry.index] = entry.f
+
+            if not best.children:
+                # node has no children or memory is filled with a path to it, so no solution can be found through it
+                best.children = None
+                best.f = math.inf
+                forgotten.clear()
+                self._add_to_frontier(best)
+            elif forgotten:
+                self._add_to_frontier(best)
+
+            if self._nodes > self._metrics[self.METRIC_PEAK_NODES]:
+                self._metrics[self.METRIC_PEAK_NODES] = self._nodes
+
+    def _get_nodes_in_memory(self):
+        return self._nodes
+
+    @staticmethod
+    def _is_on_path(state, entry):
+        """ Check if a state is a state of a node or one of its ancestors, i.e. a child with this state is a cycle """
+        while entry is not None:
+            if entry.node.get_state() == state:
+                return True
+            entry = entry.parent
+        return False
+
+    @staticmethod
+    def _get_priority(entry):
+        """ Leaf is explored by its f-cost, other nodes by the best f-cost of forgotten children """
+        if entry.children is None:
+            return entry.f
+        return min(entry.forgotten.values())
+
+    def _add_to_frontier(self, entry):
+        """
+        Add a leaf or a node with forgotten children to a frontier replacing its previous frontier items.
+        """
+        entry.version += 1
+        self._counter += 1
+        depth = entry.node.get_depth()
+        priority = self._get_priority(entry)
+
+        heappush(self._frontier, (priority, -depth, self._counter, entry, entry.version))
+        if entry.children is None:
+            heappush(self._worst_leaves, (-priority, depth, self._counter, entry, entry.version))
+
+    def _drop_worst_leaf(self, expanded):
+        """
+        Remove a leaf with the highest f-cost from memory and back up its f-cost to its parent. Children of the node
+        that is being expanded are not dropped.
+
+        :param expanded (_SMAStarEntry): node that is being expanded
+        :return (bool): True if a leaf was dropped, False if there are no leaves to drop
+        """
+        heap = self._worst_leaves
+        while heap and heap[0][4] != heap[0][3].version:
+            heappop(heap)
+        if not heap or heap[0][3].parent is expanded:
+            return False
+
+        worst = self._pop_entry(heap)
+        parent = worst.parent
+        parent.children.remove(worst)
+        parent.forgotten[worst.index] = worst.f
+        self._nodes -= 1
+        self._metrics[self.METRIC_NODES_DROPPED] += 1
+
+        if not parent.children:
+            # parent becomes a leaf with the best f-cost of its forgotten children
+            parent.children = None
+            parent.f = min(parent.forgotten.values())
+        self._add_to_frontier(parent)
+
+        return True
+
+    @staticmethod
+    def _pop_entry(heap):
+        while heap:
+            item = heappop(heap)
+            entry = item[3]
+            if item[4] == entry.version:
+                # outdate other items of the entry
+                entry.version += 1
+                return entry
+
+        return None
+
+
+# Likhachev, Gordon, Thrun. ARA*: Anytime A* with Provable Bounds on Sub-Optimality (2003).
+class AnytimeWeightedAStarSearch(NodeExpander, Search):
+    """
+        Anytime repairing A* (ARA*). The first solution is found quickly with a weighted A* with a large weight, then
+        the weight is decreased step by step and every iteration improves the best solution. Iterations reuse search
+        effort: nodes that got a cheaper path after they were expanded are kept in an inconsistent list and are moved
+        back to a frontier before the next iteration, and the frontier is only reordered with a new weight.
+
+        Search stops when an iteration with weight 1 is complete (the best solution is optimal) or when a time limit is
+        reached, and returns the best solution found so far. The bound metric is the current suboptimality factor: the
+        best solution costs at most bound times more than an optimal one if the heuristic is admissible.
+    """
+    PATH_COST = "pathCost"
+    METRIC_BOUND = "bound"
+    METRIC_WEIGHT = "weight"
+    METRIC_ITERATIONS = "iterations"
+    METRIC_SOLUTIONS = "solutions"
+
+    def __init__(self, heuristic_function, initial_weight=3.0, weight_step=0.5, time_limit=None, state_key=None,
+                 clock=perf_counter):
+        """
+        AnytimeWeightedAStarSearch constructor
+
+        :param heuristic_function (HeuristicFunction): admissible heuristic function
+        :param initial_weight (float): weight of a heuristic in the first iteration, at least 1
+        :param weight_step (float): how much the weight is decreased after every iteration
+        :param time_limit (float): max time of a search in seconds, or None to search until an optimal solution is found
+        :param state_key: function that returns hashable key of a state. By default a state is its own key.
+        :param clock: function that returns current time in seconds
+        """
+        if initial_weight < 1:
+            raise ValueError("Weight should be at least 1")
+        if weight_step <= 0:
+            raise ValueError("Weight step should be positive")
+
+        super().__init__()
+        self._evaluation_function = WeightedAStarEvaluationFunction(heuristic_function, initial_weight)
+        self._initial_weight = initial_weight
+        self._weight_step = weight_step
+        self._time_limit = time_limit
+        self._state_key = state_key
+        self._clock = clock
+        self._best_node = None
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        super().clear_instrumentation()
+        self._metrics[self.PATH_COST] = 0
+        self._metrics[self.METRIC_BOUND] = math.inf
+        self._metrics[self.METRIC_WEIGHT] = self._initial_weight
+        self._metrics[self.METRIC_ITERATIONS] = 0
+        self._metrics[self.METRIC_SOLUTIONS] = 0
+
+    def get_path_cost(self):
+        return self._metrics[self.PATH_COST]
+
+    def get_bound(self):
+        return self._metrics[self.METRIC_BOUND]
+
+    def get_best_solution(self):
+        """
+        :return (list): actions of the best solution found by the last search, or failure if none was found
+        """
+        if self._best_node is None:
+            return self._failure()
+        return utils.actions_from_nodes(self._best_node.get_path_from_root())
+
+    def search(self, problem):
+        """
+        :return: actions of the best solution found before a search ended. If a budget was exhausted before any
+        solution was found, a budget exhausted result is returned.
+        """
+        for solution in self.iter_search(problem):
+            pass
+        if self._best_node is None and self._budget is not None and self._budget.is_exhausted():
+            return self._budget_exhausted()
+        return self.get_best_solution()
+
+    def iter_search(self, problem):
+        """
+        Search for solutions of a problem, each next solution is cheaper than the previous one. A caller can stop the
+        iteration at any moment and get the best solution and its bound from the search.
+
+        :return (iterator): iterator over actions of improved solutions
+        """
+        self.clear_instrumentation()
+        self._bind_problem(problem)
+        self._best_node = None
+
+        ef = self._evaluation_function
+        ef.weight = self._initial_weight
+        deadline = None if self._time_limit is None else self._clock() + self._time_limit
+
+        # best known node for every generated state and heuristic estimates of them. Frontier is a heap of
+        # (f, -g, counter, node), items with nodes that aren't the best for their states are outdated.
+        self._best = {}
+        self._h = {}
+        self._frontier = []
+        self._inconsistent = {}
+        self._counter = 0
+        self._proven_weight = math.inf
+
+        root = Node(problem.get_initial_state())
+        root_key = self._key(root.get_state())
+        self._best[root_key] = root
+        self._h[root_key] = ef.h(root)
+        self._push(root, root_key)
+
+        while True:
+            self._metrics[self.METRIC_WEIGHT] = ef.weight
+            self._metrics[self.METRIC_ITERATIONS] += 1
+            try:
+                for solution in self._improve_path(problem, deadline):
+                    yield solution
+            except BudgetExhausted:
+                self._update_bound()
+                return
+            self._update_bound()
+
+            if ef.weight == 1 or (deadline is not None and self._clock() >= deadline) or \
+                    (not self._frontier and not self._inconsistent):
+                return
+
+            ef.weight = max(1, ef.weight - self._weight_step)
+            self._reorder_frontier()
+
+    def _improve_path(self, problem, deadline):
+        """
+        Weighted A* iteration that expands nodes while they can lead to a solution cheaper than the best one.
+        """
+        is_goal_state = problem.get_goal_test().is_goal_state
+        best = self._best
+        frontier = self._frontier
+        inconsistent = self._inconsistent
+        closed = set()
+        clock = self._clock
+
+        while frontier:
+            f, negative_g, counter, node = frontier[0]
+            if self._best_node is not None and f >= self._best_node.get_path_cost():
+                break
+            if deadline is not None and clock() >= deadline:
+                return
+
+            heappop(frontier)
+            state = node.get_state()
+            key = self._key(state)
+            if best[key] is not node:
+                continue
+
+            if is_goal_state(state):
+                if self._best_node is None or node.get_path_cost() < self._best_node.get_path_cost():
+                    self._best_node = node
+                    self._metrics[self.PATH_COST] = node.get_path_cost()
+                    self._metrics[self.METRIC_SOLUTIONS] += 1
+                    self._update_bound()
+                    yield utils.actions_from_nodes(node.get_path_from_root())
+                continue
+
+            try:
+                children = self.iter_expand_node(node, problem)
+            except BudgetExhausted:
+                # node wasn't expanded, so it's returned to a frontier to get a correct bound
+                self._push(node, key)
+                raise
+
+            closed.add(key)
+            for child in children:
+                child_key = self._key(child.get_state())
+                known = best.get(child_key)
+                if known is not None and known.get_path_cost() <= child.get_path_cost():
+                    continue
+
+                best[child_key] = child
+                if known is None:
+                    self._h[child_key] = self._evaluation_function.h(child)
+                if child_key in closed:
+                    inconsistent[child_key] = child
+                else:
+                    self._push(child, child_key)
+
+        # the best solution is proven to cost at most weight times more than an optimal one only when an iteration ends
+        self._proven_weight = self._evaluation_function.weight
+
+    def _get_nodes_in_memory(self):
+        return len(self._best)
+
+    def _push(self, node, key):
+        g = node.get_path_cost()
+        self._counter += 1
+        heappush(self._frontier, (g + self._evaluation_function.weight * self._h[key], -g, self._counter, node))
+
+    def _reorder_frontier(self):
+        """ Move inconsistent nodes to a frontier and order it with a new weight, dropping outdated items """
+        best = self._best
+        weight = self._evaluation_function.weight
+        h = self._h
+        frontier = []
+        for item in self._frontier:
+            node = item[3]
+            key = self._key(node.get_state())
+            if best[key] is node:
+                frontier.append((node.get_path_cost() + weight * h[key],) + item[1:])
+        for key, node in self._inconsistent.items():
+            self._counter += 1
+            frontier.append((node.get_path_cost() + weight * h[key], -node.get_path_cost(), self._counter, node))
+        self._inconsistent.clear()
+
+        heapify(frontier)
+        self._frontier = frontier
+
+    def _update_bound(self):
+        """
+        Suboptimality bound is the smaller of the weight of the last complete iteration and the ratio of the best
+        solution cost to the lowest unweighted f-cost of nodes that may still lead to a cheaper solution.
+        """
+        if self._best_node is None:
+            return
+
+        best = self._best
+        h = self._h
+        lower_bound = self._best_node.get_path_cost()
+        for item in self._frontier:
+            node = item[3]
+            key = self._key(node.get_state())
+            if best[key] is node:
+                lower_bound = min(lower_bound, node.get_path_cost() + h[key])
+        for key, node in self._inconsistent.items():
+            lower_bound = min(lower_bound, node.get_path_cost() + h[key])
+
+        cost = self._best_node.get_path_cost()
+        ratio = cost / lower_bound if lower_bound > 0 else (1 if cost == 0 else math.inf)
+        self._metrics[self.METRIC_BOUND] = min(self._proven_weight, ratio)
+
+    def _key(self, state):
+        return state if self._state_key is None else self._state_key(state)
@@ -0,0 +1,178 @@
+from time import perf_counter
+from aima.core.search import utils
+from aima.core.search.framework import HeuristicFunction
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Profiling of queue searches. An instrumentation is set to a QueueSearch with set_instrumentation() and measures time
+ of every phase of a search loop, counts heuristic calls, records how many nodes were expanded in every time interval
+ and sends node events to a trace sink.
+
+ Searches without an instrumentation run a loop without profiling calls, so instrumentation costs nothing when it
+ isn't used.
+"""
+
+
+class SearchInstrumentation:
+    """
+        Collects profile of queue searches. Values are accumulated over all searches until reset() is called.
+    """
+    PHASE_POP = "pop"
+    PHASE_GOAL_TEST = "goalTest"
+    PHASE_EXPAND = "expand"
+    PHASE_INSERT = "insert"
+    PHASES = (PHASE_POP, PHASE_GOAL_TEST, PHASE_EXPAND, PHASE_INSERT)
+
+    # events sent to a trace sink
+    EVENT_POP = "pop"
+    EVENT_GOAL = "goal"
+    EVENT_EXPAND = "expand"
+    EVENT_INSERT = "insert"
+
+    def __init__(self, trace_sink=None, rate_interval=0.1, clock=perf_counter):
+        """
+        SearchInstrumentation constructor
+
+        :param trace_sink: function that is called with an event name and a node for every node event, or None
+        :param rate_interval (float): length of a time interval in seconds for which a number of expansions is counted
+        :param clock: function that returns current time in seconds
+        """
+        self.clock = clock
+        self._trace_sink = trace_sink
+        self._rate_interval = rate_interval
+        self.reset()
+
+    def reset(self):
+        self._phase_times = dict((phase, 0.0) for phase in self.PHASES)
+        self._heuristic_calls = 0
+        self._nodes_expanded = 0
+        self._expansions = []
+        self._start_time = None
+        self._total_time = 0.0
+
+    def start(self):
+        """ Called by a search when it starts """
+        self._start_time = self.clock()
+
+    def stop(self):
+        """ Called by a search when it ends """
+        if self._start_time is not None:
+            self._total_time += self.clock() - self._start_time
+            self._start_time = None
+
+    def pop(self, pop_function):
+        start = self.clock()
+        node = pop_function()
+        self._phase_times[self.PHASE_POP] += self.clock() - start
+        self._trace(self.EVENT_POP, node)
+        return node
+
+    def goal_test(self, problem, node):
+        start = self.clock()
+        is_goal = utils.is_goal_state(problem, node)
+        self._phase_times[self.PHASE_GOAL_TEST] += self.clock() - start
+        if is_goal:
+            self._trace(self.EVENT_GOAL, node)
+        return is_goal
+
+    def insert(self, add_function, node):
+        start = self.clock()
+        add_function(node)
+        self._phase_times[self.PHASE_INSERT] += self.clock() - start
+        self._trace(self.EVENT_INSERT, node)
+
+    def expanded(self, node):
+        """ Called by a search before a node is expanded """
+        self._nodes_expanded += 1
+        interval = int((self.clock() - self._start_time) / self._rate_interval)
+        expansions = self._expansions
+        if interval >= len(expansions):
+            expansions.extend([0] * (interval + 1 - len(expansions)))
+        expansions[interval] += 1
+        self._trace(self.EVENT_EXPAND, node)
+
+    def add_phase_time(self, phase, time):
+        self._phase_times[phase] += time
+
+    def heuristic_called(self):
+        self._heuristic_calls += 1
+
+    def get_phase_times(self):
+        """
+        :return (dict): total time in seconds spent in every phase of a search loop
+        """
+        return dict(self._phase_times)
+
+    def get_total_time(self):
+        return self._total_time
+
+    def get_heuristic_calls(self):
+        return self._heuristic_calls
+
+    def get_nodes_expanded(self):
+        return self._nodes_expanded
+
+    def get_expansion_rates(self):
+        """
+        Get expansion rate in every time interval since the last search started. Intervals of earlier searches are
+        added to the same intervals.
+
+        :return (list): expanded nodes per second in consecutive intervals
+        """
+        return [expansions / self._rate_interval for expansions in self._expansions]
+
+    def get_expansion_rate_histogram(self, bins=10):
+        """
+        Get histogram of expansion rates of time intervals, e.g. to see if a search slows down when its frontier grows.
+
+        :param bins (int): number of bins
+        :return (list): tuples (lower bound of a bin in expansions per second, number of intervals in a bin)
+        """
+        rates = self.get_expansion_rates()
+        if not rates:
+            return []
+
+        low, high = min(rates), max(rates)
+        width = (high - low) / bins or 1
+        counts = [0] * bins
+        for rate in rates:
+            counts[min(int((rate - low) / width), bins - 1)] += 1
+        return [(low + i * width, counts[i]) for i in range(bins)]
+
+    def _trace(self, event, node):
+        if self._trace_sink is not None:
+            self._trace_sink(event, node)
+
+
+class InstrumentedHeuristicFunction(HeuristicFunction):
+    """
+        Heuristic function that counts its calls in an instrumentation.
+    """
+    def __init__(self, heuristic_function, instrumentation):
+        self._heuristic_function = heuristic_function
+        self._instrumentation = instrumentation
+
+    def h(self, state):
+        self._instrumentation.heuristic_called()
+        return self._heuristic_function.h(state)
+
+    def get_heuristic_function(self):
+        return self._heuristic_function
+
+
+class TraceRecorder:
+    """
+        Trace sink that saves events in a list. Only states of nodes are saved, so nodes can be garbage collected.
+    """
+    def __init__(self, events=None):
+        """
+        :param events: event names to record, by default all events
+        """
+        self._events = None if events is None else set(events)
+        self.trace = []
+
+    def __call__(self, event, node):
+        if self._events is None or event in self._events:
+            self.trace.append((event, node.get_state()))
@@ -2,15 +2,27 @@ from abc import ABCMeta
 from math import exp
 from random import randint, uniform
 import random
-from urllib.request import randombytes
 from aima.core import search
 from aima.core.search import utils
-from aima.core.search.framework import NodeExpander, Node
+from aima.core.search.framework import NodeExpander, Node, BudgetExhausted, Search
 from aima.core.util.other import PlusInfinity
 
 __author__ = 'Ivan Mushketik'
 __docformat__ = 'restructuredtext en'
 
+
+class _BudgetExhaustedResult:
+    """
+        Local searches report that a budget is exhausted with the same result as Search, they don't inherit Search
+        because their failure is checked without a result.
+    """
+    def is_budget_exhausted(self, result):
+        return Search.is_budget_exhausted(self, result)
+
+    def _budget_exhausted(self):
+        return Search._budget_exhausted(self)
+
+
  # Artificial Intelligence A Modern Approach (3rd Edition): Figure 4.2, page 122.
  #
  # function HILL-CLIMBING(problem) returns a state that is a local maximum
@@ -21,7 +33,7 @@ __docformat__ = 'restructuredtext en'
  #     if neighbor.VALUE <= current.VALUE then return current.STATE
  #     current <- neighbor
  #
-class HillClimbingSearch(NodeExpander):
+class HillClimbingSearch(_BudgetExhaustedResult, NodeExpander):
     """
     The most basic algorithm of local search. At each state al reachable states from the current one are expanded. Current
     state is substituted by a state with the best heuristic estimation (if one exists). If all expanded states' heuristic
@@ -36,6 +48,10 @@ class HillClimbingSearch(NodeExpander):
 
     # function HILL-CLIMBING(problem) returns a state that is a local maximum
     def search(self, problem):
+        """
+        :return: actions to reach a local maximum. If a budget is exhausted, a budget exhausted result is returned and
+        the last state is the state reached before it.
+        """
         self.clear_instrumentation()
 
         self.failure = True
@@ -44,7 +60,11 @@ class HillClimbingSearch(NodeExpander):
         current_node = Node(problem.get_initial_state())
 
         while True:
-            children = self.expand_node(current_node, problem)
+            try:
+                children = self.expand_node(current_node, problem)
+            except BudgetExhausted:
+                self.last_state = current_node.get_state()
+                return self._budget_exhausted()
             # neighbor <- a highest-valued successor of current
             neighbor = self._get_lowest_valued_node(children)
             
@@ -109,7 +129,7 @@ class Scheduler:
  # moves are accepted readily early in the annealing schedule and then less
  # often as time goes on. The schedule input determines the value of
  # the temperature T as a function of time.
-class SimulateAnnealingSearch(NodeExpander):
+class SimulateAnnealingSearch(_BudgetExhaustedResult, NodeExpander):
     def __init__(self, heuristic_function, scheduler=Scheduler()):
         super().__init__()
         self.heuristic_function = heuristic_function
@@ -120,6 +140,10 @@ class SimulateAnnealingSearch(NodeExpander):
 
     # function SIMULATED-ANNEALING(problem, schedule) returns a solution state
     def search(self, problem):
+        """
+        :return: actions to reach the state where temperature dropped to zero. If a budget is exhausted, a budget
+        exhausted result is returned and the last state is the state reached before it.
+        """
         self.clear_instrumentation()
         self.failure = True
         self.last_state = None
@@ -138,7 +162,11 @@ class SimulateAnnealingSearch(NodeExpander):
                 self.last_state = current_node.get_state()
                 return search.utils.actions_from_nodes(current_node.get_path_from_root())
 
-            children = self.expand_node(current_node, problem)
+            try:
+                children = self.expand_node(current_node, problem)
+            except BudgetExhausted:
+                self.last_state = current_node.get_state()
+                return self._budget_exhausted()
 
             number_of_children = len(children)
             if number_of_children != 0:
@@ -245,6 +273,7 @@ class GeneticProblem:
 class GeneticAlgorithm:
     POPULATION_SIZE = "populationSize"
     NUMBER_OF_ITERATIONS = "numberOfIterations"
+    BUDGET_EXHAUSTED = "budgetExhausted"
 
     def __init__(self, mutation_probability):
         """
@@ -256,8 +285,21 @@ class GeneticAlgorithm:
         self.mutation_probability = mutation_probability
         self.metrics = {}
         self.population = set()
+        self._budget = None
         self.clear_instrumentation()
 
+    def get_budget(self):
+        return self._budget
+
+    def set_budget(self, budget):
+        """
+        Set budget that is checked before every generation, a generation is counted as one expansion.
+
+        :param budget (SearchBudget): budget, or None if a search isn't limited
+        :return: None
+        """
+        self._budget = budget
+
     # function GENETIC-ALGORITHM(population, FITNESS-FN) returns an individual
 	# inputs: population, a set of individuals
 	# FITNESS-FN, a function that measures the fitness of an individual
@@ -269,7 +311,9 @@ class GeneticAlgorithm:
         :param genetic_problem (GeneticProblem): problem to find solution for
         :param heuristic_function (HeuristicFunction): function to calculate heuristic evaluation of a particular (individual) state
         :param max_iterations (int):
-        :return: result (best found) state.
+        :return: result (best found) state. If a budget is set, every generation is counted as an expansion, and when
+        it is exhausted the best state of the last generation is returned (None if no generation was created) and
+        BUDGET_EXHAUSTED metric is set to True.
         """
         converter = genetic_problem.converter
         self.population = [converter.get_string(state) for state in genetic_problem.initial_states]
@@ -279,9 +323,17 @@ class GeneticAlgorithm:
         self._set_population_size(len(self.population))
 
         best_state = None
+        population_size = lambda: len(self.population)
 
         # repeat
         for i in range(max_iterations):
+            if self._budget is not None:
+                try:
+                    self._budget.expanded(population_size)
+                except BudgetExhausted:
+                    self.metrics[self.BUDGET_EXHAUSTED] = True
+                    break
+
             best_state = self._genetic_algorithm(genetic_problem, heuristic_function)
 
             self._set_iterations(i)
@@ -400,6 +452,7 @@ class GeneticAlgorithm:
     def clear_instrumentation(self):
         self._set_iterations(0)
         self._set_population_size(0)
+        self.metrics[self.BUDGET_EXHAUSTED] = False
         self.failed = True
 
     def _validate_population(self, population, converter):
@@ -0,0 +1,632 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from heapq import heappush, heappop
+import math
+import multiprocessing
+import multiprocessing.connection
+import numbers
+import os
+import queue
+import time
+import traceback
+from aima.core.agent import NoOpAction
+from aima.core.search.framework import Search, NodeExpander, Node
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Searches that run in several processes.
+
+ Search objects, problems and solutions are sent between processes, so they should be picklable: functions of a
+ problem should be module level classes (not lambdas or local classes).
+"""
+
+
+def _run_search(search, problem, connection):
+    """ Run a search in a worker process and send its solution and metrics, or an exception it raised """
+    try:
+        actions = search.search(problem)
+        connection.send((list(actions), dict(search.get_metrics()), None))
+    except Exception as e:
+        connection.send((None, None, e))
+    finally:
+        connection.close()
+
+
+# search and problems of a batch in a worker process, set by _init_batch
+_batch_search = None
+_batch_problems = None
+
+
+def _init_batch(search, problems):
+    global _batch_search, _batch_problems
+    _batch_search = search
+    _batch_problems = problems
+
+
+def _run_batch(start, end):
+    """ Solve problems with indexes in [start, end) in a worker process """
+    results = []
+    get_budget = getattr(_batch_search, "get_budget", None)
+    for index in range(start, end):
+        budget = get_budget() if get_budget is not None else None
+        if budget is not None:
+            budget.restart()
+        actions = _batch_search.search(_batch_problems[index])
+        results.append((index, list(actions), dict(_batch_search.get_metrics())))
+    return results
+
+
+def solution_cost(problem, actions):
+    """
+    Calculate cost of a solution by applying its actions to an initial state of a problem.
+
+    :param problem (Problem): solved problem
+    :param actions (list): actions returned by a search
+    :return (float): sum of step costs
+    """
+    result_function = problem.get_result_function().result
+    step_cost_function = problem.get_step_cost_function().c
+
+    cost = 0
+    state = problem.get_initial_state()
+    for action in actions:
+        if action.is_noop():
+            continue
+        new_state = result_function(state, action)
+        cost += step_cost_function(state, action, new_state)
+        state = new_state
+    return cost
+
+
+class PortfolioSearch(Search):
+    """
+        Runs several searches on the same problem in separate processes. Searches may differ in algorithms or in
+        parameters; since it's hard to tell in advance which one will be the fastest on a problem, running all of
+        them at once takes about as long as the best of them.
+
+        In FIRST mode the first found solution is returned and searches that are still running are cancelled. In BEST
+        mode all searches are run to the end and the cheapest solution is returned.
+    """
+    FIRST = "first"
+    BEST = "best"
+
+    METRIC_WINNER = "winner"
+    METRIC_SOLUTIONS = "solutions"
+    METRIC_PATH_COST = "pathCost"
+
+    def __init__(self, searches, mode=FIRST, max_workers=None):
+        """
+        PortfolioSearch constructor
+
+        :param searches (list of Search): searches to run, they are copied to worker processes
+        :param mode (str): FIRST or BEST
+        :param max_workers (int): number of worker processes, by default one per search
+        """
+        if mode not in (self.FIRST, self.BEST):
+            raise ValueError("Unknown portfolio mode " + str(mode))
+        if len(searches) == 0:
+            raise ValueError("Portfolio should contain at least one search")
+
+        self._searches = list(searches)
+        self._mode = mode
+        self._max_workers = max_workers if max_workers is not None else len(self._searches)
+        self._metrics = {}
+
+    def search(self, problem):
+        """
+        Run all searches of a portfolio on a problem.
+
+        :param problem (Problem): problem to solve, it's copied to worker processes
+        :return (list): solution of a winning search, or failure if no search found a solution. If every search failed
+        because of an exception, the first exception is raised.
+        """
+        self._metrics = {}
+        best = None
+        error = None
+        finished = 0
+
+        # every search runs in its own process with its own pipe, so a process that runs a losing search can be
+        # terminated at any moment without breaking communication with other processes
+        pending = list(enumerate(self._searches))
+        running = {}
+        try:
+            while pending or running:
+                while pending and len(running) < self._max_workers:
+                    index, search = pending.pop(0)
+                    reader, writer = multiprocessing.Pipe(duplex=False)
+                    process = multiprocessing.Process(target=_run_search, args=(search, problem, writer), daemon=True)
+                    process.start()
+                    writer.close()
+                    running[reader] = (index, process)
+
+                reader = multiprocessing.connection.wait(list(running))[0]
+                index, process = running.pop(reader)
+                try:
+                    actions, metrics, e = reader.recv()
+                except EOFError:
+                    actions, metrics, e = None, None, RuntimeError("Search " + str(index) + " process exited with code "
+                                                                   + str(process.exitcode))
+                reader.close()
+                process.join()
+                if e is not None:
+                    if error is None:
+                        error = e
+                    continue
+
+                finished += 1
+                self._add_search_metrics(index, metrics)
+                search = self._searches[index]
+                if search.is_failure(actions) or search.is_cutoff(actions) or search.is_budget_exhausted(actions):
+                    continue
+
+                self._metrics[self.METRIC_SOLUTIONS] = self._metrics.get(self.METRIC_SOLUTIONS, 0) + 1
+                cost = solution_cost(problem, actions)
+                if best is None or cost < best[0] or (cost == best[0] and index < best[1]):
+                    best = (cost, index, actions, metrics)
+
+                if self._mode == self.FIRST:
+                    break
+        finally:
+            # running searches can't be cancelled, so their processes are terminated
+            for reader, (index, process) in running.items():
+                process.terminate()
+                process.join()
+                reader.close()
+
+        if best is None:
+            if finished == 0:
+                raise error
+            self._metrics[self.METRIC_SOLUTIONS] = 0
+            self._metrics[self.METRIC_PATH_COST] = math.inf
+            return self._failure()
+
+        cost, index, actions, metrics = best
+        self._metrics.update(metrics)
+        self._metrics[self.METRIC_WINNER] = index
+        self._metrics[self.METRIC_PATH_COST] = cost
+        return actions
+
+    def get_metrics(self):
+        """
+        Get metrics of the last search. Metrics of a winning search are stored with their original names, metrics of
+        every finished search are stored with an index of a search as a prefix, e.g. "1.nodesExpanded". Searches that
+        were cancelled have no metrics.
+
+        :return (dict): search's metrics
+        """
+        return self._metrics
+
+    def get_searches(self):
+        return self._searches
+
+    def get_mode(self):
+        return self._mode
+
+    def _add_search_metrics(self, index, metrics):
+        prefix = str(index) + "."
+        for name, value in metrics.items():
+            self._metrics[prefix + name] = value
+
+
+class BatchSearch:
+    """
+        Solves many independent problems with the same search in a process pool, e.g. route queries on the same map.
+
+        Search and problems are passed to worker processes once, when workers are started. Where processes are
+        created with fork they aren't copied at all: workers share memory of a parent process copy-on-write, so a
+        large read-only map is shared by all workers. Workers get only ranges of problem indexes and send back
+        solutions and metrics.
+
+        If a search has a budget, the budget is restarted before every problem, so it limits every query separately.
+    """
+    METRIC_QUERIES = "queries"
+    METRIC_FAILURES = "failures"
+    METRIC_EXHAUSTED = "exhausted"
+
+    def __init__(self, search, workers=None, chunk_size=None):
+        """
+        BatchSearch constructor
+
+        :param search (Search): search that solves every problem
+        :param workers (int): number of worker processes, by default number of CPUs
+        :param chunk_size (int): number of problems that are sent to a worker at once. By default problems are split
+        into about four chunks per worker, so that results are streamed back while workers solve other chunks.
+        """
+        self._search = search
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._chunk_size = chunk_size
+        self._metrics = {}
+
+    def search_many(self, problems):
+        """
+        Solve problems in worker processes. Results are returned as they are found, not in order of problems.
+
+        :param problems (iterable of Problem): problems to solve
+        :return (iterator): tuples (index of a problem, solution, metrics of a search that solved it)
+        """
+        problems = list(problems)
+        self._metrics = {self.METRIC_QUERIES: 0, self.METRIC_FAILURES: 0, self.METRIC_EXHAUSTED: 0}
+        if len(problems) == 0:
+            return
+
+        chunk_size = self._chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, len(problems) // (4 * self._workers))
+
+        executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=self._get_context(),
+                                       initializer=_init_batch, initargs=(self._search, problems))
+        try:
+            futures = [executor.submit(_run_batch, start, min(start + chunk_size, len(problems)))
+                       for start in range(0, len(problems), chunk_size)]
+
+            for future in as_completed(futures):
+                for index, actions, metrics in future.result():
+                    self._add_metrics(actions, metrics)
+                    yield index, actions, metrics
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_metrics(self):
+        """
+        Get metrics aggregated over problems solved by the last search_many() call: number of solved problems and
+        failures and sums of numeric metrics of a search, e.g. total number of expanded nodes. Problems on which a
+        search exhausted its budget are counted as failures and also as exhausted problems.
+
+        :return (dict): aggregated metrics
+        """
+        return self._metrics
+
+    def get_search(self):
+        return self._search
+
+    def _add_metrics(self, actions, metrics):
+        self._metrics[self.METRIC_QUERIES] += 1
+        if self._search.is_budget_exhausted(actions):
+            self._metrics[self.METRIC_EXHAUSTED] += 1
+            self._metrics[self.METRIC_FAILURES] += 1
+        elif self._search.is_failure(actions) or self._search.is_cutoff(actions):
+            self._metrics[self.METRIC_FAILURES] += 1
+
+        for name, value in metrics.items():
+            if isinstance(value, numbers.Number):
+                self._metrics[name] = self._metrics.get(name, 0) + value
+
+    @staticmethod
+    def _get_context():
+        if "fork" in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("fork")
+        return None
+
+
+def search_many(search, problems, workers=None):
+    """
+    Solve problems with a search in a process pool, see BatchSearch.
+
+    :param search (Search): search that solves every problem
+    :param problems (iterable of Problem): problems to solve
+    :param workers (int): number of worker processes, by default number of CPUs
+    :return (iterator): tuples (index of a problem, solution, metrics of a search that solved it)
+    """
+    return BatchSearch(search, workers).search_many(problems)
+
+
+class _HDAStarWorker(NodeExpander):
+    """
+        A* that runs in a worker process of HashDistributedAStarSearch on a partition of a state space.
+    """
+    # messages sent to workers
+    NODES = 0
+    REPORT = 1
+    TRACE = 2
+    STOP = 3
+    # message sent to a coordinator if a worker failed
+    ERROR = 4
+
+    def __init__(self, index, problem, heuristic_function, state_key, shared):
+        super().__init__()
+        self._index = index
+        self._problem = None
+        self._bind_problem(problem)
+        self._is_goal_state = problem.get_goal_test().is_goal_state
+        self._h = heuristic_function.h
+        self._state_key = state_key
+        self._shared = shared
+        self._n_workers = len(shared.inboxes)
+
+        self._open = []
+        self._counter = 0
+        # key of a state -> (best path cost, parent state, action)
+        self._best = {}
+        self._goal = None
+        self._outboxes = [[] for i in range(self._n_workers)]
+
+    def run(self):
+        shared = self._shared
+        inbox = shared.inboxes[self._index]
+        expanded_since_flush = 0
+
+        while True:
+            if self._has_work():
+                self._expand(heappop(self._open))
+                expanded_since_flush += 1
+                if expanded_since_flush < shared.batch_size:
+                    continue
+
+                # send generated nodes and receive new ones after every batch of expansions
+                self._flush()
+                expanded_since_flush = 0
+                while True:
+                    try:
+                        message = inbox.get_nowait()
+                    except queue.Empty:
+                        break
+                    if not self._handle(message):
+                        return
+            else:
+                self._flush()
+                expanded_since_flush = 0
+                with shared.lock:
+                    shared.idle[self._index] = 1
+                if not self._handle(inbox.get()):
+                    return
+
+    def _handle(self, message):
+        shared = self._shared
+        kind = message[0]
+        if kind == self.NODES:
+            with shared.lock:
+                shared.idle[self._index] = 0
+                shared.received[self._index] += 1
+            for state, path_cost, parent_state, action in message[1]:
+                self._add(state, path_cost, parent_state, action)
+        elif kind == self.REPORT:
+            shared.results.put((self.REPORT, self._index, self._goal, self.get_nodes_expanded()))
+        elif kind == self.TRACE:
+            path_cost, parent_state, action = self._best[self._key(message[1])]
+            shared.results.put((self.TRACE, self._index, parent_state, action))
+        elif kind == self.STOP:
+            return False
+        return True
+
+    def _has_work(self):
+        # nodes that can't improve the best found solution are dropped
+        if self._open and self._open[0][0] >= self._shared.incumbent.value:
+            self._open = []
+        return len(self._open) > 0
+
+    def _expand(self, entry):
+        f, neg_path_cost, counter, state = entry
+        path_cost = -neg_path_cost
+        if self._best[self._key(state)][0] < path_cost:
+            # a cheaper path to this state was found after the entry was added
+            return
+
+        if self._is_goal_state(state):
+            shared = self._shared
+            with shared.lock:
+                if path_cost < shared.incumbent.value:
+                    shared.incumbent.value = path_cost
+                    self._goal = (path_cost, state)
+            return
+
+        incumbent = self._shared.incumbent.value
+        for child in self.iter_expand_node(Node(state, path_cost), self._problem):
+            child_cost = child.get_path_cost()
+            if child_cost >= incumbent:
+                continue
+
+            child_state = child.get_state()
+            owner = self._owner(child_state)
+            if owner == self._index:
+                self._add(child_state, child_cost, state, child.get_action())
+            else:
+                outbox = self._outboxes[owner]
+                outbox.append((child_state, child_cost, state, child.get_action()))
+                if len(outbox) >= self._shared.batch_size:
+                    self._send(owner)
+
+    def _add(self, state, path_cost, parent_state, action):
+        key = self._key(state)
+        best = self._best.get(key)
+        if best is not None and best[0] <= path_cost:
+            return
+        self._best[key] = (path_cost, parent_state, action)
+
+        f = path_cost + self._h(state)
+        if f < self._shared.incumbent.value:
+            self._counter += 1
+            # among nodes with the same f deeper ones are explored first
+            heappush(self._open, (f, -path_cost, self._counter, state))
+
+    def _flush(self):
+        for owner in range(self._n_workers):
+            if self._outboxes[owner]:
+                self._send(owner)
+
+    def _send(self, owner):
+        shared = self._shared
+        # message is counted before it's sent, so termination isn't detected while it's in a queue
+        with shared.lock:
+            shared.sent[self._index] += 1
+        shared.inboxes[owner].put((self.NODES, self._outboxes[owner]))
+        self._outboxes[owner] = []
+
+    def _key(self, state):
+        return state if self._state_key is None else self._state_key(state)
+
+    def _owner(self, state):
+        return hash(self._key(state)) % self._n_workers
+
+
+class _HDAStarShared:
+    """ Queues and shared memory of HashDistributedAStarSearch's workers """
+    def __init__(self, context, workers, batch_size):
+        self.batch_size = batch_size
+        self.inboxes = [context.Queue() for i in range(workers)]
+        self.results = context.Queue()
+        self.lock = context.Lock()
+        # number of sent and received node messages and idle flags of every worker, guarded by lock
+        self.sent = context.Array('q', workers, lock=False)
+        self.received = context.Array('q', workers, lock=False)
+        self.idle = context.Array('b', workers, lock=False)
+        # cost of the best found solution, written under lock
+        self.incumbent = context.Value('d', math.inf, lock=False)
+
+
+def _run_hda_worker(index, problem, heuristic_function, state_key, shared):
+    try:
+        _HDAStarWorker(index, problem, heuristic_function, state_key, shared).run()
+    except BaseException:
+        shared.results.put((_HDAStarWorker.ERROR, index, traceback.format_exc()))
+
+
+class HashDistributedAStarSearch(Search):
+    """
+        Hash distributed A* (HDA*). Every worker process owns a part of a state space: a state belongs to a worker
+        number hash(state) % workers. A worker runs A* with its own open and closed lists; nodes of states that
+        belong to other workers are sent to their owners in batches through queues.
+
+        A worker that finds a goal updates a shared cost of the best solution (incumbent), and nodes with f-cost that
+        isn't less than the incumbent are dropped. The search terminates when all workers are idle and every sent
+        message was received, which is checked atomically under a lock that guards message counters. At that moment
+        no node that can improve the incumbent exists, so with an admissible heuristic the solution is optimal.
+        Cheaper paths to closed states reopen them, so the heuristic doesn't have to be consistent.
+
+        Workers are forked, so a problem and a heuristic function are inherited by them, and states should have a hash
+        that is the same in all processes. States, actions and step costs are sent between processes and should be
+        picklable.
+    """
+    METRIC_NODES_EXPANDED = NodeExpander.METRIC_NODES_EXPANDED
+    METRIC_PATH_COST = "pathCost"
+    METRIC_MESSAGES = "messages"
+    METRIC_MAX_WORKER_NODES_EXPANDED = "maxWorkerNodesExpanded"
+
+    # how often a coordinator checks if a search has terminated, in seconds
+    POLL_INTERVAL = 0.001
+
+    def __init__(self, heuristic_function, workers=None, state_key=None, batch_size=64):
+        """
+        HashDistributedAStarSearch constructor
+
+        :param heuristic_function (HeuristicFunction): admissible heuristic
+        :param workers (int): number of worker processes, by default number of CPUs
+        :param state_key: function that returns hashable key of a state, by default a state is its own key
+        :param batch_size (int): maximum number of nodes in a message to another worker
+        """
+        self._heuristic_function = heuristic_function
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._state_key = state_key
+        self._batch_size = batch_size
+        self._metrics = {}
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        self._metrics[self.METRIC_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_PATH_COST] = 0
+        self._metrics[self.METRIC_MESSAGES] = 0
+        self._metrics[self.METRIC_MAX_WORKER_NODES_EXPANDED] = 0
+
+    def get_metrics(self):
+        return self._metrics
+
+    def search(self, problem):
+        self.clear_instrumentation()
+        context = multiprocessing.get_context("fork")
+        shared = _HDAStarShared(context, self._workers, self._batch_size)
+        processes = [context.Process(target=_run_hda_worker,
+                                     args=(i, problem, self._heuristic_function, self._state_key, shared),
+                                     daemon=True)
+                     for i in range(self._workers)]
+        for process in processes:
+            process.start()
+
+        try:
+            initial_state = problem.get_initial_state()
+            with shared.lock:
+                shared.sent[0] += 1
+            shared.inboxes[self._owner(initial_state)].put((_HDAStarWorker.NODES,
+                                                            [(initial_state, 0, None, None)]))
+            self._wait_for_termination(shared, processes)
+
+            goal = None
+            for i in range(self._workers):
+                shared.inboxes[i].put((_HDAStarWorker.REPORT,))
+            for i in range(self._workers):
+                kind, index, worker_goal, nodes_expanded = self._get_result(shared, processes)
+                self._metrics[self.METRIC_NODES_EXPANDED] += nodes_expanded
+                self._metrics[self.METRIC_MAX_WORKER_NODES_EXPANDED] = \
+                    max(nodes_expanded, self._metrics[self.METRIC_MAX_WORKER_NODES_EXPANDED])
+                if worker_goal is not None and (goal is None or worker_goal[0] < goal[0]):
+                    goal = worker_goal
+            self._metrics[self.METRIC_MESSAGES] = sum(shared.sent) - 1
+
+            if goal is None:
+                return self._failure()
+
+            self._metrics[self.METRIC_PATH_COST] = goal[0]
+            return self._trace(shared, processes, goal[1])
+        finally:
+            for i in range(self._workers):
+                shared.inboxes[i].put((_HDAStarWorker.STOP,))
+            for process in processes:
+                process.join(1)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+    def _wait_for_termination(self, shared, processes):
+        while True:
+            with shared.lock:
+                if all(shared.idle) and sum(shared.sent) == sum(shared.received):
+                    return
+            # only a failed worker sends a result before termination
+            try:
+                self._check_result(shared.results.get_nowait())
+            except queue.Empty:
+                pass
+            self._check_workers(shared, processes)
+            time.sleep(self.POLL_INTERVAL)
+
+    def _trace(self, shared, processes, goal_state):
+        """ Restore a solution by following parent states from a goal state to an initial state """
+        actions = []
+        state = goal_state
+        while True:
+            shared.inboxes[self._owner(state)].put((_HDAStarWorker.TRACE, state))
+            kind, index, parent_state, action = self._get_result(shared, processes)
+            if action is None:
+                break
+            actions.append(action)
+            state = parent_state
+
+        if not actions:
+            return [NoOpAction()]
+        actions.reverse()
+        return actions
+
+    def _get_result(self, shared, processes):
+        while True:
+            try:
+                return self._check_result(shared.results.get(timeout=self.POLL_INTERVAL * 100))
+            except queue.Empty:
+                self._check_workers(shared, processes)
+
+    def _check_result(self, result):
+        if result[0] == _HDAStarWorker.ERROR:
+            raise RuntimeError("HDA* worker " + str(result[1]) + " failed:\n" + result[2])
+        return result
+
+    def _check_workers(self, shared, processes):
+        for i, process in enumerate(processes):
+            if not process.is_alive():
+                # a worker that failed sends an error before it exits
+                try:
+                    self._check_result(shared.results.get(timeout=1))
+                except queue.Empty:
+                    pass
+                raise RuntimeError("HDA* worker " + str(i) + " exited with code " + str(process.exitcode))
+
+    def _owner(self, state):
+        key = state if self._state_key is None else self._state_key(state)
+        return hash(key) % self._workers
@@ -0,0 +1,228 @@
+from abc import ABCMeta
+from collections import deque
+import math
+import mmap
+import os
+import struct
+from aima.core.search.framework import HeuristicFunction
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Pattern databases (Artificial Intelligence A Modern Approach (3rd Edition): page 106).
+
+ Pattern database stores exact cost of reaching a goal in an abstraction of a problem, e.g. in a sliding tile puzzle
+ where only positions of a few tiles are distinguished. It is computed once by a backward breadth first search from an
+ abstract goal state and is used as an admissible heuristic of the original problem.
+
+ Distances are stored in a byte array indexed by ranks of abstract states, so a lookup is O(1). A database can be saved
+ to a file and loaded with mmap, so it isn't read into memory and is shared by processes that load the same file.
+
+ If abstractions are disjoint (every step is counted by at most one of them), distances of several databases can be
+ added and the sum is still admissible.
+"""
+
+
+class Abstraction(metaclass=ABCMeta):
+    """
+        Abstraction of a problem's state space. Abstract states should be states that can be used with a problem's
+        action and result functions, e.g. a sliding tile puzzle board where tiles that aren't in a pattern are replaced
+        with the same "don't care" tile.
+    """
+    def abstract(self, state):
+        """
+        Get abstract state of a problem's state.
+
+        :param state: state of a problem
+        :return: abstract state
+        """
+        raise NotImplementedError()
+
+    def rank(self, abstract_state):
+        """
+        Get index of an abstract state in a database. Different abstract states should have different ranks.
+
+        :param abstract_state: abstract state
+        :return (int): rank in range [0, size())
+        """
+        raise NotImplementedError()
+
+    def size(self):
+        """
+        :return (int): number of ranks of abstract states
+        """
+        raise NotImplementedError()
+
+    def step_cost(self, abstract_state, action, new_abstract_state):
+        """
+        Cost of a step in an abstract state space, should be 0 or 1. Additive databases count only steps that change
+        their pattern, e.g. moves of pattern tiles. By default every step costs 1.
+
+        :return (int): 0 or 1
+        """
+        return 1
+
+
+class PatternDatabase:
+    """
+        Distances from abstract states to an abstract goal state. Distance of an abstract state that can't reach a goal
+        is UNREACHABLE.
+    """
+    UNREACHABLE = 255
+
+    # file header: magic and number of distances
+    _HEADER = struct.Struct("<4s4xQ")
+    _MAGIC = b"APDB"
+
+    def __init__(self, abstraction, distances, offset=0):
+        """
+        PatternDatabase constructor. Databases should be created with build() or load().
+
+        :param abstraction (Abstraction): abstraction that was used to build a database
+        :param distances: byte array or mmap with distances indexed by ranks of abstract states
+        :param offset (int): position of the first distance in distances
+        """
+        self._abstraction = abstraction
+        self._distances = distances
+        self._offset = offset
+
+    @classmethod
+    def build(cls, problem, abstraction, goal_states=None):
+        """
+        Build a database with a backward breadth first search from abstract goal states. Steps with zero cost are
+        explored before steps with cost 1 (0-1 BFS), so distances are costs of the cheapest paths.
+
+        :param problem (BidirectionalProblem): problem which state space is abstracted. Backward steps are made with
+        reverse action and result functions.
+        :param abstraction (Abstraction): abstraction of a problem's states
+        :param goal_states (list): goal states of a problem, by default a goal state of a problem
+        :return (PatternDatabase): built database
+        """
+        if goal_states is None:
+            goal_states = [problem.get_goal_state()]
+
+        actions_function = problem.get_reverse_action_function().actions
+        result_function = problem.get_reverse_result_function().result
+        rank = abstraction.rank
+        step_cost = abstraction.step_cost
+
+        distances = bytearray([cls.UNREACHABLE]) * abstraction.size()
+        frontier = deque()
+        for goal_state in goal_states:
+            abstract_goal = abstraction.abstract(goal_state)
+            distances[rank(abstract_goal)] = 0
+            frontier.append((abstract_goal, 0))
+
+        while frontier:
+            state, distance = frontier.popleft()
+            if distance > distances[rank(state)]:
+                # state was reached by a cheaper path after it was added to a frontier
+                continue
+
+            for action in actions_function(state):
+                new_state = result_function(state, action)
+                cost = step_cost(state, action, new_state)
+                new_distance = distance + cost
+                new_rank = rank(new_state)
+
+                if new_distance >= distances[new_rank]:
+                    continue
+                if new_distance >= cls.UNREACHABLE:
+                    raise ValueError("Distance " + str(new_distance) + " doesn't fit into a byte")
+
+                distances[new_rank] = new_distance
+                if cost == 0:
+                    frontier.appendleft((new_state, new_distance))
+                elif cost == 1:
+                    frontier.append((new_state, new_distance))
+                else:
+                    raise ValueError("Step cost should be 0 or 1, got " + str(cost))
+
+        return cls(abstraction, distances)
+
+    def save(self, path):
+        """
+        Save a database to a file.
+
+        :param path (str): path of a file
+        :return: None
+        """
+        size = self._abstraction.size()
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, size))
+            f.write(self._distances[self._offset:self._offset + size])
+
+    @classmethod
+    def load(cls, path, abstraction):
+        """
+        Map a database saved with save() into memory.
+
+        :param path (str): path of a file
+        :param abstraction (Abstraction): abstraction that was used to build a database
+        :return (PatternDatabase): loaded database
+        """
+        with open(path, "rb") as f:
+            # a header is checked before mapping, since an empty file can't be mapped
+            if os.fstat(f.fileno()).st_size < cls._HEADER.size:
+                raise ValueError(path + " is not a pattern database")
+            distances = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, size = cls._HEADER.unpack_from(distances)
+        if magic != cls._MAGIC:
+            distances.close()
+            raise ValueError(path + " is not a pattern database")
+        if size != abstraction.size() or len(distances) != cls._HEADER.size + size:
+            distances.close()
+            raise ValueError(path + " doesn't match abstraction size " + str(abstraction.size()))
+
+        return cls(abstraction, distances, cls._HEADER.size)
+
+    def close(self):
+        """
+        Unmap a loaded database.
+
+        :return: None
+        """
+        if isinstance(self._distances, mmap.mmap):
+            self._distances.close()
+
+    def get_abstraction(self):
+        return self._abstraction
+
+    def get_distance(self, state):
+        """
+        Get distance from an abstract state of a problem's state to an abstract goal.
+
+        :param state: state of a problem
+        :return (int): distance or UNREACHABLE
+        """
+        abstraction = self._abstraction
+        return self._distances[self._offset + abstraction.rank(abstraction.abstract(state))]
+
+
+class PatternDatabaseHeuristicFunction(HeuristicFunction):
+    """
+        Heuristic function that looks up distances in pattern databases. Distances of disjoint databases are added,
+        otherwise the largest distance is used. State that can't reach a goal in any abstraction has infinite
+        heuristic value.
+    """
+    def __init__(self, databases, additive=True):
+        """
+        PatternDatabaseHeuristicFunction constructor
+
+        :param databases (list of PatternDatabase): databases to look up
+        :param additive (bool): True if databases are disjoint and their distances can be added
+        """
+        self._databases = list(databases)
+        self._additive = additive
+
+    def h(self, state):
+        unreachable = PatternDatabase.UNREACHABLE
+        distances = [database.get_distance(state) for database in self._databases]
+
+        if unreachable in distances:
+            return math.inf
+        if self._additive:
+            return sum(distances)
+        return max(distances)
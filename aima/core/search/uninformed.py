@@ -1,7 +1,9 @@
+from heapq import heappush, heappop
 from aima.core.search import utils
-from aima.core.search.framework import Search, NodeExpander, Node, GraphSearch, PrioritySearch
-from aima.core.util.datastructure import LIFOQueue, FIFOQueue
-from aima.core.util.other import Comparator
+from aima.core.search.framework import Search, NodeExpander, Node, GraphSearch, PrioritySearch, QueueSearch, Problem, \
+    StepCostFunction, BudgetExhausted
+from aima.core.util.datastructure import LIFOQueue, FIFOQueue, PriorityQueue, LRUCache
+from aima.core.util.other import Comparator, PlusInfinity
 
 __author__ = 'Ivan Mushketik'
 __docformat__ = 'restructuredtext en'
@@ -41,6 +43,12 @@ class BreadthFirstSearch(Search):
     def get_metrics(self):
         return self._search.get_metrics()
 
+    def get_budget(self):
+        return self._search.get_budget()
+
+    def set_budget(self, budget):
+        self._search.set_budget(budget)
+
  # Artificial Intelligence A Modern Approach (3rd Edition): Figure 3.14, page 84.
  #
  # function UNIFORM-COST-SEARCH(problem) returns a solution, or failure
@@ -71,10 +79,158 @@ class UniformCostSearch(PrioritySearch):
     def _get_comparator(self):
         class PathCostComparator(Comparator):
             def compare(self, node1, node2):
-                pass
+                return node1.get_path_cost() - node2.get_path_cost()
 
         return PathCostComparator()
 
+    def _get_priority_key(self):
+        def priority(node):
+            return node.get_path_cost()
+
+        return priority
+
+
+class DijkstraSearch(Search):
+    """
+        Uniform cost search specialised for problems on a LabeledGraph where states are vertexes and step cost is an
+        edge label. It runs directly on graph edges: frontier is a heap of (path cost, vertex) pairs, and neither Node
+        nor Action objects are created except actions of a solution.
+
+        Frontier entries are not replaced when a cheaper path is found, a new entry is added and an outdated one is
+        skipped when popped.
+    """
+    METRIC_NODES_EXPANDED = QueueSearch.METRIC_NODES_EXPANDED
+    METRIC_QUEUE_SIZE = QueueSearch.METRIC_QUEUE_SIZE
+    METRIC_MAX_QUEUE_SIZE = QueueSearch.METRIC_MAX_QUEUE_SIZE
+    METRIC_PATH_COST = QueueSearch.METRIC_PATH_COST
+
+    def __init__(self, graph, action_factory):
+        """
+        DijkstraSearch constructor
+
+        :param graph (LabeledGraph): graph to search in, it can be a FrozenLabeledGraph
+        :param action_factory: function that creates an action to move to a specified vertex
+        """
+        self._graph = graph
+        self._action_factory = action_factory
+        self._budget = None
+        self._metrics = {}
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        self._metrics[self.METRIC_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_MAX_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_PATH_COST] = 0
+
+    def get_metrics(self):
+        return self._metrics
+
+    def get_budget(self):
+        return self._budget
+
+    def set_budget(self, budget):
+        self._budget = budget
+
+    def search(self, problem):
+        """
+        Search for a path from the problem's initial state to a goal state. Action, result and step cost functions of a
+        problem are not used, actions are edges of a graph.
+
+        :param problem: problem to solve
+        :return: list of actions to reach the goal state, a list with a NoOpAction if initial state is a goal state or
+        an empty list if failed to find a solution.
+        """
+        self.clear_instrumentation()
+
+        get_edges = self._graph.get_edges
+        is_goal_state = problem.get_goal_test().is_goal_state
+        edge_cost = self._edge_cost
+
+        start = problem.get_initial_state()
+        cost = {start: 0}
+        parent = {start: None}
+        explored = set()
+
+        # counter keeps vertexes with equal path costs in the order they were added
+        counter = 0
+        frontier = [(0, counter, start)]
+        queue_size = 1
+        max_queue_size = 1
+        nodes_expanded = 0
+        budget = self._budget
+        # every reached vertex has a cost
+        reached = cost.__len__
+
+        while frontier:
+            path_cost, _, vertex = heappop(frontier)
+            if vertex in explored:
+                continue
+            queue_size -= 1
+
+            if is_goal_state(vertex):
+                self._metrics[self.METRIC_NODES_EXPANDED] = nodes_expanded
+                self._metrics[self.METRIC_QUEUE_SIZE] = queue_size
+                self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
+                self._metrics[self.METRIC_PATH_COST] = path_cost
+                return self._solution(parent, vertex)
+
+            if budget is not None:
+                try:
+                    budget.expanded(reached)
+                except BudgetExhausted:
+                    self._metrics[self.METRIC_NODES_EXPANDED] = nodes_expanded
+                    self._metrics[self.METRIC_QUEUE_SIZE] = queue_size
+                    self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
+                    return self._budget_exhausted()
+
+            explored.add(vertex)
+            nodes_expanded += 1
+
+            for successor, label in get_edges(vertex):
+                if successor in explored:
+                    continue
+
+                new_cost = path_cost + edge_cost(label)
+                old_cost = cost.get(successor)
+                if old_cost is None:
+                    queue_size += 1
+                elif old_cost <= new_cost:
+                    continue
+
+                cost[successor] = new_cost
+                parent[successor] = vertex
+                counter += 1
+                heappush(frontier, (new_cost, counter, successor))
+
+            if queue_size > max_queue_size:
+                max_queue_size = queue_size
+
+        self._metrics[self.METRIC_NODES_EXPANDED] = nodes_expanded
+        self._metrics[self.METRIC_MAX_QUEUE_SIZE] = max_queue_size
+        return self._failure()
+
+    def _edge_cost(self, label):
+        """
+        Get step cost of moving along an edge.
+
+        :param label: label of an edge
+        :return: step cost
+        """
+        return label
+
+    def _solution(self, parent, vertex):
+        vertexes = []
+        while parent[vertex] is not None:
+            vertexes.append(vertex)
+            vertex = parent[vertex]
+
+        if not vertexes:
+            return utils.actions_from_nodes([Node(vertex)])
+
+        vertexes.reverse()
+        return [self._action_factory(v) for v in vertexes]
+
 
 # Artificial Intelligence A Modern Approach (3rd Edition): page 85.
 class DepthFirstSearch(Search):
@@ -93,6 +249,12 @@ class DepthFirstSearch(Search):
     def get_metrics(self):
         return self._search.get_metrics()
 
+    def get_budget(self):
+        return self._search.get_budget()
+
+    def set_budget(self, budget):
+        self._search.set_budget(budget)
+
 # Artificial Intelligence A Modern Approach (3rd Edition): Figure 3.17, page 88
 
  # function DEPTH-LIMITED-SEARCH(problem, limit) returns a solution, or failure/cutoff
@@ -110,16 +272,47 @@ class DepthFirstSearch(Search):
  #           else if result != failure then return result
  #       if cutoff_occurred? then return cutoff else return failure
 class DepthLimitedSearch(NodeExpander, Search):
+    """
+        Depth first search that doesn't expand nodes deeper than a specified limit.
+
+        Recursion of RECURSIVE-DLS is replaced with an explicit stack of nodes' children iterators, so search depth isn't
+        limited by Python's recursion limit.
+
+        If an expansion cache is set, results of expanding a state (actions, resulting states and step costs) are
+        stored in it and reused when the same state is expanded again, e.g. by the next iteration of iterative
+        deepening search. States should be hashable or state_key function should be specified to use a cache.
+    """
     PATH_COST = "pathCost"
+    METRIC_EXPANSION_CACHE_HITS = "expansionCacheHits"
+
+    def __init__(self, limit, expansion_cache=None, state_key=None):
+        """
+        DepthLimitedSearch constructor
 
-    def __init__(self, limit):
+        :param limit (int): max depth of an expanded node
+        :param expansion_cache (LRUCache): cache of states' expansions, or None if states should be always expanded
+        by problem's functions
+        :param state_key: function that returns hashable key of a state that is used in a cache. By default a state is
+        its own key.
+        """
         super().__init__()
         self._limit = limit
+        self._expansion_cache = expansion_cache
+        self._state_key = state_key
+        self._stack = []
         self._metrics[DepthLimitedSearch.PATH_COST] = 0
+        self._metrics[DepthLimitedSearch.METRIC_EXPANSION_CACHE_HITS] = 0
 
     def clear_instrumentation(self):
         super().clear_instrumentation()
         self._metrics[DepthLimitedSearch.PATH_COST] = 0
+        self._metrics[DepthLimitedSearch.METRIC_EXPANSION_CACHE_HITS] = 0
+
+    def get_limit(self):
+        return self._limit
+
+    def set_limit(self, limit):
+        self._limit = limit
 
     def get_path_cost(self):
         return self._metrics[DepthLimitedSearch.PATH_COST]
@@ -127,6 +320,9 @@ class DepthLimitedSearch(NodeExpander, Search):
     def set_path_cost(self, path_cost):
         self._metrics[DepthLimitedSearch.PATH_COST] = path_cost
 
+    def get_expansion_cache_hits(self):
+        return self._metrics[DepthLimitedSearch.METRIC_EXPANSION_CACHE_HITS]
+
     def get_metrics(self):
         return self._metrics
 
@@ -139,44 +335,90 @@ class DepthLimitedSearch(NodeExpander, Search):
             represents failure. If search ended because of cutoff returns a list that represents that cutoff occurred
         """
 
+        self._bind_problem(problem)
         # return RECURSIVE-DLS(MAKE-NODE(INITIAL-STATE[problem]), problem, limit)
-        return self._recursive_dls(Node(problem.get_initial_state()), problem, self._limit)
+        try:
+            return self._iterative_dls(Node(problem.get_initial_state()), problem, self._limit)
+        except BudgetExhausted:
+            return self._budget_exhausted()
 
-    def _recursive_dls(self, curNode, problem, limit):
+    def _iterative_dls(self, root, problem, limit):
+        is_goal_state = problem.get_goal_test().is_goal_state
 
         # if problem.GOAL-TEST(node.STATE) then return SOLUTION(node)
-        if utils.is_goal_state(problem, curNode):
-            self.set_path_cost(curNode.get_path_cost())
-            return utils.actions_from_nodes(curNode.get_path_from_root())
+        if is_goal_state(root.get_state()):
+            return self._solution(root)
         elif limit == 0:
             # else if limit = 0 then return cutoff
             return self._cutoff()
-        else:
-            # else
-			# cutoff_occurred? <- false
-            childNodes = self.expand_node(curNode, problem)
 
-            cutoff_occurred = False
+        # Every frame of the stack is a call of RECURSIVE-DLS: [node's children iterator, cutoff_occurred?]. Depth of
+        # children of the top frame's node is equal to the stack size.
+        stack = self._stack = [[self._expand(root, problem), False]]
+        while True:
+            frame = stack[-1]
             # for each action in problem.ACTIONS(node.STATE) do
-            for node in childNodes:
-                # child <- CHILD-NODE(problem, node, action)
-				# result <- RECURSIVE-DLS(child, problem, limit - 1)
-                result = self._recursive_dls(node, problem, limit - 1)
-
+            #   child <- CHILD-NODE(problem, node, action)
+            child = next(frame[0], None)
+
+            if child is None:
+                # if cutoff_occurred? then return cutoff else return failure
+                stack.pop()
+                if not stack:
+                    return self._cutoff() if frame[1] else self._failure()
                 # if result = cutoff then cutoff_occurred? <- true
-                if self.is_cutoff(result):
-                    cutoff_occurred = True
-                elif not self.is_failure(result):
-                    # else if result != failure then return result
-                    return result
-
-            # if cutoff_occurred? then return cutoff else return failure
-            if cutoff_occurred:
-                return self._cutoff()
+                if frame[1]:
+                    stack[-1][1] = True
+            elif is_goal_state(child.get_state()):
+                # result is a solution
+                return self._solution(child)
+            elif len(stack) == limit:
+                # child's limit is 0, so result is cutoff
+                frame[1] = True
             else:
-                return self._failure()
+                # result <- RECURSIVE-DLS(child, problem, limit - 1)
+                stack.append([self._expand(child, problem), False])
 
+    def _expand(self, node, problem):
+        """
+        Expand a node using an expansion cache if it's set.
+
+        :return (iterator): iterator over child nodes
+        """
+        cache = self._expansion_cache
+        if cache is None:
+            return self.iter_expand_node(node, problem)
+
+        if problem is not self._problem:
+            self._bind_problem(problem)
+        if self._budget is not None:
+            self._budget.expanded(self._get_nodes_in_memory)
+        self._metrics[NodeExpander.METRIC_NODES_EXPANDED] += 1
+
+        state = node.get_state()
+        key = state if self._state_key is None else self._state_key(state)
+        expansions = cache.get(key)
+        if expansions is None:
+            result_function = self._result_function
+            step_cost_function = self._step_cost_function
+
+            expansions = []
+            for action in self._actions_function(state):
+                new_state = result_function(state, action)
+                expansions.append((action, new_state, step_cost_function(state, action, new_state)))
+            cache.put(key, expansions)
+        else:
+            self._metrics[DepthLimitedSearch.METRIC_EXPANSION_CACHE_HITS] += 1
 
+        return (Node(new_state, step_cost, node, action) for action, new_state, step_cost in expansions)
+
+    def _solution(self, node):
+        self.set_path_cost(node.get_path_cost())
+        return utils.actions_from_nodes(node.get_path_from_root())
+
+    def _get_nodes_in_memory(self):
+        # only nodes of the current path are kept, stack is empty when a root is expanded
+        return len(self._stack)
 
 
 # Artificial Intelligence A Modern Approach (3rd Edition): Figure 3.18, page 89.
@@ -190,33 +432,54 @@ class IterativeDeepeningSearch(Search):
         Iterative Deepening search works file limited DFS, but instead it increases search limit. If search failed to
         find solution at selected depth or if solution was found search terminates. If cutoff occurred depth limit is
         increased.
+
+        Every iteration re-expands all nodes explored by the previous one, so expansions of states can be kept in a
+        bounded LRU cache shared by all iterations. Shallow levels are not recomputed by problem's functions as long as
+        they fit into the cache. Caching is off by default, since it needs hashable states or a state_key function.
     """
     PATH_COST = "pathCost"
     METRICS_NODES_EXPANDED = "nodesExpanded"
+    METRIC_EXPANSION_CACHE_HITS = DepthLimitedSearch.METRIC_EXPANSION_CACHE_HITS
 
-    def __init__(self):
+    def __init__(self, cache_size=0, state_key=None):
+        """
+        IterativeDeepeningSearch constructor
+
+        :param cache_size (int): max number of states which expansions are cached, 0 or None to turn caching off
+        :param state_key: function that returns hashable key of a state that is used in a cache. By default a state is
+        its own key.
+        """
+        self._cache_size = cache_size
+        self._state_key = state_key
+        self._budget = None
         self._metrics = {}
         self.clear_instrumentation()
 
     def clear_instrumentation(self):
         self._metrics[self.PATH_COST] = 0
         self._metrics[self.METRICS_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_EXPANSION_CACHE_HITS] = 0
 
     # function ITERATIVE-DEEPENING-SEARCH(problem) returns a solution, or failure
     def search(self, problem):
         self.clear_instrumentation()
 
+        cache = LRUCache(self._cache_size) if self._cache_size else None
+        dls = DepthLimitedSearch(0, cache, self._state_key)
+        dls.set_budget(self._budget)
+
         currLimit = 0
         # for depth = 0 to infinity do
         while True:
             # result <- DEPTH-LIMITED-SEARCH(problem, depth)
-            dls = DepthLimitedSearch(currLimit)
+            dls.clear_instrumentation()
+            dls.set_limit(currLimit)
             result = dls.search(problem)
 
-            self._metrics[self.METRICS_NODES_EXPANDED] = self._metrics[self.METRICS_NODES_EXPANDED] + \
-                                                         dls.get_metrics()[DepthLimitedSearch.METRIC_NODES_EXPANDED]
+            self._metrics[self.METRICS_NODES_EXPANDED] += dls.get_nodes_expanded()
+            self._metrics[self.METRIC_EXPANSION_CACHE_HITS] += dls.get_expansion_cache_hits()
 
-            # if result != cutoff then return result
+            # if result != cutoff then return result (budget exhausted result is returned too)
             if not dls.is_cutoff(result):
                 self._metrics[self.PATH_COST] = dls.get_path_cost()
                 return result
@@ -226,4 +489,272 @@ class IterativeDeepeningSearch(Search):
     def get_metrics(self):
         return self._metrics
 
+    def get_budget(self):
+        return self._budget
+
+    def set_budget(self, budget):
+        """
+        Set budget that limits all iterations of a search together.
+        """
+        self._budget = budget
+
+
+class ReverseStepCostFunction(StepCostFunction):
+    """
+        Step cost of a backward step: cost of a step from new_state to state is the cost of the forward step from
+        new_state to state.
+    """
+    def __init__(self, step_cost_function):
+        self._step_cost_function = step_cost_function
+
+    def c(self, state, action, newState):
+        return self._step_cost_function.c(newState, action, state)
+
+
+class BidirectionalSearch(Search):
+    """
+        Bidirectional search runs two searches simultaneously: one forward from the initial state and one backward from
+        the goal state, and stops when they meet in the middle. If a solution is at depth d and branching factor is b,
+        each search expands about b^(d/2) nodes instead of b^d.
+
+        It can be used with framework.BidirectionalProblem only. Breadth first search is used by default: it expands
+        whole levels of the direction with the smaller frontier and finds a solution with the minimal number of steps.
+        If uniform_cost is True, uniform cost search is done in both directions and a solution with the minimal path
+        cost is found.
+
+        States should be hashable.
+    """
+    METRIC_NODES_EXPANDED = QueueSearch.METRIC_NODES_EXPANDED
+    METRIC_QUEUE_SIZE = QueueSearch.METRIC_QUEUE_SIZE
+    METRIC_MAX_QUEUE_SIZE = QueueSearch.METRIC_MAX_QUEUE_SIZE
+    METRIC_PATH_COST = QueueSearch.METRIC_PATH_COST
+
+    def __init__(self, uniform_cost=False):
+        self._uniform_cost = uniform_cost
+        self._forward_expander = NodeExpander()
+        self._backward_expander = NodeExpander()
+        self._metrics = {}
+        self.clear_instrumentation()
+
+    def clear_instrumentation(self):
+        self._forward_expander.clear_instrumentation()
+        self._backward_expander.clear_instrumentation()
+        self._metrics[self.METRIC_NODES_EXPANDED] = 0
+        self._metrics[self.METRIC_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_MAX_QUEUE_SIZE] = 0
+        self._metrics[self.METRIC_PATH_COST] = 0
+
+    def get_metrics(self):
+        self._metrics[self.METRIC_NODES_EXPANDED] = self._forward_expander.get_nodes_expanded() + \
+                                                    self._backward_expander.get_nodes_expanded()
+        return self._metrics
+
+    def get_budget(self):
+        return self._forward_expander.get_budget()
+
+    def set_budget(self, budget):
+        """
+        Set budget that limits both directions of a search together.
+        """
+        self._forward_expander.set_budget(budget)
+        self._backward_expander.set_budget(budget)
+
+    def search(self, problem):
+        """
+        Search for a solution of a bidirectional problem.
+
+        :param problem (BidirectionalProblem): problem to solve
+        :return: list of actions to reach the goal state, a list with a NoOpAction if initial state is a goal state or
+        an empty list if failed to find a solution.
+        """
+        self.clear_instrumentation()
+
+        root = Node(problem.get_initial_state())
+        if utils.is_goal_state(problem, root):
+            return utils.actions_from_nodes([root])
+
+        backward_problem = Problem(problem.get_goal_state(), problem.get_reverse_action_function(),
+                                   problem.get_reverse_result_function(), problem.get_goal_test(),
+                                   ReverseStepCostFunction(problem.get_step_cost_function()))
+        goal_root = Node(problem.get_goal_state())
+
+        try:
+            if self._uniform_cost:
+                meeting = self._uniform_cost_search(problem, root, backward_problem, goal_root)
+            else:
+                meeting = self._breadth_first_search(problem, root, backward_problem, goal_root)
+        except BudgetExhausted:
+            return self._budget_exhausted()
+
+        if meeting is None:
+            return self._failure()
+
+        forward_node, backward_node = meeting
+        self._metrics[self.METRIC_PATH_COST] = forward_node.get_path_cost() + backward_node.get_path_cost()
+        return self._solution(problem, forward_node, backward_node)
+
+    def _breadth_first_search(self, problem, root, backward_problem, goal_root):
+        forward_reached = {root.get_state(): root}
+        backward_reached = {goal_root.get_state(): goal_root}
+        forward_level = [root]
+        backward_level = [goal_root]
+
+        while forward_level and backward_level:
+            if len(forward_level) <= len(backward_level):
+                forward_level, meeting = self._expand_level(forward_level, problem, self._forward_expander,
+                                                            forward_reached, backward_reached)
+                if meeting is not None:
+                    return meeting
+            else:
+                backward_level, meeting = self._expand_level(backward_level, backward_problem,
+                                                             self._backward_expander, backward_reached,
+                                                             forward_reached)
+                if meeting is not None:
+                    return meeting[1], meeting[0]
+
+            self._set_queue_size(len(forward_level) + len(backward_level))
+            self._check_nodes(len(forward_reached) + len(backward_reached))
+
+        return None
+
+    def _expand_level(self, level, problem, expander, reached, other_reached):
+        """
+        Expand all nodes of a search level.
+
+        :return: nodes of the next level and the best pair of nodes (this direction node, other direction node) where
+        searches met, or None if they didn't meet.
+        """
+        next_level = []
+        meeting = None
+
+        for node in level:
+            for child in expander.iter_expand_node(node, problem):
+                state = child.get_state()
+                if state in reached:
+                    continue
+
+                reached[state] = child
+                next_level.append(child)
+
+                other = other_reached.get(state)
+                if other is not None and (meeting is None or self._is_shorter(child, other, meeting)):
+                    meeting = (child, other)
+
+        return next_level, meeting
+
+    @staticmethod
+    def _is_shorter(node, other, meeting):
+        depth = node.get_depth() + other.get_depth()
+        meeting_depth = meeting[0].get_depth() + meeting[1].get_depth()
+        if depth != meeting_depth:
+            return depth < meeting_depth
+        return node.get_path_cost() + other.get_path_cost() < meeting[0].get_path_cost() + meeting[1].get_path_cost()
+
+    def _uniform_cost_search(self, problem, root, backward_problem, goal_root):
+        forward = _UniformCostDirection(problem, root, self._forward_expander)
+        backward = _UniformCostDirection(backward_problem, goal_root, self._backward_expander)
+
+        best_cost = PlusInfinity()
+        meeting = None
+        if root.get_state() in backward.reached:
+            meeting = (root, backward.reached[root.get_state()])
+            best_cost = meeting[1].get_path_cost()
+
+        while not forward.frontier.is_empty() and not backward.frontier.is_empty():
+            # no path through unexplored nodes can be cheaper than the best path found
+            if forward.min_path_cost() + backward.min_path_cost() >= best_cost:
+                break
+
+            if forward.frontier.length() <= backward.frontier.length():
+                current, other = forward, backward
+            else:
+                current, other = backward, forward
+
+            for child in current.expand_next():
+                other_node = other.reached.get(child.get_state())
+                if other_node is not None and child.get_path_cost() + other_node.get_path_cost() < best_cost:
+                    best_cost = child.get_path_cost() + other_node.get_path_cost()
+                    meeting = (child, other_node) if current is forward else (other_node, child)
+
+            self._set_queue_size(forward.frontier.length() + backward.frontier.length())
+            self._check_nodes(len(forward.reached) + len(backward.reached))
+
+        return meeting
+
+    def _solution(self, problem, forward_node, backward_node):
+        actions = utils.actions_from_nodes(forward_node.get_path_from_root()) if not forward_node.is_root_node() else []
+
+        # backward nodes lead from the meeting state to the goal state, forward actions between them should be found
+        actions_function = problem.get_action_function()
+        result_function = problem.get_result_function()
+        step_cost_function = problem.get_step_cost_function()
+
+        node = backward_node
+        while not node.is_root_node():
+            state = node.get_state()
+            next_state = node.get_parent().get_state()
+
+            best_action = None
+            best_cost = None
+            for action in actions_function.actions(state):
+                if result_function.result(state, action) == next_state:
+                    cost = step_cost_function.c(state, action, next_state)
+                    if best_action is None or cost < best_cost:
+                        best_action = action
+                        best_cost = cost
+
+            actions.append(best_action)
+            node = node.get_parent()
+
+        return actions
+
+    def _check_nodes(self, nodes):
+        budget = self._forward_expander.get_budget()
+        if budget is not None:
+            budget.check_nodes(nodes)
+
+    def _set_queue_size(self, size):
+        self._metrics[self.METRIC_QUEUE_SIZE] = size
+        if size > self._metrics[self.METRIC_MAX_QUEUE_SIZE]:
+            self._metrics[self.METRIC_MAX_QUEUE_SIZE] = size
+
+
+class _UniformCostDirection:
+    """
+        State of one direction of a bidirectional uniform cost search
+    """
+    def __init__(self, problem, root, expander):
+        self.problem = problem
+        self.expander = expander
+        self.frontier = PriorityQueue(key=Node.get_path_cost)
+        self.frontier.add(root)
+        self.reached = {root.get_state(): root}
+        self.explored = set()
+
+    def min_path_cost(self):
+        return self.frontier.element().get_path_cost()
+
+    def expand_next(self):
+        """
+        Expand the cheapest node of a frontier.
+
+        :return (iterator): children that reach their states cheaper than any node before
+        """
+        node = self.frontier.pop()
+        self.explored.add(node.get_state())
+
+        for child in self.expander.iter_expand_node(node, self.problem):
+            state = child.get_state()
+            if state in self.explored:
+                continue
+
+            old_node = self.reached.get(state)
+            if old_node is not None:
+                if old_node.get_path_cost() <= child.get_path_cost():
+                    continue
+                self.frontier.remove(old_node)
+
+            self.reached[state] = child
+            self.frontier.add(child)
+            yield child
 
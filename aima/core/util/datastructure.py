@@ -1,5 +1,11 @@
 from abc import ABCMeta
+from array import array
+from bisect import bisect_left
+from collections import deque, OrderedDict
+from functools import cmp_to_key
+from heapq import heappush, heappop, heapify
 from math import sqrt
+import random
 
 __author__ = 'Ivan Mushketik'
 __docformat__ = 'restructuredtext en'
@@ -71,27 +77,326 @@ class Queue(metaclass=ABCMeta):
         else:
             return False
 
+    def __contains__(self, element):
+        return element in self._list
+
     def __str__(self):
         return str(self._list)
 
         
 
-class LIFOQueue(Queue):
-    def __init__(self):
+class DequeQueue(Queue):
+    """
+        Base class for queues that add and pop elements at the ends of a deque, so add() and pop() are O(1).
+
+        If a queue is created with indexed=True it also counts its elements in a hash index. Then membership checks and
+        remove() are O(1) as well: removed element stays in a deque and is skipped when it is popped. Elements stored
+        in an indexed queue should be hashable.
+    """
+    def __init__(self, indexed=False):
         super().__init__()
+        self._list = deque()
+        self._size = 0
+        if indexed:
+            self._index = {}
+            self._removed = {}
+        else:
+            self._index = None
+            self._removed = None
+
+    def is_empty(self):
+        return self._size == 0
+
+    def length(self):
+        return self._size
 
     def add(self, element):
-        self._list.insert(0, element)
+        self._list.append(element)
+        self._size += 1
 
+        if self._index is not None:
+            self._index[element] = self._index.get(element, 0) + 1
 
-class FIFOQueue(Queue):
-    def __init__(self):
+    def element(self):
+        if self._size == 0:
+            return None
+
+        if self._index is not None:
+            self._drop_removed_elements()
+        return self._peek_next()
+
+    def pop(self):
+        if self._size == 0:
+            return None
+
+        if self._index is not None:
+            self._drop_removed_elements()
+            self._decrease_count(self._index, self._peek_next())
+
+        self._size -= 1
+        return self._take_next()
+
+    def remove(self, to_remove):
+        if self._index is None:
+            try:
+                self._list.remove(to_remove)
+            except ValueError:
+                return False
+        else:
+            if not self._decrease_count(self._index, to_remove):
+                return False
+            self._removed[to_remove] = self._removed.get(to_remove, 0) + 1
+
+        self._size -= 1
+        return True
+
+    def __contains__(self, element):
+        if self._index is not None:
+            return element in self._index
+        else:
+            return element in self._list
+
+    def __str__(self):
+        elements = self._elements_in_pop_order()
+        if self._removed:
+            removed = dict(self._removed)
+            live = []
+            for element in elements:
+                if self._decrease_count(removed, element):
+                    continue
+                live.append(element)
+            elements = live
+
+        return str(elements)
+
+    def _peek_next(self):
+        """ Return element that will be popped next without removing it """
+        raise NotImplementedError()
+
+    def _take_next(self):
+        """ Remove and return element from the end of a deque that is popped first """
+        raise NotImplementedError()
+
+    def _elements_in_pop_order(self):
+        raise NotImplementedError()
+
+    def _drop_removed_elements(self):
+        while self._removed and self._decrease_count(self._removed, self._peek_next()):
+            self._take_next()
+
+    @staticmethod
+    def _decrease_count(counts, element):
+        """
+        Decrease number of occurrences of an element in a counting dict.
+
+        :return (bool): True if element was counted, False otherwise
+        """
+        count = counts.get(element)
+        if not count:
+            return False
+
+        if count == 1:
+            del counts[element]
+        else:
+            counts[element] = count - 1
+        return True
+
+
+class LIFOQueue(DequeQueue):
+    def __init__(self, indexed=False):
+        super().__init__(indexed)
+
+    def _peek_next(self):
+        return self._list[-1]
+
+    def _take_next(self):
+        return self._list.pop()
+
+    def _elements_in_pop_order(self):
+        return list(reversed(self._list))
+
+
+class FIFOQueue(DequeQueue):
+    def __init__(self, indexed=False):
+        super().__init__(indexed)
+
+    def _peek_next(self):
+        return self._list[0]
+
+    def _take_next(self):
+        return self._list.popleft()
+
+    def _elements_in_pop_order(self):
+        return list(self._list)
+
+class PriorityQueue(Queue):
+    """
+        Priority queue backed by a binary heap. Elements are ordered either by a comparator or by a key function, an
+        element with the lowest priority is popped first and elements with equal priority are popped in the order they
+        were added.
+
+        A key function is called only once for every added element and its result is cached in the heap entry, so heap
+        operations compare cached keys. A comparator is called for every comparison of two elements instead.
+
+        Every element is indexed by its hash, so remove() is O(log n) as well as add() and pop(): removed entry is only
+        marked as invalid and dropped when it reaches the top of the heap. Together with add() this gives a lazy
+        decrease-key operation (see replace()). Elements stored in this queue should be hashable.
+    """
+    # Heap entry is a list [priority, counter, element, removed]. Counter is unique, so elements are never compared
+    _PRIORITY = 0
+    _ELEMENT = 2
+    _REMOVED = 3
+
+    def __init__(self, comparator=None, key=None):
+        """
+        PriorityQueue constructor. Either comparator or key should be specified.
+
+        :param comparator (Comparator): comparator that says which of two elements should be popped first
+        :param key: function that returns priority of an element. Element with the lowest priority is popped first.
+        """
         super().__init__()
+        self._comparator = comparator
+        self._key_function = key
+        if key is None:
+            if comparator is None:
+                raise ValueError("Either comparator or key should be specified")
+            key = cmp_to_key(comparator.compare)
+
+        self._key = key
+        self._heap = []
+        self._index = {}
+        self._counter = 0
+        self._size = 0
+        self._key_evaluations = 0
+        self._heap_levels = 0
+
+    def is_empty(self):
+        return self._size == 0
+
+    def length(self):
+        return self._size
 
     def add(self, element):
-        self._list.append(element)
+        self._counter += 1
+        entry = [self._key(element), self._counter, element, False]
+        self._key_evaluations += 1
+        self._heap_levels += len(self._heap).bit_length()
 
-class PriorityQueue(Queue):
+        self._index.setdefault(element, []).append(entry)
+        self._size += 1
+        heappush(self._heap, entry)
+
+    def element(self):
+        self._drop_removed_entries()
+        if self._heap:
+            return self._heap[0][self._ELEMENT]
+        else:
+            return None
+
+    def pop(self):
+        self._drop_removed_entries()
+        if not self._heap:
+            return None
+
+        self._heap_levels += len(self._heap).bit_length()
+        entry = heappop(self._heap)
+        self._unindex(entry)
+        self._size -= 1
+        return entry[self._ELEMENT]
+
+    def remove(self, element):
+        entries = self._index.get(element)
+        if not entries:
+            return False
+
+        entry = entries.pop()
+        if not entries:
+            del self._index[element]
+        entry[self._REMOVED] = True
+        self._size -= 1
+
+        # Too many invalid entries slow down every heap operation, so rebuild the heap when they prevail
+        if len(self._heap) > 2 * self._size + 32:
+            self._heap = [e for e in self._heap if not e[self._REMOVED]]
+            heapify(self._heap)
+
+        return True
+
+    def replace(self, old_element, new_element):
+        """
+        Replace an element in a queue with a new one (e.g. with the same element with a decreased priority).
+
+        :param old_element: an element to remove from a queue
+        :param new_element: an element to add instead
+        :return (bool): True if old element was found in a queue, False otherwise. New element is added in any case.
+        """
+        removed = self.remove(old_element)
+        self.add(new_element)
+        return removed
+
+    def get_key_function(self):
+        """
+        :return: key function that is used to calculate priorities, or None if elements are ordered by a comparator
+        """
+        return self._key_function
+
+    def get_priority(self, element):
+        """
+        Get cached priority of an element in a queue.
+
+        :param element: element to get priority of
+        :return: priority calculated by a key function when an element was added, or None if element isn't in a queue
+        """
+        entries = self._index.get(element)
+        if not entries:
+            return None
+        return entries[-1][self._PRIORITY]
+
+    def get_key_evaluations(self):
+        """
+        Get number of times a key function (or a comparator) was called to calculate priorities of elements.
+
+        :return (int): number of priority calculations
+        """
+        return self._key_evaluations
+
+    def get_heap_levels(self):
+        """
+        Get total number of heap levels that added and popped elements could pass. It's an upper bound of a number of
+        comparisons between elements done by a heap.
+
+        :return (int): number of heap levels
+        """
+        return self._heap_levels
+
+    def __contains__(self, element):
+        return element in self._index
+
+    def __str__(self):
+        return str([entry[self._ELEMENT] for entry in sorted(self._heap) if not entry[self._REMOVED]])
+
+    def _drop_removed_entries(self):
+        heap = self._heap
+        while heap and heap[0][self._REMOVED]:
+            heappop(heap)
+
+    def _unindex(self, entry):
+        element = entry[self._ELEMENT]
+        entries = self._index[element]
+        if len(entries) == 1:
+            del self._index[element]
+        else:
+            for i in range(len(entries)):
+                if entries[i] is entry:
+                    del entries[i]
+                    break
+
+
+class SortedListPriorityQueue(Queue):
+    """
+        Priority queue that keeps its elements in a sorted list. Insertion and removal are O(n), so it should only be used
+        for small queues or when a sorted view of all elements is needed. PriorityQueue should be used in searches.
+    """
     def __init__(self, comparator):
         super().__init__()
         self._comparator = comparator
@@ -124,6 +429,97 @@ class PriorityQueue(Queue):
         return (l, False)
 
 
+class LRUCache:
+    """
+        Mapping with a bounded number of entries. When it is full, the least recently used entry is evicted to make
+        room for a new one.
+    """
+    def __init__(self, maxsize):
+        """
+        LRUCache constructor
+
+        :param maxsize (int): max number of entries in a cache
+        """
+        if maxsize <= 0:
+            raise ValueError("Cache size should be positive")
+
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Get a value by a key and mark an entry as the most recently used.
+
+        :param key: key of an entry
+        :param default: value that is returned if there is no entry with a specified key
+        :return: value of an entry or default value
+        """
+        entries = self._entries
+        value = entries.get(key, default)
+        if value is not default:
+            entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Add or update an entry. The least recently used entry is evicted if cache is full.
+
+        :param key: key of an entry
+        :param value: value of an entry
+        :return: None
+        """
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self._maxsize:
+            entries.popitem(last=False)
+            self._evictions += 1
+        entries[key] = value
+
+    def clear(self):
+        self._entries.clear()
+        self._evictions = 0
+
+    def get_maxsize(self):
+        return self._maxsize
+
+    def get_evictions(self):
+        return self._evictions
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ZobristTable:
+    """
+        Random 64-bit numbers for every pair of a board position and a value (Zobrist hashing). Hash of a board is XOR
+        of numbers of its non-empty positions, so when a value of one position changes, hash is updated in constant
+        time by XOR with numbers of the old and the new value.
+    """
+    def __init__(self, positions, values, seed=0):
+        """
+        ZobristTable constructor. Tables with the same arguments have the same numbers.
+
+        :param positions (int): number of positions of a board
+        :param values (int): number of non-empty values a position can have
+        :param seed: seed of a random generator
+        """
+        rnd = random.Random(seed)
+        self._numbers = [[rnd.getrandbits(64) for value in range(values)] for position in range(positions)]
+
+    def get(self, position, value=0):
+        """
+        :param position (int): index of a position
+        :param value (int): index of a value
+        :return (int): random number of a value at a position
+        """
+        return self._numbers[position][value]
+
+
 class Point2D:
     """
         Point to two-dimensional space
@@ -164,13 +560,15 @@ class LabeledGraph:
 
     def remove_vertex(self, vertex):
         """
-        Remove vertex from a graph
+        Remove vertex from a graph with all edges from and to it
 
         :param vertex: vertex to remove
         :return: None
         """
         if self.graph.get(vertex) != None:
             del self.graph[vertex]
+            for edges in self.graph.values():
+                edges.pop(vertex, None)
 
     def set_edge(self, from_vertex, to_vertex, label):
         """
@@ -192,10 +590,10 @@ class LabeledGraph:
 
         :param from_vertex:
         :param to_vertex:
-        :return: label of a graph's edge.
+        :return: label of a graph's edge, or None if there is no such edge.
         """
-        if self.graph.get(from_vertex) != None and self.graph.get(to_vertex) != None:
-            return self.graph[from_vertex][to_vertex]
+        if self.graph.get(from_vertex) != None:
+            return self.graph[from_vertex].get(to_vertex)
         else:
             return None
 
@@ -207,7 +605,8 @@ class LabeledGraph:
         :param to_vertex:
         :return: None
         """
-        self.set_edge(from_vertex, to_vertex, None)
+        if self.graph.get(from_vertex) != None:
+            self.graph[from_vertex].pop(to_vertex, None)
 
     def vertexes(self):
         """
@@ -229,6 +628,130 @@ class LabeledGraph:
         else:
             return None
 
+    def get_edges(self, vertex):
+        """
+        Get edges from a specified vertex
+
+        :param vertex: a vertex
+        :return: iterable of (connected vertex, label) pairs, it's empty if a vertex doesn't exist
+        """
+        edges = self.graph.get(vertex)
+        if edges is None:
+            return ()
+        return edges.items()
+
+    def freeze(self):
+        """
+        Create a read only copy of a graph in a compact form.
+
+        :return (FrozenLabeledGraph): frozen graph
+        """
+        return FrozenLabeledGraph(self)
+
+
+class FrozenLabeledGraph:
+    """
+        Read only directed labeled graph in compressed sparse row form. Vertexes are interned to ids in order of their
+        insertion into an original graph. Edges from a vertex with id i are at positions [offsets[i], offsets[i + 1])
+        of targets and labels arrays, sorted by ids of their targets, so there are no per-vertex dicts and an edge is
+        looked up with a binary search. If all labels are integers or all of them are floats, they are stored as an
+        array of 64-bit integers or doubles, otherwise as a list, so labels keep their types.
+
+        It has the same read methods as LabeledGraph and is created with LabeledGraph.freeze().
+    """
+    def __init__(self, graph):
+        """
+        FrozenLabeledGraph constructor
+
+        :param graph (LabeledGraph): graph to copy
+        """
+        self._vertexes = list(graph.graph.keys())
+        self._ids = dict((vertex, i) for i, vertex in enumerate(self._vertexes))
+
+        ids = self._ids
+        self.offsets = array("q", [0])
+        self.targets = array("i")
+        labels = []
+        for vertex in self._vertexes:
+            edges = sorted(((ids[to_vertex], label) for to_vertex, label in graph.graph[vertex].items()),
+                           key=lambda edge: edge[0])
+            self.targets.extend(target for target, label in edges)
+            labels.extend(label for target, label in edges)
+            self.offsets.append(len(self.targets))
+
+        self.labels = labels
+        if all(type(label) is float for label in labels):
+            self.labels = array("d", labels)
+        elif all(type(label) is int for label in labels):
+            try:
+                self.labels = array("q", labels)
+            except OverflowError:
+                pass
+
+    def vertexes(self):
+        """
+        Get all vertexes in a graph
+
+        :return: vertexes in order of their ids
+        """
+        return self._ids.keys()
+
+    def get_vertex(self, vertex_id):
+        return self._vertexes[vertex_id]
+
+    def get_vertex_id(self, vertex):
+        """
+        :return (int): id of a vertex, or None if a vertex doesn't exist
+        """
+        return self._ids.get(vertex)
+
+    def get_edge(self, from_vertex, to_vertex):
+        """
+        Get label of a graph's edge
+
+        :return: label of a graph's edge, or None if there is no such edge.
+        """
+        from_id = self.get_vertex_id(from_vertex)
+        to_id = self.get_vertex_id(to_vertex)
+        if from_id is None or to_id is None:
+            return None
+
+        end = self.offsets[from_id + 1]
+        i = bisect_left(self.targets, to_id, self.offsets[from_id], end)
+        if i < end and self.targets[i] == to_id:
+            return self.labels[i]
+        return None
+
+    def get_successors(self, vertex):
+        """
+        Get vertexes connected to a specified vertex
+
+        :param vertex: - a vertex
+        :return (list): list of connected vertexes, if specified vertex exists, or None otherwise.
+        """
+        i = self.get_vertex_id(vertex)
+        if i is None:
+            return None
+        get_vertex = self.get_vertex
+        return [get_vertex(target) for target in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def get_edges(self, vertex):
+        """
+        Get edges from a specified vertex
+
+        :param vertex: a vertex
+        :return (list): list of (connected vertex, label) pairs, it's empty if a vertex doesn't exist
+        """
+        i = self.get_vertex_id(vertex)
+        if i is None:
+            return []
+        start, end = self.offsets[i], self.offsets[i + 1]
+        get_vertex = self.get_vertex
+        return list(zip([get_vertex(target) for target in self.targets[start:end]], self.labels[start:end]))
+
+    def freeze(self):
+        return self
+
 
 class XYLocation:
     def __init__(self, x, y):
@@ -253,5 +776,8 @@ class XYLocation:
 
         return self.x == other.x and self.y == other.y
 
+    def __hash__(self):
+        return hash((self.x, self.y))
+
     def __str__(self):
         return "XYLocation(" + str(self.x) + ", " + str(self.y) + ")"
\ No newline at end of file
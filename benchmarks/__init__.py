@@ -0,0 +1,8 @@
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Performance benchmarks of search algorithms. Every module can be run as a script from the repository root, e.g.:
+
+     python -m benchmarks.priority_queue
+"""
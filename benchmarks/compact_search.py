@@ -0,0 +1,82 @@
+import gc
+import tracemalloc
+from time import perf_counter
+from aima.core.search.compact import CompactGraphSearch, IntegerStateInterner
+from aima.core.search.framework import GraphSearch, Problem, ActionFunction, ResultFunction, GoalTest
+from aima.core.util.datastructure import FIFOQueue
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Compares GraphSearch that creates Node objects with CompactGraphSearch that stores search tree in arrays. Both run
+ breadth first search over a grid where every cell is numbered, so the whole grid is explored. Peak memory, number of
+ garbage collections and time are reported.
+
+     python -m benchmarks.compact_search
+"""
+
+GRID_SIZES = [100, 300, 700]
+
+
+class GridActionsFunction(ActionFunction):
+    """
+        Cell number is y * size + x, action is a number of a neighbouring cell
+    """
+    def __init__(self, size):
+        self.size = size
+
+    def actions(self, cell):
+        size = self.size
+        x = cell % size
+        actions = []
+        if x > 0:
+            actions.append(cell - 1)
+        if x < size - 1:
+            actions.append(cell + 1)
+        if cell >= size:
+            actions.append(cell - size)
+        if cell < size * (size - 1):
+            actions.append(cell + size)
+        return actions
+
+class GridResultFunction(ResultFunction):
+    def result(self, cell, action):
+        return action
+
+class NoGoalTest(GoalTest):
+    def is_goal_state(self, cell):
+        return False
+
+
+def measure(search, problem, frontier):
+    gc.collect()
+    collections_before = sum(stat["collections"] for stat in gc.get_stats())
+
+    tracemalloc.start()
+    start = perf_counter()
+    search.search(problem, frontier)
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections_before
+    return peak, collections, elapsed
+
+
+def main():
+    print("%10s %12s %12s %8s %8s %10s %10s" % ("grid", "nodes, MB", "compact, MB", "gc", "gc", "nodes, s",
+                                                  "compact, s"))
+    for size in GRID_SIZES:
+        problem = Problem(0, GridActionsFunction(size), GridResultFunction(), NoGoalTest())
+
+        node_peak, node_gc, node_time = measure(GraphSearch(), problem, FIFOQueue())
+        compact_peak, compact_gc, compact_time = measure(CompactGraphSearch(IntegerStateInterner), problem,
+                                                         FIFOQueue())
+
+        print("%10s %12.1f %12.1f %8d %8d %10.2f %10.2f" % (str(size) + "x" + str(size), node_peak / 2 ** 20,
+                                                          compact_peak / 2 ** 20, node_gc, compact_gc, node_time,
+                                                          compact_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+from time import perf_counter
+from aima.core.environment.map import MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction, \
+    MapDijkstraSearch
+from aima.core.search.framework import Problem, QueueSearch
+from aima.core.search.uninformed import UniformCostSearch
+from benchmarks.generators import create_random_map, random_map_location
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Compares generic UniformCostSearch, that creates Node and Action objects for every expanded link, with
+ MapDijkstraSearch that runs directly on map links. Both search for paths between random pairs of locations on
+ synthetic road maps and must find paths of the same cost.
+
+     python -m benchmarks.dijkstra
+"""
+
+MAP_SIZES = [1000, 10000, 50000]
+QUERIES = 5
+
+
+def time_search(search, problems):
+    """
+    Solve a list of problems with a search.
+
+    :return (float, int, list): time in seconds, total number of expanded nodes and path costs
+    """
+    expanded = 0
+    costs = []
+
+    start = perf_counter()
+    for problem in problems:
+        search.search(problem)
+        metrics = search.get_metrics()
+        expanded += metrics[QueueSearch.METRIC_NODES_EXPANDED]
+        costs.append(metrics[QueueSearch.METRIC_PATH_COST])
+
+    return perf_counter() - start, expanded, costs
+
+
+def main():
+    print("%10s %10s %12s %12s %10s" % ("locations", "expanded", "generic, s", "dijkstra, s", "speedup"))
+    for size in MAP_SIZES:
+        map = create_random_map(size)
+        problems = []
+        for i in range(QUERIES):
+            goal = random_map_location((i * 7919 + size // 2) % size)
+            problems.append(Problem(random_map_location(i), MapActionFunction(map), MapResultFunction(),
+                                    MapGoalTestFunction(goal), MapStepCostFunction(map)))
+
+        generic_time, expanded, generic_costs = time_search(UniformCostSearch(), problems)
+        dijkstra_time, expanded, dijkstra_costs = time_search(MapDijkstraSearch(map), problems)
+        assert generic_costs == dijkstra_costs
+
+        print("%10d %10d %12.3f %12.3f %10.1f" % (size, expanded, generic_time, dijkstra_time,
+                                                 generic_time / dijkstra_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+from random import Random
+from aima.core.environment.map import ExtendableMap
+from aima.core.environment.nqueens import NQueensBoard
+from aima.core.search.csp import CSP, Variable, Domain, NotEqualConstraint
+from aima.core.util.datastructure import Point2D, XYLocation
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Generators of synthetic problems for benchmarks. All generators are deterministic for a given seed.
+"""
+
+def grid_location(x, y):
+    """
+    Name of a location in a map created by create_grid_map()
+
+    :param x (int): column of a location
+    :param y (int): row of a location
+    :return (str): name of a location
+    """
+    return str(x) + "_" + str(y)
+
+def create_grid_map(width, height, seed=0, max_detour=0.5):
+    """
+    Create a road map where locations form a grid and every location is linked with its four neighbours. Length of a
+    road is not less than a straight line distance between locations, so MapHeuristicFunction is admissible for it.
+
+    :param width (int): number of columns in a grid
+    :param height (int): number of rows in a grid
+    :param seed: seed of a random generator
+    :param max_detour (float): max ratio by which road is longer than a straight line between locations
+    :return (ExtendableMap): created map
+    """
+    rnd = Random(seed)
+    map = ExtendableMap()
+
+    for y in range(height):
+        for x in range(width):
+            map.set_position(grid_location(x, y), Point2D(x * 10.0, y * 10.0))
+
+    for y in range(height):
+        for x in range(width):
+            location = grid_location(x, y)
+            if x + 1 < width:
+                map.add_bidirectional_link(location, grid_location(x + 1, y), 10.0 * (1 + rnd.random() * max_detour))
+            if y + 1 < height:
+                map.add_bidirectional_link(location, grid_location(x, y + 1), 10.0 * (1 + rnd.random() * max_detour))
+
+    return map
+
+def create_random_map(number_of_locations, links_per_location=3, seed=0, size=1000.0, max_detour=0.5):
+    """
+    Create a road map similar to the simplified map of Romania but with an arbitrary number of locations. Locations are
+    scattered randomly on a square and every location is linked with a few of its nearest locations, so a map looks like
+    a road network. Length of a road is not less than a straight line distance between locations, so
+    MapHeuristicFunction is admissible for it.
+
+    Locations are named "L0", "L1", ... and links are bidirectional. Map isn't necessarily connected.
+
+    :param number_of_locations (int): number of locations in a map
+    :param links_per_location (int): number of nearest locations each location is linked with
+    :param seed: seed of a random generator
+    :param size (float): length of a side of a square where locations are placed
+    :param max_detour (float): max ratio by which road is longer than a straight line between locations
+    :return (ExtendableMap): created map
+    """
+    rnd = Random(seed)
+    map = ExtendableMap()
+
+    # split the square into cells, so that nearest locations are looked up only in neighbouring cells
+    cells_per_side = max(1, int((number_of_locations / 4) ** 0.5))
+    cell_size = size / cells_per_side
+    cells = {}
+
+    positions = []
+    for i in range(number_of_locations):
+        position = Point2D(rnd.random() * size, rnd.random() * size)
+        positions.append(position)
+        map.set_position(random_map_location(i), position)
+        cell = (int(position.x / cell_size), int(position.y / cell_size))
+        cells.setdefault(cell, []).append(i)
+
+    for i in range(number_of_locations):
+        position = positions[i]
+        cx, cy = int(position.x / cell_size), int(position.y / cell_size)
+
+        candidates = []
+        radius = 1
+        while len(candidates) <= links_per_location and radius <= cells_per_side:
+            candidates = [j for x in range(cx - radius, cx + radius + 1) for y in range(cy - radius, cy + radius + 1)
+                          for j in cells.get((x, y), ()) if j != i]
+            radius += 1
+
+        candidates.sort(key=lambda j: position.distance(positions[j]))
+        for j in candidates[:links_per_location]:
+            distance = position.distance(positions[j]) * (1 + rnd.random() * max_detour)
+            map.add_bidirectional_link(random_map_location(i), random_map_location(j), distance)
+
+    return map
+
+def random_map_location(i):
+    """
+    Name of a location in a map created by create_random_map()
+
+    :param i (int): number of a location
+    :return (str): name of a location
+    """
+    return "L" + str(i)
+
+def create_random_graph(number_of_vertices, edges_per_vertex=4, seed=0, max_cost=10):
+    """
+    Create a random directed graph without positions of locations: every location is linked with a few locations chosen
+    uniformly at random. Unlike a road map such graph has no locality, so a search frontier grows as fast as a branching
+    factor allows.
+
+    Locations are named "L0", "L1", ... (as in create_random_map()), every location i is linked with location i + 1, so
+    every location is reachable from "L0".
+
+    :param number_of_vertices (int): number of locations
+    :param edges_per_vertex (int): number of links from every location
+    :param seed: seed of a random generator
+    :param max_cost (int): max length of a link, lengths are integers from 1 to max_cost
+    :return (ExtendableMap): created map, its links are a LabeledGraph
+    """
+    rnd = Random(seed)
+    map = ExtendableMap()
+
+    for i in range(number_of_vertices):
+        map.add_location(random_map_location(i))
+
+    for i in range(number_of_vertices):
+        targets = set()
+        if i + 1 < number_of_vertices:
+            targets.add(i + 1)
+        while len(targets) < min(edges_per_vertex, number_of_vertices - 1):
+            j = rnd.randrange(number_of_vertices)
+            if j != i:
+                targets.add(j)
+
+        for j in sorted(targets):
+            map.add_unidirectional_link(random_map_location(i), random_map_location(j), rnd.randint(1, max_cost))
+
+    return map
+
+def create_nqueens_board(size, seed=0):
+    """
+    Create N-Queens board with one queen in every column placed in a random row, an initial state for local searches.
+
+    :param size (int): size of a board
+    :param seed: seed of a random generator
+    :return (NQueensBoard): created board
+    """
+    rnd = Random(seed)
+    board = NQueensBoard(size)
+    for x in range(size):
+        board.add_queen_at(XYLocation(x, rnd.randrange(size)))
+    return board
+
+def create_random_csp(number_of_variables, domain_size=3, density=0.1, seed=0):
+    """
+    Create a random graph colouring CSP: every constraint is a NotEqualConstraint between two variables. CSP is
+    generated around a hidden solution (every variable has a hidden colour and only variables with different colours
+    are constrained), so it always has a solution.
+
+    :param number_of_variables (int): number of variables, named "X0", "X1", ...
+    :param domain_size (int): number of values in every domain
+    :param density (float): probability that two variables with different hidden colours are constrained
+    :param seed: seed of a random generator
+    :return (CSP): created CSP
+    """
+    rnd = Random(seed)
+    variables = [Variable("X" + str(i)) for i in range(number_of_variables)]
+    csp = CSP(variables)
+
+    domain = Domain(list(range(domain_size)))
+    for var in variables:
+        csp.set_domain(var, domain)
+
+    hidden_solution = [rnd.randrange(domain_size) for var in variables]
+    for i in range(number_of_variables):
+        for j in range(i + 1, number_of_variables):
+            if hidden_solution[i] != hidden_solution[j] and rnd.random() < density:
+                csp.add_constraint(NotEqualConstraint(variables[i], variables[j]))
+
+    return csp
@@ -0,0 +1,87 @@
+import tracemalloc
+from aima.core.environment.map import MapHeuristicFunction, MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.search.framework import GraphSearch, Problem, Node
+from aima.core.search.informed import AStarSearch
+from aima.core.search.uninformed import BreadthFirstSearch
+from benchmarks.generators import create_random_map, random_map_location
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Memory benchmark of search nodes. It reports size of a single Node compared with a node that has an instance dict,
+ and peak memory allocated by BFS and A* graph searches per generated node on random maps that look like the map of
+ Romania scaled up to many locations.
+
+     python -m benchmarks.node_memory
+"""
+
+MAP_SIZES = [1000, 10000, 50000]
+NUMBER_OF_NODES = 100000
+
+
+class DictNode:
+    """ Node with the same fields as framework.Node but without __slots__ """
+    def __init__(self, state, stepCost=0, parent=None, action=None):
+        self._state = state
+        self._parent = parent
+        self._action = action
+
+        if parent is not None:
+            self._pathCost = parent._pathCost + stepCost
+            self._depth = parent._depth + 1
+        else:
+            self._pathCost = stepCost
+            self._depth = 0
+
+
+def bytes_per_node(node_class, number_of_nodes=NUMBER_OF_NODES):
+    tracemalloc.start()
+    node = node_class(0)
+    for i in range(number_of_nodes):
+        node = node_class(0, 1.0, node, None)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return allocated / number_of_nodes
+
+
+def search_memory(search, queue_search, problem):
+    """
+    Run a search and measure its peak memory.
+
+    :return (int, int): peak number of allocated bytes and number of generated nodes
+    """
+    tracemalloc.start()
+    search.search(problem)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    metrics = queue_search.get_metrics()
+    # every expanded node was generated, and nodes left in frontier were generated too
+    generated = metrics[queue_search.METRIC_NODES_EXPANDED] + metrics[queue_search.METRIC_QUEUE_SIZE]
+    return peak, generated
+
+
+def main():
+    print("Node: %.1f bytes, node with instance dict: %.1f bytes" % (bytes_per_node(Node), bytes_per_node(DictNode)))
+    print()
+
+    print("%10s %6s %10s %15s" % ("locations", "search", "nodes", "bytes per node"))
+    for size in MAP_SIZES:
+        map = create_random_map(size)
+        start = random_map_location(0)
+        goal = random_map_location(size - 1)
+        problem = Problem(start, MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(goal),
+                          MapStepCostFunction(map))
+
+        gs = GraphSearch()
+        peak, generated = search_memory(BreadthFirstSearch(gs), gs, problem)
+        print("%10d %6s %10d %15.1f" % (size, "BFS", generated, peak / max(generated, 1)))
+
+        gs = GraphSearch()
+        peak, generated = search_memory(AStarSearch(gs, MapHeuristicFunction(map, goal)), gs, problem)
+        print("%10d %6s %10d %15.1f" % (size, "A*", generated, peak / max(generated, 1)))
+
+if __name__ == '__main__':
+    main()
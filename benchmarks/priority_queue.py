@@ -0,0 +1,105 @@
+from random import Random
+from time import perf_counter
+from aima.core.environment.map import MapHeuristicFunction, MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.search.framework import GraphSearch, Problem
+from aima.core.search.informed import AStarSearch
+from aima.core.util.datastructure import PriorityQueue, SortedListPriorityQueue
+from aima.core.util.other import Comparator
+from benchmarks.generators import create_grid_map, grid_location
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Benchmark of the heap-based PriorityQueue against the sorted list implementation it replaced. First part pushes and
+ pops random priorities, second part runs A* graph search on a synthetic grid map with each frontier implementation:
+ sorted list, heap ordered by a comparator and heap ordered by cached priority keys.
+
+     python -m benchmarks.priority_queue
+"""
+
+QUEUE_SIZES = [1000, 10000, 100000]
+GRID_SIZES = [30, 60, 100]
+
+
+class NumberComparator(Comparator):
+    def compare(self, first, second):
+        return first - second
+
+
+class SortedListAStarSearch(AStarSearch):
+    """
+        A* search that uses the old sorted list frontier
+    """
+    def _create_frontier(self, comparator, key):
+        return SortedListPriorityQueue(comparator)
+
+
+class ComparatorAStarSearch(AStarSearch):
+    """
+        A* search that orders heap by a comparator instead of cached priority keys
+    """
+    def _create_frontier(self, comparator, key):
+        return PriorityQueue(comparator)
+
+
+def time_queue(queue_class, size, seed=0):
+    """
+    Push a number of random priorities to a queue, replace every tenth of them and pop all elements.
+
+    :return (float): time in seconds
+    """
+    rnd = Random(seed)
+    values = [rnd.random() for i in range(size)]
+    queue = queue_class(NumberComparator())
+
+    start = perf_counter()
+    for value in values:
+        queue.add(value)
+    for value in values[::10]:
+        queue.remove(value)
+        queue.add(value / 2)
+    while not queue.is_empty():
+        queue.pop()
+
+    return perf_counter() - start
+
+
+def time_astar(search_class, size):
+    """
+    Find path between opposite corners of a grid map with A* graph search.
+
+    :return (float, int): time in seconds and number of expanded nodes
+    """
+    map = create_grid_map(size, size)
+    start_location = grid_location(0, 0)
+    goal = grid_location(size - 1, size - 1)
+    problem = Problem(start_location, MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(goal),
+                      MapStepCostFunction(map))
+
+    gs = GraphSearch()
+    search = search_class(gs, MapHeuristicFunction(map, goal))
+
+    start = perf_counter()
+    search.search(problem)
+    return perf_counter() - start, gs.get_nodes_expanded()
+
+
+def main():
+    print("Queue operations")
+    print("%10s %15s %15s" % ("size", "sorted list, s", "heap, s"))
+    for size in QUEUE_SIZES:
+        print("%10d %15.4f %15.4f" % (size, time_queue(SortedListPriorityQueue, size), time_queue(PriorityQueue, size)))
+
+    print()
+    print("A* on a grid map")
+    print("%10s %10s %15s %15s %15s" % ("grid", "expanded", "sorted list, s", "heap, s", "heap + key, s"))
+    for size in GRID_SIZES:
+        old_time, expanded = time_astar(SortedListAStarSearch, size)
+        comparator_time, expanded = time_astar(ComparatorAStarSearch, size)
+        key_time, expanded = time_astar(AStarSearch, size)
+        print("%10s %10d %15.4f %15.4f %15.4f" % (str(size) + "x" + str(size), expanded, old_time, comparator_time,
+                                                 key_time))
+
+if __name__ == '__main__':
+    main()
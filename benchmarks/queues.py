@@ -0,0 +1,59 @@
+from time import perf_counter
+from aima.core.environment.map import MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.search.framework import GraphSearch, Problem
+from aima.core.util.datastructure import Queue, FIFOQueue, LIFOQueue
+from benchmarks.generators import create_grid_map, grid_location
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Benchmark of deque-backed FIFO/LIFO queues against list-backed queues they replaced. BFS and DFS graph searches
+ are run on synthetic grid maps from one corner to the opposite one.
+
+     python -m benchmarks.queues
+"""
+
+GRID_SIZES = [100, 300, 700]
+
+
+class ListFIFOQueue(Queue):
+    """ FIFO queue that pops from the head of a list """
+    def add(self, element):
+        self._list.append(element)
+
+
+class ListLIFOQueue(Queue):
+    """ LIFO queue that inserts to the head of a list """
+    def add(self, element):
+        self._list.insert(0, element)
+
+
+def time_search(map, size, queue, check_goal_before_adding):
+    goal = grid_location(size - 1, size - 1)
+    problem = Problem(grid_location(0, 0), MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(goal))
+
+    gs = GraphSearch()
+    gs.set_check_goal_before_adding_to_frontier(check_goal_before_adding)
+
+    start = perf_counter()
+    gs.search(problem, queue)
+    return perf_counter() - start, gs.get_nodes_expanded()
+
+
+def main():
+    print("%10s %6s %10s %10s %10s" % ("grid", "search", "expanded", "list, s", "deque, s"))
+    for size in GRID_SIZES:
+        map = create_grid_map(size, size)
+        grid = str(size) + "x" + str(size)
+
+        list_time, expanded = time_search(map, size, ListFIFOQueue(), True)
+        deque_time, expanded = time_search(map, size, FIFOQueue(), True)
+        print("%10s %6s %10d %10.3f %10.3f" % (grid, "BFS", expanded, list_time, deque_time))
+
+        list_time, expanded = time_search(map, size, ListLIFOQueue(), False)
+        deque_time, expanded = time_search(map, size, LIFOQueue(), False)
+        print("%10s %6s %10d %10.3f %10.3f" % (grid, "DFS", expanded, list_time, deque_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from time import perf_counter
+from aima.core.environment.map import MapStepCostFunction, MapActionFunction, MapResultFunction, \
+    MapGoalTestFunction, MapHeuristicFunction
+from aima.core.environment.nqueens import NQCActionsFunction, NQResultFunction, NQueensGoalTest, \
+    AttackingPairHeuristic, NQueensConverter
+from aima.core.search.csp import BacktrackingStrategy, ImprovedBacktrackingStrategy, MinConflictsStrategy, Selection, \
+    Inference
+from aima.core.search.framework import Problem, GraphSearch
+from aima.core.search.informed import AStarSearch, RecursiveBestFirstSearch, AStarEvaluationFunction
+from aima.core.search.local import HillClimbingSearch, SimulateAnnealingSearch, GeneticAlgorithm, GeneticProblem
+from aima.core.search.uninformed import BreadthFirstSearch, DepthFirstSearch, IterativeDeepeningSearch
+from benchmarks.generators import create_random_graph, create_random_map, create_nqueens_board, create_random_csp, \
+    random_map_location
+
+__author__ = 'Ivan Mushketik'
+__docformat__ = 'restructuredtext en'
+
+__doc__ = """
+ Benchmark suite of search algorithms on synthetic problems: random graphs and road maps, N-Queens boards and random
+ CSPs. All problems are generated and all algorithms run with fixed seeds (random module is seeded before every run),
+ so runs of the same commit solve the same problems and explore the same states.
+
+ Results are written as JSON to compare them across commits:
+
+     python -m benchmarks.suite --scale small --output results.json
+"""
+
+SEED = 0
+
+# sizes of problems: number of graph and map locations, N-Queens board size and number of CSP variables. Tree
+# searches (IDS and RBFS) look for a goal that is "depth" links away from a start location. Plain backtracking
+# gets a smaller CSP, since it's exponential in number of variables without variable ordering.
+SCALES = {
+    "small": {"graph": 2000, "map": 2000, "tree_map": 1000, "depth": 6, "queens": 8, "ga_queens": 6, "csp": 30,
+              "plain_csp": 30},
+    "full": {"graph": 50000, "map": 50000, "tree_map": 10000, "depth": 10, "queens": 16, "ga_queens": 8, "csp": 100,
+             "plain_csp": 40},
+}
+
+
+def map_problem(map, start, goal):
+    return Problem(start, MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(goal),
+                   MapStepCostFunction(map))
+
+def location_at_depth(map, start, depth):
+    """
+    Find a location that is reachable from a start location with depth links, but not with fewer links.
+
+    :return (str): location, or the farthest location if no location is that far
+    """
+    level = [start]
+    reached = set(level)
+    for i in range(depth):
+        next_level = []
+        for location in level:
+            for linked in sorted(map.get_locations_linked_to(location)):
+                if linked not in reached:
+                    reached.add(linked)
+                    next_level.append(linked)
+        if not next_level:
+            break
+        level = next_level
+    return level[-1]
+
+def nqueens_problem(size):
+    return Problem(create_nqueens_board(size, SEED), NQCActionsFunction(), NQResultFunction(), NQueensGoalTest())
+
+
+def graph_search_case(search, map, goal):
+    def run():
+        result = search.search(map_problem(map, random_map_location(0), goal))
+        return not search.is_failure(result), search.get_metrics()
+    return run
+
+def local_search_case(search, size):
+    def run():
+        search.search(nqueens_problem(size))
+        return search.failure == False, search.get_metrics()
+    return run
+
+def genetic_algorithm_case(size):
+    def run():
+        converter = NQueensConverter(size)
+        initial_states = [create_nqueens_board(size, SEED + i) for i in range(50)]
+        problem = GeneticProblem(initial_states, NQueensGoalTest(), converter)
+        ga = GeneticAlgorithm(0.15)
+        state = ga.search(problem, AttackingPairHeuristic(), 200)
+        return NQueensGoalTest().is_goal_state(state), ga.metrics
+    return run
+
+def csp_case(strategy, size):
+    def run():
+        assignment = strategy.solve(create_random_csp(size, seed=SEED))
+        return assignment is not None, {}
+    return run
+
+
+def create_cases(scale):
+    """
+    :param scale (dict): sizes of problems
+    :return (list): tuples (name, problem size, function that runs a benchmark and returns if a problem was solved and
+    search's metrics)
+    """
+    start = random_map_location(0)
+    graph = create_random_graph(scale["graph"], seed=SEED)
+    graph_goal = random_map_location(scale["graph"] - 1)
+    ids_graph = create_random_graph(scale["tree_map"], seed=SEED)
+    ids_goal = location_at_depth(ids_graph, start, scale["depth"])
+    road_map = create_random_map(scale["map"], seed=SEED)
+    map_goal = random_map_location(scale["map"] // 2)
+    rbfs_map = create_random_map(scale["tree_map"], seed=SEED)
+    rbfs_goal = location_at_depth(rbfs_map, start, scale["depth"])
+
+    return [
+        ("bfs", scale["graph"], graph_search_case(BreadthFirstSearch(GraphSearch()), graph, graph_goal)),
+        ("dfs", scale["graph"], graph_search_case(DepthFirstSearch(GraphSearch()), graph, graph_goal)),
+        ("ids", scale["tree_map"], graph_search_case(IterativeDeepeningSearch(), ids_graph, ids_goal)),
+        ("astar", scale["map"], graph_search_case(AStarSearch(GraphSearch(), MapHeuristicFunction(road_map, map_goal)),
+                                                  road_map, map_goal)),
+        ("rbfs", scale["tree_map"],
+         graph_search_case(RecursiveBestFirstSearch(AStarEvaluationFunction(MapHeuristicFunction(rbfs_map, rbfs_goal))),
+                           rbfs_map, rbfs_goal)),
+        ("hill_climbing", scale["queens"], local_search_case(HillClimbingSearch(AttackingPairHeuristic()),
+                                                             scale["queens"])),
+        ("simulated_annealing", scale["queens"], local_search_case(SimulateAnnealingSearch(AttackingPairHeuristic()),
+                                                                   scale["queens"])),
+        ("genetic_algorithm", scale["ga_queens"], genetic_algorithm_case(scale["ga_queens"])),
+        ("backtracking", scale["plain_csp"], csp_case(BacktrackingStrategy(), scale["plain_csp"])),
+        ("backtracking_mrv_deg", scale["csp"], csp_case(ImprovedBacktrackingStrategy(Selection.MRV_DEG), scale["csp"])),
+        ("backtracking_mrv_fc", scale["csp"],
+         csp_case(ImprovedBacktrackingStrategy(Selection.MRV, Inference.FORWARD_CHECKING), scale["csp"])),
+        ("backtracking_mrv_ac3_lcv", scale["csp"],
+         csp_case(ImprovedBacktrackingStrategy(Selection.MRV, Inference.AC3, True), scale["csp"])),
+        ("min_conflicts", scale["csp"], csp_case(MinConflictsStrategy(1000), scale["csp"])),
+    ]
+
+
+def run_case(name, size, run, repeats):
+    """
+    Run a benchmark several times, every time with the same seed.
+
+    :return (dict): result of a benchmark, time is the fastest of runs. If an algorithm raised an exception, result
+    contains an error instead of time, so that other benchmarks are still run.
+    """
+    times = []
+    for i in range(repeats):
+        random.seed(SEED)
+        start = perf_counter()
+        try:
+            solved, metrics = run()
+        except Exception as e:
+            return {"name": name, "size": size, "error": type(e).__name__ + ": " + str(e)}
+        times.append(perf_counter() - start)
+
+    return {"name": name, "size": size, "seconds": min(times), "solved": solved,
+            "metrics": dict((key, value) for key, value in metrics.items() if isinstance(value, (int, float)))}
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Run search benchmarks and write results as JSON")
+    parser.add_argument("--scale", choices=sorted(SCALES.keys()), default="small")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="names of benchmarks to run")
+    parser.add_argument("--output", help="file to write results to, by default standard output")
+    args = parser.parse_args(args)
+
+    results = []
+    for name, size, run in create_cases(SCALES[args.scale]):
+        if args.only and name not in args.only:
+            continue
+        result = run_case(name, size, run, args.repeats)
+        if "error" in result:
+            print("%-26s %8d %s" % (name, size, result["error"]), file=sys.stderr)
+        else:
+            print("%-26s %8d %10.4f s %s" % (name, size, result["seconds"],
+                                             "solved" if result["solved"] else "failed"), file=sys.stderr)
+        results.append(result)
+
+    report = {"commit": get_commit(), "python": platform.python_version(), "scale": args.scale, "seed": SEED,
+              "repeats": args.repeats, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import os
+import random
+import shutil
+import tempfile
+from aima.core.environment.contraction import ContractionHierarchy, ContractionHierarchySearch
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapHeuristicFunction, \
+    MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction, ExtendableMap
+from aima.core.search.framework import GraphSearch, Problem
+from aima.core.search.informed import AStarSearch
+from aima.core.search.uninformed import UniformCostSearch
+from aima.core.util.datastructure import Point2D
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+
+def create_problem(map, start, finish):
+    return Problem(start, MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(finish),
+                   MapStepCostFunction(map))
+
+def create_random_map(number_of_locations, seed):
+    rnd = random.Random(seed)
+    map = ExtendableMap()
+    for i in range(number_of_locations):
+        map.set_position("L" + str(i), Point2D(rnd.random() * 100, rnd.random() * 100))
+
+    for i in range(number_of_locations):
+        for j in rnd.sample(range(number_of_locations), 3):
+            if i != j:
+                distance = map.get_position("L" + str(i)).distance(map.get_position("L" + str(j)))
+                map.add_bidirectional_link("L" + str(i), "L" + str(j), distance * (1 + rnd.random()))
+    return map
+
+
+class ContractionHierarchyTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_paths_as_astar(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        chs = ContractionHierarchySearch(ContractionHierarchy.build(rm))
+
+        for start in rm.get_locations():
+            for finish in rm.get_locations():
+                if start == finish:
+                    continue
+                problem = create_problem(rm, start, finish)
+                gs = GraphSearch()
+                expected = AStarSearch(gs, MapHeuristicFunction(rm, finish)).search(problem)
+                result = chs.search(problem)
+
+                self.assertEqual([a.location for a in expected], [a.location for a in result])
+                self.assertAlmostEqual(gs.get_path_cost(), chs.get_metrics()[ContractionHierarchySearch.METRIC_PATH_COST])
+
+    def test_random_map(self):
+        map = create_random_map(300, 1)
+        chs = ContractionHierarchySearch(ContractionHierarchy.build(map, witness_limit=20))
+        rnd = random.Random(2)
+
+        for i in range(30):
+            start, finish = rnd.sample(sorted(map.get_locations()), 2)
+            problem = create_problem(map, start, finish)
+            gs = GraphSearch()
+            expected = UniformCostSearch(gs).search(problem)
+            result = chs.search(problem)
+
+            self.assertEqual([a.location for a in expected], [a.location for a in result])
+            self.assertTrue(chs.get_metrics()[ContractionHierarchySearch.METRIC_NODES_EXPANDED] <
+                            gs.get_metrics()[GraphSearch.METRIC_NODES_EXPANDED])
+
+    def test_save_and_load(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        ch = ContractionHierarchy.build(rm)
+        path = os.path.join(self.directory, "romania.ch")
+        ch.save(path)
+
+        loaded = ContractionHierarchy.load(path)
+        self.assertEqual(ch.get_locations(), loaded.get_locations())
+        self.assertEqual(ch.get_number_of_links(), loaded.get_number_of_links())
+        self.assertEqual(ch.query(RomaniaCities.ARAD, RomaniaCities.BUCHAREST),
+                         loaded.query(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        with open(path, "r+b") as f:
+            f.write(b"NOPE")
+        self.assertRaises(ValueError, ContractionHierarchy.load, path)
+
+    def test_initial_state_is_goal(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        result = ContractionHierarchySearch(ContractionHierarchy.build(rm)).search(
+            create_problem(rm, RomaniaCities.ARAD, RomaniaCities.ARAD))
+
+        self.assertEqual(1, len(result))
+        self.assertTrue(result[0].is_noop())
+
+    def test_failure(self):
+        map = ExtendableMap()
+        map.add_unidirectional_link("A", "B", 5)
+        map.add_bidirectional_link("B", "C", 5)
+        chs = ContractionHierarchySearch(ContractionHierarchy.build(map))
+
+        self.assertEqual(["B", "C"], [a.location for a in chs.search(create_problem(map, "A", "C"))])
+        self.assertTrue(chs.is_failure(chs.search(create_problem(map, "C", "A"))))
+        self.assertTrue(chs.is_failure(chs.search(create_problem(map, "A", "Unknown"))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import math
+import random
+from aima.core.agent import Agent
+from aima.core.environment.grid import GridMap, create_grid_map, GridActionFunction, GridStepCostFunction, \
+    JumpPointSearch, ManhattanHeuristicFunction, OctileHeuristicFunction, grid_heuristic_function
+from aima.core.environment.map import MapResultFunction, MapGoalTestFunction, MapEnvironment
+from aima.core.search.framework import Problem, GraphSearch, SearchBudget
+from aima.core.search.informed import AStarSearch
+from aima.core.util.datastructure import XYLocation
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+
+def create_problem(grid, start, goal):
+    return Problem(start, GridActionFunction(grid), MapResultFunction(), MapGoalTestFunction(goal),
+                   GridStepCostFunction())
+
+def create_random_grid(width, height, diagonal, seed):
+    rnd = random.Random(seed)
+    grid = GridMap(width, height, diagonal)
+    for y in range(height):
+        for x in range(width):
+            if rnd.random() < 0.3:
+                grid.set_blocked_at(x, y)
+    return grid
+
+
+class GridMapTest(unittest.TestCase):
+    def test_blocked_cells(self):
+        grid = GridMap(10, 3)
+        grid.set_blocked(XYLocation(9, 1))
+        grid.set_blocked(XYLocation(0, 2))
+
+        self.assertEqual(4, len(grid._blocked))
+        self.assertTrue(grid.is_blocked_at(9, 1))
+        self.assertFalse(grid.is_location(XYLocation(0, 2)))
+        self.assertFalse(grid.is_location(XYLocation(10, 0)))
+        self.assertEqual(28, len(grid.get_locations()))
+
+        grid.set_blocked(XYLocation(9, 1), False)
+        self.assertTrue(grid.is_location(XYLocation(9, 1)))
+        self.assertRaises(ValueError, grid.set_blocked, XYLocation(-1, 0))
+
+    def test_linked_locations(self):
+        grid = create_grid_map(["..#",
+                                "...",
+                                "..."])
+        self.assertEqual({XYLocation(1, 0), XYLocation(0, 1), XYLocation(2, 1), XYLocation(1, 2)},
+                         set(grid.get_locations_linked_to(XYLocation(1, 1))))
+        self.assertEqual(1, grid.get_distance(XYLocation(1, 1), XYLocation(1, 0)))
+        self.assertIsNone(grid.get_distance(XYLocation(1, 1), XYLocation(0, 0)))
+
+        grid.diagonal = True
+        # corner of a blocked cell can't be cut
+        self.assertEqual({XYLocation(0, 0), XYLocation(0, 2), XYLocation(2, 2)},
+                         set(grid.get_locations_linked_to(XYLocation(1, 1))) -
+                         {XYLocation(1, 0), XYLocation(0, 1), XYLocation(2, 1), XYLocation(1, 2)})
+        self.assertAlmostEqual(math.sqrt(2), grid.get_distance(XYLocation(1, 1), XYLocation(0, 0)))
+
+    def test_heuristic_functions(self):
+        goal = XYLocation(0, 0)
+        self.assertEqual(7, ManhattanHeuristicFunction(goal).h(XYLocation(3, 4)))
+        self.assertAlmostEqual(4 + 3 * (math.sqrt(2) - 1), OctileHeuristicFunction(goal).h(XYLocation(3, 4)))
+
+
+class JumpPointSearchTest(unittest.TestCase):
+    def test_same_path_cost_as_astar(self):
+        for diagonal in (False, True):
+            for seed in range(20):
+                grid = create_random_grid(15, 12, diagonal, seed)
+                start, goal = random.Random(seed).sample(grid.get_locations(), 2)
+                problem = create_problem(grid, start, goal)
+
+                gs = GraphSearch()
+                expected = AStarSearch(gs, grid_heuristic_function(grid, goal)).search(problem)
+                jps = JumpPointSearch(grid)
+                result = jps.search(problem)
+
+                self.assertEqual(gs.is_failure(expected), jps.is_failure(result))
+                if not jps.is_failure(result):
+                    self.assertAlmostEqual(gs.get_path_cost(), jps.get_metrics()[JumpPointSearch.METRIC_PATH_COST])
+                    self.assertEqual(goal, result[-1].location)
+
+    def test_expands_fewer_nodes(self):
+        for diagonal in (False, True):
+            grid = create_grid_map(["..........",
+                                    "..........",
+                                    "....#.....",
+                                    "....#.....",
+                                    "....#.....",
+                                    ".........."], diagonal)
+            problem = create_problem(grid, XYLocation(0, 3), XYLocation(9, 3))
+
+            gs = GraphSearch()
+            AStarSearch(gs, grid_heuristic_function(grid, XYLocation(9, 3))).search(problem)
+            jps = JumpPointSearch(grid)
+            jps.search(problem)
+
+            self.assertAlmostEqual(gs.get_path_cost(), jps.get_metrics()[JumpPointSearch.METRIC_PATH_COST])
+            self.assertTrue(jps.get_metrics()[JumpPointSearch.METRIC_NODES_EXPANDED] <
+                            gs.get_metrics()[GraphSearch.METRIC_NODES_EXPANDED])
+
+    def test_agent_travels_path_cost(self):
+        grid = create_random_grid(20, 20, True, 3)
+        start, goal = XYLocation(0, 0), XYLocation(19, 19)
+        grid.set_blocked(start, False)
+        grid.set_blocked(goal, False)
+        jps = JumpPointSearch(grid)
+        result = jps.search(create_problem(grid, start, goal))
+
+        env = MapEnvironment(grid)
+        agent = Agent()
+        env.add_new_agent(agent, start)
+        for action in result:
+            env.execute_action(agent, action)
+
+        self.assertEqual(goal, env.get_agent_location(agent))
+        self.assertAlmostEqual(jps.get_metrics()[JumpPointSearch.METRIC_PATH_COST],
+                               env.get_agent_travel_distance(agent))
+
+    def test_initial_state_is_goal(self):
+        grid = GridMap(3, 3)
+        result = JumpPointSearch(grid).search(create_problem(grid, XYLocation(1, 1), XYLocation(1, 1)))
+
+        self.assertEqual(1, len(result))
+        self.assertTrue(result[0].is_noop())
+
+    def test_failure(self):
+        grid = create_grid_map([".#.",
+                                "##.",
+                                "..."], True)
+        jps = JumpPointSearch(grid)
+
+        self.assertTrue(jps.is_failure(jps.search(create_problem(grid, XYLocation(0, 0), XYLocation(2, 2)))))
+        self.assertTrue(jps.is_failure(jps.search(create_problem(grid, XYLocation(2, 2), XYLocation(1, 0)))))
+
+    def test_budget_exhausted(self):
+        grid = GridMap(50, 50, True)
+        jps = JumpPointSearch(grid)
+        jps.set_budget(SearchBudget(max_expansions=1))
+        result = jps.search(create_problem(grid, XYLocation(0, 0), XYLocation(49, 17)))
+
+        self.assertTrue(jps.is_budget_exhausted(result))
+
+if __name__ == '__main__':
+    unittest.main()
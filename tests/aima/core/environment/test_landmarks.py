@@ -0,0 +1,92 @@
+import math
+import random
+from aima.core.environment.landmarks import Landmarks, LandmarkHeuristicFunction
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapHeuristicFunction, \
+    MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction, ExtendableMap
+from aima.core.search.framework import GraphSearch, Problem
+from aima.core.search.informed import AStarSearch
+from aima.core.search.uninformed import UniformCostSearch
+from aima.core.util.datastructure import Point2D
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+
+def create_problem(map, start, finish):
+    return Problem(start, MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(finish),
+                   MapStepCostFunction(map))
+
+def create_grid_map(width, height, seed):
+    """ Roads between neighbour crossroads of a grid, roads are up to twice longer than straight lines """
+    rnd = random.Random(seed)
+    map = ExtendableMap()
+    name = lambda x, y: str(x) + ":" + str(y)
+    for x in range(width):
+        for y in range(height):
+            map.set_position(name(x, y), Point2D(x * 10.0, y * 10.0))
+            if x > 0:
+                map.add_bidirectional_link(name(x - 1, y), name(x, y), 10.0 * (1 + rnd.random()))
+            if y > 0:
+                map.add_bidirectional_link(name(x, y - 1), name(x, y), 10.0 * (1 + rnd.random()))
+    return map
+
+
+class LandmarksTest(unittest.TestCase):
+    def test_build(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        landmarks = Landmarks.build(rm, 4, RomaniaCities.BUCHAREST)
+
+        self.assertEqual(4, len(landmarks.get_landmarks()))
+        self.assertEqual(4, len(set(landmarks.get_landmarks())))
+        # Timisoara is the farthest city from Bucharest
+        self.assertEqual(RomaniaCities.TIMISOARA, landmarks.get_landmarks()[0])
+
+        from_landmarks, to_landmarks = landmarks.get_distances(RomaniaCities.TIMISOARA)
+        self.assertEqual(0, from_landmarks[0])
+        self.assertEqual(0, to_landmarks[0])
+
+    def test_admissible(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        landmarks = Landmarks.build(rm, 3)
+
+        for finish in rm.get_locations():
+            hf = LandmarkHeuristicFunction(landmarks, finish)
+            for start in rm.get_locations():
+                gs = GraphSearch()
+                UniformCostSearch(gs).search(create_problem(rm, start, finish))
+                self.assertTrue(hf.h(start) <= gs.get_path_cost() + 1e-9)
+
+    def test_fewer_expansions(self):
+        map = create_grid_map(30, 30, 1)
+        landmarks = Landmarks.build(map, 8)
+        rnd = random.Random(2)
+
+        straight_line_expanded = 0
+        landmarks_expanded = 0
+        for i in range(10):
+            start, finish = rnd.sample(sorted(map.get_locations()), 2)
+            problem = create_problem(map, start, finish)
+            gs = GraphSearch()
+            AStarSearch(gs, MapHeuristicFunction(map, finish)).search(problem)
+            lgs = GraphSearch()
+            AStarSearch(lgs, LandmarkHeuristicFunction(landmarks, finish)).search(problem)
+
+            self.assertAlmostEqual(gs.get_path_cost(), lgs.get_path_cost())
+            straight_line_expanded += gs.get_nodes_expanded()
+            landmarks_expanded += lgs.get_nodes_expanded()
+
+        self.assertTrue(landmarks_expanded * 2 < straight_line_expanded)
+
+    def test_unreachable_goal(self):
+        map = ExtendableMap()
+        map.add_unidirectional_link("A", "B", 5)
+        map.add_bidirectional_link("B", "C", 5)
+        landmarks = Landmarks.build(map, 2, "A")
+
+        self.assertEqual(math.inf, LandmarkHeuristicFunction(landmarks, "A").h("C"))
+        self.assertEqual(10, LandmarkHeuristicFunction(landmarks, "C").h("A"))
+        self.assertEqual(0, LandmarkHeuristicFunction(landmarks, "Unknown").h("A"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import sys
+import tempfile
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapHeuristicFunction, \
+    MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.environment.mapfile import save_map, load_map, import_edge_list
+from aima.core.search.framework import GraphSearch, Problem
+from aima.core.search.informed import AStarSearch
+from aima.core.search.uninformed import UniformCostSearch
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+
+def create_problem(map, start, finish):
+    return Problem(start, MapActionFunction(map), MapResultFunction(), MapGoalTestFunction(finish),
+                   MapStepCostFunction(map))
+
+
+class MapFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_save_and_load(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        path = os.path.join(self.directory, "romania.amap")
+        save_map(rm, path)
+
+        m = load_map(path)
+        try:
+            self.assertTrue(m.is_frozen())
+            self.assertEqual(set(rm.get_locations()), set(m.get_locations()))
+            self.assertTrue(m.is_location(RomaniaCities.ARAD))
+            self.assertFalse(m.is_location("Unknown"))
+            self.assertEqual(set(rm.get_locations_linked_to(RomaniaCities.ARAD)),
+                             set(m.get_locations_linked_to(RomaniaCities.ARAD)))
+            self.assertEqual(140, m.get_distance(RomaniaCities.ARAD, RomaniaCities.SIBIU))
+            self.assertEqual(None, m.get_distance(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+            self.assertAlmostEqual(rm.get_position(RomaniaCities.ARAD).x, m.get_position(RomaniaCities.ARAD).x, 3)
+
+            gs = GraphSearch()
+            result = AStarSearch(gs, MapHeuristicFunction(m, RomaniaCities.BUCHAREST)).search(
+                create_problem(m, RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+            self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                              RomaniaCities.BUCHAREST], [a.location for a in result])
+            self.assertEqual(418, gs.get_path_cost())
+        finally:
+            m.links.close()
+
+    def test_import_edge_list(self):
+        links_path = self._write("links.csv", "# start,end,distance\n"
+                                              "A,B,5\n"
+                                              "\n"
+                                              "B,Ç,2.5\n"
+                                              "A,B,4\n")
+        positions_path = self._write("positions.csv", "A,0,0\nB,3,4\nUnknown,1,1\n")
+        path = os.path.join(self.directory, "links.amap")
+
+        self.assertEqual(3, import_edge_list(links_path, path, ",", True, positions_path))
+        m = load_map(path)
+        try:
+            self.assertEqual(["A", "B", "Ç"], list(m.get_locations()))
+            self.assertEqual(4, m.get_distance("A", "B"))
+            self.assertEqual(4, m.get_distance("B", "A"))
+            self.assertEqual(2.5, m.get_distance("Ç", "B"))
+            self.assertEqual(["A", "Ç"], m.get_locations_linked_to("B"))
+            self.assertEqual(4, m.get_position("B").y)
+            self.assertRaises(KeyError, m.get_position, "Ç")
+            self.assertEqual(2, len(m.location_positions))
+        finally:
+            m.links.close()
+
+    def test_unidirectional_text_file(self):
+        links_path = self._write("links.txt", "A B 1\nB C 1\n")
+        path = os.path.join(self.directory, "links.amap")
+        import_edge_list(links_path, path)
+
+        m = load_map(path)
+        try:
+            gs = GraphSearch()
+            UniformCostSearch(gs).search(create_problem(m, "A", "C"))
+            self.assertEqual(2, gs.get_path_cost())
+            self.assertEqual([], m.get_locations_linked_to("C"))
+        finally:
+            m.links.close()
+
+    def test_close_with_edges_alive(self):
+        path = os.path.join(self.directory, "romania.amap")
+        save_map(get_simplified_road_map_of_part_of_romania(), path)
+
+        m = load_map(path)
+        edges = m.links.get_edges(RomaniaCities.ARAD)
+        m.links.close()
+        self.assertTrue((RomaniaCities.SIBIU, 140) in edges)
+
+    @unittest.skipIf(sys.byteorder != "little", "arrays are copied from a map file on big endian machines")
+    def test_close_with_slice_alive(self):
+        path = os.path.join(self.directory, "romania.amap")
+        save_map(get_simplified_road_map_of_part_of_romania(), path)
+
+        m = load_map(path)
+        labels = m.links.labels[0:2]
+        self.assertRaises(BufferError, m.links.close)
+        # graph is still usable after a failed close
+        self.assertEqual(140, m.get_distance(RomaniaCities.ARAD, RomaniaCities.SIBIU))
+
+        labels.release()
+        m.links.close()
+
+    def test_wrong_files(self):
+        path = os.path.join(self.directory, "links.amap")
+        self.assertRaises(ValueError, import_edge_list, self._write("links.txt", "A B\n"), path)
+        self.assertRaises(ValueError, import_edge_list, self._write("links.txt", "A B far\n"), path)
+        self.assertRaises(ValueError, load_map, self._write("map.amap", "not a map"))
+
+if __name__ == '__main__':
+    unittest.main()
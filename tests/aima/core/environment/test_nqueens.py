@@ -1,4 +1,7 @@
-from aima.core.environment.nqueens import NQueensBoard, NQResultFunction, NQIActionsFunctions, QueenAction, NQCActionsFunction, NQueensConverter
+from aima.core.environment.nqueens import NQueensBoard, NQResultFunction, NQIActionsFunctions, QueenAction, NQCActionsFunction, NQueensConverter, \
+    NQueensGoalTest
+from aima.core.search.framework import Problem, TreeSearch, GraphSearch
+from aima.core.search.uninformed import BreadthFirstSearch
 from aima.core.util.datastructure import XYLocation
 
 __author__ = 'proger'
@@ -59,6 +62,48 @@ class NQueensBoardTest(unittest.TestCase):
 
         self.assertEqual(3, nqb.get_number_of_attacking_pairs())
 
+    def test_get_key(self):
+        queens = (XYLocation(1, 3), XYLocation(2, 4))
+        nqb1 = NQueensBoard(5)
+        nqb1.set_board(queens)
+        nqb2 = NQueensBoard(5)
+        nqb2.set_board(queens)
+
+        self.assertEqual(nqb1.get_key(), nqb2.get_key())
+
+        nqb2.move_queen(XYLocation(2, 4), XYLocation(3, 4))
+        self.assertNotEqual(nqb1.get_key(), nqb2.get_key())
+
+    def test_hash(self):
+        nqb1 = NQueensBoard(5)
+        nqb1.add_queen_at(XYLocation(1, 3))
+        nqb1.add_queen_at(XYLocation(2, 4))
+        nqb2 = NQueensBoard(5)
+        nqb2.add_queen_at(XYLocation(2, 0))
+        nqb2.move_queen_to(XYLocation(2, 4))
+        nqb2.add_queen_at(XYLocation(1, 3))
+
+        self.assertEqual(nqb1, nqb2)
+        self.assertEqual(hash(nqb1), hash(nqb2))
+        self.assertEqual(1, len({nqb1, nqb2}))
+
+        nqb2.remove_queen_from(XYLocation(1, 3))
+        self.assertNotEqual(nqb1, nqb2)
+        nqb2.clean()
+        self.assertEqual(hash(NQueensBoard(5)), hash(nqb2))
+
+    def test_graph_search(self):
+        # queens are placed one by one, so the same board is reached in different orders of placement
+        problem = Problem(NQueensBoard(4), NQIActionsFunctions(), NQResultFunction(), NQueensGoalTest())
+        ts = TreeSearch()
+        BreadthFirstSearch(ts).search(problem)
+
+        for gs in [GraphSearch(), GraphSearch(NQueensBoard.get_key)]:
+            result = BreadthFirstSearch(gs).search(problem)
+
+            self.assertEqual(4, len(result))
+            self.assertTrue(gs.get_nodes_expanded() < ts.get_nodes_expanded())
+
 
 class NQResultFunctionTest(unittest.TestCase):
     def test_remove_queen_action(self):
@@ -81,6 +81,25 @@ class TicTacToeBoardTest(unittest.TestCase):
         ttb.markO(1, 0)
         self.assertFalse(ttb.is_any_column_complete())
 
+    def test_hash(self):
+        ttb1 = TicTacToeBoard()
+        ttb1.markX(0, 0)
+        ttb1.markO(1, 1)
+        ttb2 = TicTacToeBoard()
+        ttb2.markO(1, 1)
+        ttb2.markX(0, 0)
+
+        self.assertEqual(hash(ttb1), hash(ttb2))
+        self.assertEqual(ttb1.get_key(), ttb2.get_key())
+        self.assertEqual(1, len({ttb1, ttb2, ttb2.clone_board()}))
+
+        ttb2.set_value(1, 1, TicTacToeBoard.X)
+        self.assertNotEqual(ttb1, ttb2)
+        ttb2.set_value(1, 1, TicTacToeBoard.EMPTY)
+        ttb2.set_value(0, 0, TicTacToeBoard.EMPTY)
+        self.assertEqual(hash(TicTacToeBoard()), hash(ttb2))
+        self.assertEqual("_________", ttb2.get_key())
+
 
 if __name__ == '__main__':
     unittest.main()
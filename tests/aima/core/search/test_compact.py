@@ -0,0 +1,127 @@
+from aima.core.agent import NoOpAction
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.search.compact import CompactGraphSearch, CompactBreadthFirstSearch, CompactDepthFirstSearch, CompactUniformCostSearch, StateInterner, IntegerStateInterner, NodeStore
+from aima.core.search.framework import Problem, GraphSearch, ActionFunction, ResultFunction, GoalTest
+from aima.core.search.uninformed import BreadthFirstSearch, DepthFirstSearch
+from aima.core.util.datastructure import FIFOQueue
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+class LineActionsFunction(ActionFunction):
+    """
+        States are integers, every state is connected with the next and the previous one
+    """
+    def __init__(self, limit):
+        self.limit = limit
+
+    def actions(self, state):
+        return [s for s in (state - 1, state + 1) if 0 <= s < self.limit]
+
+class LineResultFunction(ResultFunction):
+    def result(self, state, action):
+        return action
+
+class LineGoalTest(GoalTest):
+    def __init__(self, goal):
+        self.goal = goal
+
+    def is_goal_state(self, state):
+        return state == self.goal
+
+def romania_problem(start, finish):
+    rm = get_simplified_road_map_of_part_of_romania()
+    return Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+
+class StateInternerTest(unittest.TestCase):
+    def test_intern(self):
+        interner = StateInterner()
+
+        self.assertEqual(0, interner.intern("a"))
+        self.assertEqual(1, interner.intern("b"))
+        self.assertEqual(0, interner.intern("a"))
+        self.assertEqual("b", interner.get_state(1))
+        self.assertEqual(2, len(interner))
+
+    def test_state_key(self):
+        interner = StateInterner(state_key=tuple)
+
+        self.assertEqual(0, interner.intern([1, 2]))
+        self.assertEqual(0, interner.intern([1, 2]))
+        self.assertEqual(1, interner.intern([2, 1]))
+
+    def test_integer_interner(self):
+        interner = IntegerStateInterner()
+
+        self.assertEqual(5, interner.intern(5))
+        self.assertEqual(5, interner.get_state(5))
+        self.assertEqual(6, len(interner))
+
+class NodeStoreTest(unittest.TestCase):
+    def test_path(self):
+        store = NodeStore()
+        root = store.add(0, NodeStore.NO_PARENT, -1, 0)
+        child = store.add(1, root, 7, 2.5)
+        grandchild = store.add(2, child, 8, 4.0)
+
+        self.assertEqual([root, child, grandchild], store.get_path_from_root(grandchild))
+        self.assertEqual([root], store.get_path_from_root(root))
+        self.assertEqual(2, store.get_depth(grandchild))
+        self.assertEqual(4.0, store.get_path_cost(grandchild))
+
+class CompactGraphSearchTest(unittest.TestCase):
+    def test_same_result_as_breadth_first_search(self):
+        p = romania_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST)
+
+        bfs = BreadthFirstSearch(GraphSearch())
+        cbfs = CompactBreadthFirstSearch()
+
+        expected = bfs.search(p)
+        result = cbfs.search(p)
+        self.assertEqual([a.location for a in expected], [a.location for a in result])
+        self.assertEqual(bfs.get_metrics()[GraphSearch.METRIC_NODES_EXPANDED],
+                         cbfs.get_metrics()[CompactGraphSearch.METRIC_NODES_EXPANDED])
+        self.assertEqual(bfs.get_metrics()[GraphSearch.METRIC_PATH_COST],
+                         cbfs.get_metrics()[CompactGraphSearch.METRIC_PATH_COST])
+
+    def test_same_result_as_depth_first_search(self):
+        p = romania_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST)
+
+        expected = DepthFirstSearch(GraphSearch()).search(p)
+        result = CompactDepthFirstSearch().search(p)
+        self.assertEqual([a.location for a in expected], [a.location for a in result])
+
+    def test_uniform_cost_search(self):
+        p = romania_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST)
+
+        ucs = CompactUniformCostSearch()
+        result = ucs.search(p)
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI, RomaniaCities.BUCHAREST],
+                         [a.location for a in result])
+        self.assertEqual(418, ucs.get_metrics()[CompactGraphSearch.METRIC_PATH_COST])
+
+    def test_start_at_goal_state(self):
+        p = romania_problem(RomaniaCities.ARAD, RomaniaCities.ARAD)
+
+        result = CompactBreadthFirstSearch().search(p)
+        self.assertEqual([NoOpAction()], result)
+
+    def test_integer_states(self):
+        p = Problem(10, LineActionsFunction(1000), LineResultFunction(), LineGoalTest(500))
+
+        cgs = CompactGraphSearch(IntegerStateInterner)
+        result = cgs.search(p, FIFOQueue())
+        self.assertEqual(list(range(11, 501)), result)
+        self.assertEqual(490, cgs.get_metrics()[CompactGraphSearch.METRIC_PATH_COST])
+
+    def test_failure(self):
+        p = Problem(10, LineActionsFunction(100), LineResultFunction(), LineGoalTest(500))
+
+        cgs = CompactGraphSearch()
+        result = cgs.search(p, FIFOQueue())
+        self.assertTrue(cgs.is_failure(result))
+        self.assertEqual(100, cgs.get_metrics()[CompactGraphSearch.METRIC_NODES_EXPANDED])
+
+if __name__ == '__main__':
+    unittest.main()
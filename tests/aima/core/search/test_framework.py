@@ -79,6 +79,25 @@ class TestNode(unittest.TestCase):
         self.assertEquals(n2, path[1])
         self.assertEquals(n3, path[2])
 
+    def test_get_depth(self):
+        n1 = Node("state1")
+        n2 = Node("state2", 10, n1)
+        n3 = Node("state3", 15, n2)
+
+        self.assertEqual(0, n1.get_depth())
+        self.assertEqual(2, n3.get_depth())
+        self.assertEqual([n3, n2, n1], list(n3.iter_path_to_root()))
+
+    def test_get_long_path_from_root(self):
+        node = Node(0)
+        for i in range(1, 50000):
+            node = Node(i, 1, node)
+
+        path = node.get_path_from_root()
+        self.assertEqual(50000, len(path))
+        self.assertEqual(0, path[0].get_state())
+        self.assertEqual(49999, path[-1].get_state())
+
 class TestNodeExpander(unittest.TestCase):
     def test_node_expanding(self):
         startNode = Node(1)
@@ -91,6 +110,45 @@ class TestNodeExpander(unittest.TestCase):
         self.assertEqual(2, actionsList[1].get_state())
         self.assertEqual(2, actionsList[2].get_state())
 
+    def test_lazy_node_expanding(self):
+        class CountingResultFunction(ResultFunction):
+            def __init__(self):
+                self.calls = 0
+
+            def result(self, state, action):
+                self.calls += 1
+                return state + 1
+
+        rf = CountingResultFunction()
+        problem = Problem(1, TestActionsFunction(), rf, TestGoalTest(3))
+        nodeExpander = NodeExpander()
+
+        children = nodeExpander.iter_expand_node(Node(1), problem)
+        self.assertEqual(1, nodeExpander.get_nodes_expanded())
+        self.assertEqual(0, rf.calls)
+
+        self.assertEqual(2, next(children).get_state())
+        self.assertEqual(1, rf.calls)
+
+    def test_tree_search_stops_expansion_at_goal(self):
+        class CountingResultFunction(ResultFunction):
+            def __init__(self):
+                self.calls = 0
+
+            def result(self, state, action):
+                self.calls += 1
+                return state + 1
+
+        rf = CountingResultFunction()
+        problem = Problem(1, TestActionsFunction(), rf, TestGoalTest(2))
+        ts = TreeSearch()
+        ts.set_check_goal_before_adding_to_frontier(True)
+
+        result = ts.search(problem, LIFOQueue())
+        self.assertEqual(1, len(result))
+        # the first child is a goal, so other children weren't created
+        self.assertEqual(1, rf.calls)
+
 class TestGraphSearch(unittest.TestCase):
     def test_successful_search(self):
         gs = GraphSearch()
@@ -99,6 +157,106 @@ class TestGraphSearch(unittest.TestCase):
         result = gs.search(problem, LIFOQueue())
         self.assertFalse(gs.is_failure(result))
 
+class TestCachingHeuristicFunction(unittest.TestCase):
+    class CountingHeuristicFunction(HeuristicFunction):
+        def __init__(self):
+            self.calls = 0
+
+        def h(self, state):
+            self.calls += 1
+            return state * 2
+
+    def test_cache(self):
+        hf = self.CountingHeuristicFunction()
+        chf = CachingHeuristicFunction(hf)
+
+        self.assertEqual(2, chf.h(1))
+        self.assertEqual(4, chf.h(2))
+        self.assertEqual(2, chf.h(1))
+
+        self.assertEqual(2, hf.calls)
+        self.assertEqual(1, chf.get_hits())
+        self.assertEqual(2, chf.get_misses())
+
+    def test_eviction(self):
+        hf = self.CountingHeuristicFunction()
+        chf = CachingHeuristicFunction(hf, maxsize=2)
+
+        chf.h(1)
+        chf.h(2)
+        chf.h(1)
+        # 2 is the least recently used state
+        chf.h(3)
+        chf.h(2)
+
+        self.assertEqual(4, hf.calls)
+        self.assertEqual(2, chf.get_cache_size())
+
+    def test_state_key(self):
+        hf = self.CountingHeuristicFunction()
+        # states with the same last digit are treated as the same state
+        chf = CachingHeuristicFunction(hf, maxsize=None, state_key=lambda state: state % 10)
+
+        self.assertEqual(2, chf.h(1))
+        self.assertEqual(2, chf.h(11))
+        self.assertEqual(1, hf.calls)
+
+        chf.clear()
+        self.assertEqual(0, chf.get_hits())
+        self.assertEqual(0, chf.get_cache_size())
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+class TestSearchBudget(unittest.TestCase):
+    def test_max_expansions(self):
+        budget = SearchBudget(max_expansions=2)
+        budget.expanded()
+        budget.expanded()
+
+        self.assertRaises(BudgetExhausted, budget.expanded)
+        self.assertTrue(budget.is_exhausted())
+        self.assertEqual(SearchBudget.REASON_EXPANSIONS, budget.get_exhausted_reason())
+        self.assertEqual(2, budget.get_expansions())
+
+        budget.restart()
+        self.assertFalse(budget.is_exhausted())
+        budget.expanded()
+
+    def test_time_limit(self):
+        clock = FakeClock()
+        budget = SearchBudget(time_limit=10, clock=clock)
+        clock.time = 9
+        budget.expanded()
+        clock.time = 10
+
+        self.assertRaises(BudgetExhausted, budget.expanded)
+        self.assertEqual(SearchBudget.REASON_TIME, budget.get_exhausted_reason())
+
+    def test_max_nodes_and_cancel(self):
+        budget = SearchBudget(max_nodes=5)
+        budget.expanded(lambda: 5)
+        self.assertRaises(BudgetExhausted, budget.expanded, lambda: 6)
+        self.assertEqual(SearchBudget.REASON_NODES, budget.get_exhausted_reason())
+
+        budget = SearchBudget()
+        budget.cancel()
+        self.assertRaises(BudgetExhausted, budget.expanded)
+        self.assertEqual(SearchBudget.REASON_CANCELLED, budget.get_exhausted_reason())
+
+    def test_node_expander(self):
+        expander = NodeExpander()
+        expander.set_budget(SearchBudget(max_expansions=1))
+        problem = Problem(1, TestActionsFunction(), TestResultFunction(), TestGoalTest(3))
+
+        self.assertEqual(3, len(expander.expand_node(Node(1), problem)))
+        self.assertRaises(BudgetExhausted, expander.expand_node, Node(1), problem)
+        self.assertEqual(1, expander.get_nodes_expanded())
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
@@ -1,7 +1,8 @@
 from aima.core.agent import NoOpAction
 from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapHeuristicFunction, MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
-from aima.core.search.framework import TreeSearch, Problem
-from aima.core.search.informed import AStarSearch, RecursiveBestFirstSearch, AStarEvaluationFunction
+from aima.core.search.framework import TreeSearch, GraphSearch, Problem, SearchBudget
+from aima.core.search.informed import AStarSearch, RecursiveBestFirstSearch, AStarEvaluationFunction, GreedyBestFirstSearch, \
+    IterativeDeepeningAStarSearch, SimplifiedMemoryBoundedAStarSearch, AnytimeWeightedAStarSearch
 
 __author__ = 'Ivan Mushketik'
 
@@ -27,6 +28,26 @@ class AStarSearchTest(unittest.TestCase):
         self.assertEqual(RomaniaCities.PITESTI, result[2].location)
         self.assertEqual(RomaniaCities.BUCHAREST, result[3].location)
 
+    def test_aima2_figure_4_2_with_graph_search(self):
+        finish = RomaniaCities.BUCHAREST
+        start = RomaniaCities.ARAD
+        rm = get_simplified_road_map_of_part_of_romania()
+
+        gs = GraphSearch()
+        ass = AStarSearch(gs, MapHeuristicFunction(rm, finish))
+
+        p = Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+
+        result = ass.search(p)
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI, RomaniaCities.BUCHAREST],
+                         [action.location for action in result])
+        self.assertEqual(418, gs.get_path_cost())
+
+        metrics = ass.get_metrics()
+        self.assertTrue(metrics[AStarSearch.METRIC_PRIORITY_EVALUATIONS] > 0)
+        self.assertTrue(metrics[AStarSearch.METRIC_PRIORITY_EVALUATIONS_SAVED] > 0)
+        self.assertEqual(gs.get_nodes_expanded(), metrics[gs.METRIC_NODES_EXPANDED])
+
     def test_search_start_at_goal_state(self):
         finish = RomaniaCities.BUCHAREST
         start = RomaniaCities.BUCHAREST
@@ -43,6 +64,22 @@ class AStarSearchTest(unittest.TestCase):
         self.assertEqual(NoOpAction(), result[0])
 
 
+class GreedyBestFirstSearchTest(unittest.TestCase):
+    def test_aima3_figure_3_23(self):
+        finish = RomaniaCities.BUCHAREST
+        start = RomaniaCities.ARAD
+        rm = get_simplified_road_map_of_part_of_romania()
+
+        gbfs = GreedyBestFirstSearch(GraphSearch(), MapHeuristicFunction(rm, finish))
+
+        p = Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+
+        result = gbfs.search(p)
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.FAGARAS, RomaniaCities.BUCHAREST],
+                         [action.location for action in result])
+        self.assertEqual(450, gbfs.get_metrics()[GraphSearch.METRIC_PATH_COST])
+
+
 class RecursiveBestFirstSearchTest(unittest.TestCase):
     # Test that use figure from AIMA second edition
     def test_aima2_figure_4_4(self):
@@ -75,5 +112,185 @@ class RecursiveBestFirstSearchTest(unittest.TestCase):
         self.assertEqual(1, len(result))
         self.assertEqual(NoOpAction(), result[0])
 
+class IterativeDeepeningAStarSearchTest(unittest.TestCase):
+    def test_aima2_figure_4_2(self):
+        finish = RomaniaCities.BUCHAREST
+        start = RomaniaCities.ARAD
+        rm = get_simplified_road_map_of_part_of_romania()
+        idas = IterativeDeepeningAStarSearch(AStarEvaluationFunction(MapHeuristicFunction(rm, finish)))
+
+        p = Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+
+        result = idas.search(p)
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI, RomaniaCities.BUCHAREST],
+                         [action.location for action in result])
+        self.assertEqual(418, idas.get_path_cost())
+        # only the current path is kept in memory
+        self.assertEqual(5, idas.get_peak_nodes())
+        self.assertTrue(idas.get_metrics()[IterativeDeepeningAStarSearch.METRIC_ITERATIONS] > 1)
+
+    def test_search_start_at_goal_state(self):
+        finish = RomaniaCities.BUCHAREST
+        rm = get_simplified_road_map_of_part_of_romania()
+        idas = IterativeDeepeningAStarSearch(AStarEvaluationFunction(MapHeuristicFunction(rm, finish)))
+
+        p = Problem(finish, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+
+        result = idas.search(p)
+        self.assertEqual(1, len(result))
+        self.assertEqual(NoOpAction(), result[0])
+
+
+class SimplifiedMemoryBoundedAStarSearchTest(unittest.TestCase):
+    def _search(self, max_nodes, start=RomaniaCities.ARAD, finish=RomaniaCities.BUCHAREST):
+        rm = get_simplified_road_map_of_part_of_romania()
+        smas = SimplifiedMemoryBoundedAStarSearch(AStarEvaluationFunction(MapHeuristicFunction(rm, finish)), max_nodes)
+
+        p = Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+        return smas, smas.search(p)
+
+    def test_aima2_figure_4_2(self):
+        for max_nodes in [5, 8, 100]:
+            smas, result = self._search(max_nodes)
+
+            self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                              RomaniaCities.BUCHAREST], [action.location for action in result])
+            self.assertEqual(418, smas.get_path_cost())
+            self.assertTrue(smas.get_peak_nodes() <= max_nodes)
+
+    def test_best_solution_that_fits_into_memory(self):
+        # optimal path Oradea, Sibiu, Rimnicu Vilcea, Pitesti, Bucharest, Giurgiu doesn't fit into memory
+        smas, result = self._search(5, RomaniaCities.ORADEA, RomaniaCities.GIURGIU)
+
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.FAGARAS, RomaniaCities.BUCHAREST, RomaniaCities.GIURGIU],
+                         [action.location for action in result])
+        self.assertEqual(551, smas.get_path_cost())
+        self.assertTrue(smas.get_metrics()[SimplifiedMemoryBoundedAStarSearch.METRIC_NODES_DROPPED] > 0)
+
+    def test_search_failure(self):
+        smas, result = self._search(3)
+        self.assertTrue(smas.is_failure(result))
+
+    def test_search_start_at_goal_state(self):
+        smas, result = self._search(2, RomaniaCities.BUCHAREST)
+
+        self.assertEqual(1, len(result))
+        self.assertEqual(NoOpAction(), result[0])
+
+class SearchBudgetTest(unittest.TestCase):
+    def test_searches_stop(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        hf = MapHeuristicFunction(rm, RomaniaCities.BUCHAREST)
+        # RBFS and IDA* don't stop on a map with unreachable goal without a budget
+        p = Problem(RomaniaCities.ARAD, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction("Unknown"),
+                    MapStepCostFunction(rm))
+
+        searches = [AStarSearch(TreeSearch(), hf), RecursiveBestFirstSearch(AStarEvaluationFunction(hf)),
+                    IterativeDeepeningAStarSearch(AStarEvaluationFunction(hf)),
+                    SimplifiedMemoryBoundedAStarSearch(AStarEvaluationFunction(hf), 1000)]
+        for search in searches:
+            budget = SearchBudget(max_expansions=50)
+            search.set_budget(budget)
+
+            result = search.search(p)
+            self.assertTrue(search.is_budget_exhausted(result))
+            self.assertEqual(50, search.get_metrics()["nodesExpanded"])
+            self.assertEqual(SearchBudget.REASON_EXPANSIONS, budget.get_exhausted_reason())
+
+    def test_recursive_best_first_search_max_nodes(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        hf = MapHeuristicFunction(rm, RomaniaCities.BUCHAREST)
+        p = Problem(RomaniaCities.ARAD, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction("Unknown"),
+                    MapStepCostFunction(rm))
+
+        rbfs = RecursiveBestFirstSearch(AStarEvaluationFunction(hf))
+        budget = SearchBudget(max_nodes=20)
+        rbfs.set_budget(budget)
+
+        result = rbfs.search(p)
+        self.assertTrue(rbfs.is_budget_exhausted(result))
+        self.assertEqual(SearchBudget.REASON_NODES, budget.get_exhausted_reason())
+
+        # successors of the path to a goal fit into the limit
+        p = Problem(RomaniaCities.ARAD, MapActionFunction(rm), MapResultFunction(),
+                    MapGoalTestFunction(RomaniaCities.BUCHAREST), MapStepCostFunction(rm))
+        rbfs.set_budget(SearchBudget(max_nodes=20))
+        result = rbfs.search(p)
+        self.assertEqual(RomaniaCities.BUCHAREST, result[-1].location)
+
+    def test_anytime_search_returns_best_solution(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        awas = AnytimeWeightedAStarSearch(MapHeuristicFunction(rm, RomaniaCities.BUCHAREST), 5, 1)
+        awas.set_budget(SearchBudget(max_expansions=4))
+        p = Problem(RomaniaCities.ARAD, MapActionFunction(rm), MapResultFunction(),
+                    MapGoalTestFunction(RomaniaCities.BUCHAREST), MapStepCostFunction(rm))
+
+        result = awas.search(p)
+        self.assertEqual(RomaniaCities.BUCHAREST, result[-1].location)
+        self.assertEqual(450, awas.get_path_cost())
+        self.assertTrue(awas.get_bound() > 1)
+
+class FakeClock:
+    def __init__(self, step):
+        self.time = 0
+        self.step = step
+
+    def __call__(self):
+        self.time += self.step
+        return self.time
+
+class AnytimeWeightedAStarSearchTest(unittest.TestCase):
+    def _search(self, start=RomaniaCities.ARAD, finish=RomaniaCities.BUCHAREST, **kwargs):
+        rm = get_simplified_road_map_of_part_of_romania()
+        awas = AnytimeWeightedAStarSearch(MapHeuristicFunction(rm, finish), **kwargs)
+
+        p = Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish), MapStepCostFunction(rm))
+        return awas, p
+
+    def test_aima2_figure_4_2(self):
+        awas, p = self._search(initial_weight=5, weight_step=1)
+        result = awas.search(p)
+
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                          RomaniaCities.BUCHAREST], [action.location for action in result])
+        self.assertEqual(418, awas.get_path_cost())
+        self.assertEqual(1, awas.get_bound())
+        self.assertEqual(5, awas.get_metrics()[AnytimeWeightedAStarSearch.METRIC_ITERATIONS])
+
+    def test_solutions_are_improved(self):
+        awas, p = self._search(initial_weight=5, weight_step=1)
+        costs = []
+        bounds = []
+        for solution in awas.iter_search(p):
+            costs.append(awas.get_path_cost())
+            bounds.append(awas.get_bound())
+
+        # the first solution goes through Fagaras
+        self.assertEqual([450, 418], costs)
+        self.assertTrue(1 < bounds[0] <= 5)
+        # open and closed lists are reused, so every node is expanded once
+        self.assertEqual(5, awas.get_nodes_expanded())
+
+    def test_time_limit(self):
+        # every call of a clock advances time by 1 second
+        awas, p = self._search(initial_weight=5, weight_step=1, time_limit=5, clock=FakeClock(1))
+        result = awas.search(p)
+
+        self.assertEqual(RomaniaCities.BUCHAREST, result[-1].location)
+        self.assertEqual(450, awas.get_path_cost())
+        self.assertTrue(awas.get_bound() > 1)
+
+        awas, p = self._search(time_limit=0)
+        self.assertTrue(awas.is_failure(awas.search(p)))
+        self.assertEqual(0, awas.get_nodes_expanded())
+
+    def test_search_start_at_goal_state(self):
+        awas, p = self._search(RomaniaCities.BUCHAREST)
+        result = awas.search(p)
+
+        self.assertEqual(1, len(result))
+        self.assertEqual(NoOpAction(), result[0])
+        self.assertEqual(1, awas.get_bound())
+
 if __name__ == '__main__':
     unittest.main()
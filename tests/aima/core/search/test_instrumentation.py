@@ -0,0 +1,94 @@
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapHeuristicFunction, \
+    MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.search.framework import GraphSearch, Problem
+from aima.core.search.informed import AStarSearch
+from aima.core.search.instrumentation import SearchInstrumentation, InstrumentedHeuristicFunction, TraceRecorder
+from aima.core.search.uninformed import BreadthFirstSearch
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+class FakeClock:
+    def __init__(self, step):
+        self.time = 0
+        self.step = step
+
+    def __call__(self):
+        self.time += self.step
+        return self.time
+
+
+def create_problem(start, finish):
+    rm = get_simplified_road_map_of_part_of_romania()
+    return Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish),
+                   MapStepCostFunction(rm))
+
+
+class SearchInstrumentationTest(unittest.TestCase):
+    def test_same_result_as_without_instrumentation(self):
+        problem = create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST)
+        gs = GraphSearch()
+        expected = BreadthFirstSearch(gs).search(problem)
+        expected_metrics = dict(gs.get_metrics())
+
+        recorder = TraceRecorder()
+        instrumentation = SearchInstrumentation(recorder)
+        gs = GraphSearch()
+        gs.set_instrumentation(instrumentation)
+        result = BreadthFirstSearch(gs).search(problem)
+
+        self.assertEqual([a.location for a in expected], [a.location for a in result])
+        self.assertEqual(expected_metrics, gs.get_metrics())
+        self.assertEqual(gs.get_nodes_expanded(), instrumentation.get_nodes_expanded())
+
+        events = [event for event, state in recorder.trace]
+        self.assertEqual(instrumentation.get_nodes_expanded(), events.count(SearchInstrumentation.EVENT_EXPAND))
+        self.assertEqual((SearchInstrumentation.EVENT_GOAL, RomaniaCities.BUCHAREST), recorder.trace[-1])
+        self.assertEqual((SearchInstrumentation.EVENT_INSERT, RomaniaCities.ARAD), recorder.trace[0])
+
+        phase_times = instrumentation.get_phase_times()
+        self.assertEqual(set(SearchInstrumentation.PHASES), set(phase_times.keys()))
+        self.assertTrue(sum(phase_times.values()) <= instrumentation.get_total_time())
+
+    def test_heuristic_calls(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        instrumentation = SearchInstrumentation(TraceRecorder([SearchInstrumentation.EVENT_EXPAND]))
+        hf = InstrumentedHeuristicFunction(MapHeuristicFunction(rm, RomaniaCities.BUCHAREST), instrumentation)
+
+        gs = GraphSearch()
+        gs.set_instrumentation(instrumentation)
+        AStarSearch(gs, hf).search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertTrue(instrumentation.get_heuristic_calls() > 0)
+        self.assertEqual(418, gs.get_path_cost())
+
+    def test_expansion_rates(self):
+        # every call of a clock advances time by 0.01 second
+        instrumentation = SearchInstrumentation(rate_interval=0.1, clock=FakeClock(0.01))
+        gs = GraphSearch()
+        gs.set_instrumentation(instrumentation)
+        BreadthFirstSearch(gs).search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        rates = instrumentation.get_expansion_rates()
+        self.assertTrue(len(rates) > 1)
+        self.assertAlmostEqual(instrumentation.get_nodes_expanded(), sum(rates) * 0.1)
+
+        histogram = instrumentation.get_expansion_rate_histogram(4)
+        self.assertEqual(4, len(histogram))
+        self.assertEqual(len(rates), sum(count for low, count in histogram))
+
+        instrumentation.reset()
+        self.assertEqual([], instrumentation.get_expansion_rate_histogram())
+
+    def test_instrumentation_off(self):
+        gs = GraphSearch()
+        gs.set_instrumentation(SearchInstrumentation())
+        gs.set_instrumentation(None)
+        result = BreadthFirstSearch(gs).search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertEqual(3, len(result))
+        self.assertIsNone(gs.get_instrumentation())
+
+if __name__ == '__main__':
+    unittest.main()
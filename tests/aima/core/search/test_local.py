@@ -1,5 +1,6 @@
-from aima.core.search.framework import Problem, ActionFunction, ResultFunction, GoalTest, HeuristicFunction
-from aima.core.search.local import HillClimbingSearch
+from aima.core.search.framework import Problem, ActionFunction, ResultFunction, GoalTest, HeuristicFunction, \
+    SearchBudget
+from aima.core.search.local import HillClimbingSearch, SimulateAnnealingSearch, GeneticAlgorithm, GeneticProblem, StateConverter
 
 __author__ = 'proger'
 
@@ -65,5 +66,72 @@ class TestHillClimbingSearch(unittest.TestCase):
         self.assertTrue(hcs.is_failure())
         self.assertEqual(3, hcs.last_state)
 
+    def test_budget_exhausted(self):
+        values = [4, 3, 5, 6, 10, 3]
+        problem = Problem(1, LocalActionFunction(len(values)), LocalResultFunction(), LocalGoalTestFunction(4))
+        hcs = HillClimbingSearch(LocalHeuristicFunction(values))
+        hcs.set_budget(SearchBudget(max_expansions=2))
+        result = hcs.search(problem)
+
+        self.assertTrue(hcs.is_budget_exhausted(result))
+        self.assertTrue(hcs.is_failure())
+        self.assertEqual(3, hcs.last_state)
+        self.assertEqual(2, hcs.get_nodes_expanded())
+
+class TestSimulateAnnealingSearch(unittest.TestCase):
+    def test_budget_exhausted(self):
+        values = [4, 3, 5, 6, 10, 3]
+        problem = Problem(1, LocalActionFunction(len(values)), LocalResultFunction(), LocalGoalTestFunction(4))
+        sas = SimulateAnnealingSearch(LocalHeuristicFunction(values))
+        sas.set_budget(SearchBudget(max_expansions=3))
+        result = sas.search(problem)
+
+        self.assertTrue(sas.is_budget_exhausted(result))
+        self.assertTrue(sas.failed())
+        self.assertEqual(3, sas.get_nodes_expanded())
+
+class BinaryConverter(StateConverter):
+    def get_string(self, state):
+        return state
+
+    def get_state(self, string):
+        return string
+
+    def get_individual_length(self):
+        return 4
+
+    def get_alphabet(self):
+        return "01"
+
+class OnesHeuristicFunction(HeuristicFunction):
+    def h(self, state):
+        return state.count("0")
+
+class UnreachableGoalTest(GoalTest):
+    def is_goal_state(self, state):
+        return False
+
+class TestGeneticAlgorithm(unittest.TestCase):
+    def test_budget_exhausted(self):
+        problem = GeneticProblem(["0000", "0101", "1010"], UnreachableGoalTest(), BinaryConverter())
+        budget = SearchBudget(max_expansions=3)
+        ga = GeneticAlgorithm(0.1)
+        ga.set_budget(budget)
+        self.assertIs(budget, ga.get_budget())
+
+        state = ga.search(problem, OnesHeuristicFunction(), 100)
+
+        self.assertIsNotNone(state)
+        self.assertTrue(ga.failed)
+        self.assertTrue(ga.metrics[GeneticAlgorithm.BUDGET_EXHAUSTED])
+        self.assertEqual(3, budget.get_expansions())
+
+    def test_budget_not_exhausted(self):
+        problem = GeneticProblem(["0000", "0101", "1010"], UnreachableGoalTest(), BinaryConverter())
+        ga = GeneticAlgorithm(0.1)
+        ga.search(problem, OnesHeuristicFunction(), 5)
+
+        self.assertFalse(ga.metrics[GeneticAlgorithm.BUDGET_EXHAUSTED])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,200 @@
+import multiprocessing
+import time
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapHeuristicFunction, \
+    MapStepCostFunction, MapActionFunction, MapResultFunction, MapGoalTestFunction
+from aima.core.search.framework import GraphSearch, Problem, Search, HeuristicFunction, SearchBudget
+from aima.core.search.informed import AStarSearch, GreedyBestFirstSearch
+from aima.core.search.parallel import PortfolioSearch, BatchSearch, search_many, HashDistributedAStarSearch
+from aima.core.search.uninformed import BreadthFirstSearch
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+class SleepingSearch(Search):
+    def search(self, problem):
+        time.sleep(60)
+        return self._failure()
+
+    def get_metrics(self):
+        return {}
+
+class FailingSearch(Search):
+    def search(self, problem):
+        return self._failure()
+
+    def get_metrics(self):
+        return {"nodesExpanded": 0}
+
+class BrokenSearch(Search):
+    def search(self, problem):
+        raise RuntimeError("broken")
+
+    def get_metrics(self):
+        return {}
+
+class BrokenHeuristicFunction(HeuristicFunction):
+    def h(self, state):
+        raise RuntimeError("broken")
+
+
+def create_problem(start, finish):
+    rm = get_simplified_road_map_of_part_of_romania()
+    return Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish),
+                   MapStepCostFunction(rm))
+
+def create_searches(finish):
+    rm = get_simplified_road_map_of_part_of_romania()
+    hf = MapHeuristicFunction(rm, finish)
+    return [GreedyBestFirstSearch(GraphSearch(), hf), AStarSearch(GraphSearch(), hf), BreadthFirstSearch()]
+
+
+class PortfolioSearchTest(unittest.TestCase):
+    def test_best_solution(self):
+        ps = PortfolioSearch(create_searches(RomaniaCities.BUCHAREST), PortfolioSearch.BEST)
+        result = ps.search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                          RomaniaCities.BUCHAREST], [a.location for a in result])
+
+        metrics = ps.get_metrics()
+        self.assertEqual(418, metrics[PortfolioSearch.METRIC_PATH_COST])
+        self.assertEqual(1, metrics[PortfolioSearch.METRIC_WINNER])
+        self.assertEqual(3, metrics[PortfolioSearch.METRIC_SOLUTIONS])
+        # metrics of all searches are merged
+        for i in range(3):
+            self.assertTrue(str(i) + ".nodesExpanded" in metrics)
+        self.assertEqual(metrics["1.nodesExpanded"], metrics["nodesExpanded"])
+
+    def test_first_solution_cancels_other_searches(self):
+        searches = [SleepingSearch()] + create_searches(RomaniaCities.BUCHAREST)
+        ps = PortfolioSearch(searches, PortfolioSearch.FIRST)
+
+        start = time.time()
+        result = ps.search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertTrue(time.time() - start < 30)
+        self.assertFalse(ps.is_failure(result))
+        self.assertEqual(RomaniaCities.BUCHAREST, result[-1].location)
+        self.assertTrue(ps.get_metrics()[PortfolioSearch.METRIC_WINNER] > 0)
+        self.assertFalse("0.nodesExpanded" in ps.get_metrics())
+        # worker that runs a sleeping search is terminated
+        self.assertEqual([], multiprocessing.active_children())
+
+    def test_budget_exhausted_search_is_not_a_solution(self):
+        hf = MapHeuristicFunction(get_simplified_road_map_of_part_of_romania(), RomaniaCities.BUCHAREST)
+        limited = AStarSearch(GraphSearch(), hf)
+        limited.set_budget(SearchBudget(max_expansions=1))
+        ps = PortfolioSearch([limited, AStarSearch(GraphSearch(), hf)], PortfolioSearch.BEST)
+        result = ps.search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertEqual(RomaniaCities.BUCHAREST, result[-1].location)
+        self.assertEqual(1, ps.get_metrics()[PortfolioSearch.METRIC_WINNER])
+        self.assertEqual(418, ps.get_metrics()[PortfolioSearch.METRIC_PATH_COST])
+        self.assertEqual(1, ps.get_metrics()[PortfolioSearch.METRIC_SOLUTIONS])
+
+    def test_failure(self):
+        ps = PortfolioSearch([FailingSearch(), BrokenSearch()], PortfolioSearch.BEST)
+        result = ps.search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertTrue(ps.is_failure(result))
+        self.assertEqual(0, ps.get_metrics()[PortfolioSearch.METRIC_SOLUTIONS])
+
+        ps = PortfolioSearch([BrokenSearch()])
+        self.assertRaises(RuntimeError, ps.search, create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+class BatchSearchTest(unittest.TestCase):
+    def test_search_many(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        problems = [create_problem(location, RomaniaCities.BUCHAREST) for location in rm.get_locations()]
+        expected = [BreadthFirstSearch().search(problem) for problem in problems]
+
+        bs = BatchSearch(BreadthFirstSearch(), workers=2, chunk_size=3)
+        results = {}
+        expanded = 0
+        for index, actions, metrics in bs.search_many(problems):
+            self.assertFalse(index in results)
+            results[index] = actions
+            expanded += metrics["nodesExpanded"]
+
+        self.assertEqual(len(problems), len(results))
+        for i in range(len(problems)):
+            self.assertEqual([getattr(a, "location", None) for a in expected[i]],
+                             [getattr(a, "location", None) for a in results[i]])
+
+        metrics = bs.get_metrics()
+        self.assertEqual(len(problems), metrics[BatchSearch.METRIC_QUERIES])
+        self.assertEqual(0, metrics[BatchSearch.METRIC_FAILURES])
+        self.assertEqual(expanded, metrics["nodesExpanded"])
+
+    def test_budget_exhausted_queries(self):
+        bfs = BreadthFirstSearch(GraphSearch())
+        bfs.set_budget(SearchBudget(max_expansions=1))
+        problems = [create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST)] * 2 + \
+                   [create_problem(RomaniaCities.ARAD, RomaniaCities.SIBIU)]
+
+        bs = BatchSearch(bfs, workers=2)
+        results = list(bs.search_many(problems))
+
+        self.assertEqual(3, len(results))
+        metrics = bs.get_metrics()
+        self.assertEqual(2, metrics[BatchSearch.METRIC_EXHAUSTED])
+        self.assertEqual(2, metrics[BatchSearch.METRIC_FAILURES])
+
+    def test_search_many_function(self):
+        problems = [create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST)] * 3
+        results = sorted(search_many(FailingSearch(), problems, workers=2), key=lambda r: r[0])
+
+        self.assertEqual([0, 1, 2], [r[0] for r in results])
+        self.assertTrue(all(len(r[1]) == 0 for r in results))
+        self.assertEqual([], list(search_many(FailingSearch(), [])))
+
+class HashDistributedAStarSearchTest(unittest.TestCase):
+    def test_optimal_path_cost(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        for start in [RomaniaCities.ARAD, RomaniaCities.ORADEA, RomaniaCities.NEAMT]:
+            for finish in [RomaniaCities.BUCHAREST, RomaniaCities.DOBRETA, RomaniaCities.EFORIE]:
+                problem = create_problem(start, finish)
+                hf = MapHeuristicFunction(rm, finish)
+                gs = GraphSearch()
+                AStarSearch(gs, hf).search(problem)
+
+                hs = HashDistributedAStarSearch(hf, workers=3, batch_size=2)
+                result = hs.search(problem)
+
+                self.assertAlmostEqual(gs.get_path_cost(), hs.get_metrics()[HashDistributedAStarSearch.METRIC_PATH_COST])
+                self.assertEqual(finish, result[-1].location)
+                self.assertTrue(hs.get_metrics()[HashDistributedAStarSearch.METRIC_NODES_EXPANDED] > 0)
+
+    def test_aima2_figure_4_2(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        hs = HashDistributedAStarSearch(MapHeuristicFunction(rm, RomaniaCities.BUCHAREST), workers=2)
+        result = hs.search(create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                          RomaniaCities.BUCHAREST], [a.location for a in result])
+        self.assertEqual(418, hs.get_metrics()[HashDistributedAStarSearch.METRIC_PATH_COST])
+
+    def test_initial_state_is_goal(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        hs = HashDistributedAStarSearch(MapHeuristicFunction(rm, RomaniaCities.ARAD), workers=2)
+        result = hs.search(create_problem(RomaniaCities.ARAD, RomaniaCities.ARAD))
+
+        self.assertEqual(1, len(result))
+        self.assertTrue(result[0].is_noop())
+
+    def test_failure(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        hs = HashDistributedAStarSearch(MapHeuristicFunction(rm, RomaniaCities.BUCHAREST), workers=2)
+        result = hs.search(create_problem(RomaniaCities.ARAD, "Unknown"))
+
+        self.assertTrue(hs.is_failure(result))
+        # every city is expanded, a worker may expand a city again if a cheaper path to it arrives later
+        self.assertTrue(hs.get_metrics()[HashDistributedAStarSearch.METRIC_NODES_EXPANDED] >= 20)
+
+    def test_worker_error(self):
+        hs = HashDistributedAStarSearch(BrokenHeuristicFunction(), workers=2)
+        self.assertRaises(RuntimeError, hs.search, create_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import shutil
+import tempfile
+from aima.core.agent import Action
+from aima.core.search.framework import BidirectionalProblem, ActionFunction, ResultFunction, GoalTest, GraphSearch
+from aima.core.search.informed import AStarSearch
+from aima.core.search.patterndb import Abstraction, PatternDatabase, PatternDatabaseHeuristicFunction
+from aima.core.search.uninformed import BreadthFirstSearch
+
+__author__ = 'Ivan Mushketik'
+
+import unittest
+
+# Sliding tile puzzle on a 2x3 board. State is a tuple of tiles row by row, 0 is a blank. Action moves a blank to an
+# adjacent position.
+
+WIDTH = 3
+HEIGHT = 2
+GOAL = (1, 2, 3, 4, 5, 0)
+DONT_CARE = -1
+
+class MoveBlankAction(Action):
+    def __init__(self, position):
+        super().__init__("moveBlank")
+        self.position = position
+
+    def is_noop(self):
+        return False
+
+class PuzzleActionsFunction(ActionFunction):
+    def actions(self, state):
+        blank = state.index(0)
+        x, y = blank % WIDTH, blank // WIDTH
+        actions = []
+        if x > 0:
+            actions.append(MoveBlankAction(blank - 1))
+        if x < WIDTH - 1:
+            actions.append(MoveBlankAction(blank + 1))
+        if y > 0:
+            actions.append(MoveBlankAction(blank - WIDTH))
+        if y < HEIGHT - 1:
+            actions.append(MoveBlankAction(blank + WIDTH))
+        return actions
+
+class PuzzleResultFunction(ResultFunction):
+    def result(self, state, action):
+        tiles = list(state)
+        blank = tiles.index(0)
+        tiles[blank], tiles[action.position] = tiles[action.position], 0
+        return tuple(tiles)
+
+class PuzzleGoalTest(GoalTest):
+    def is_goal_state(self, state):
+        return state == GOAL
+
+class TilesAbstraction(Abstraction):
+    """
+        Distinguishes pattern tiles and a blank, other tiles are "don't care" tiles. Only moves of pattern tiles are
+        counted, so abstractions with disjoint patterns are additive.
+    """
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def abstract(self, state):
+        return tuple(tile if tile == 0 or tile in self.pattern else DONT_CARE for tile in state)
+
+    def rank(self, abstract_state):
+        # positions of a blank and pattern tiles as digits of a number
+        rank = abstract_state.index(0)
+        for tile in self.pattern:
+            rank = rank * len(abstract_state) + abstract_state.index(tile)
+        return rank
+
+    def size(self):
+        return (WIDTH * HEIGHT) ** (len(self.pattern) + 1)
+
+    def step_cost(self, abstract_state, action, new_abstract_state):
+        return 0 if abstract_state[action.position] == DONT_CARE else 1
+
+
+def create_problem(initial_state):
+    return BidirectionalProblem(initial_state, GOAL, PuzzleActionsFunction(), PuzzleResultFunction(), PuzzleGoalTest())
+
+def all_states():
+    states = []
+    frontier = [GOAL]
+    seen = {GOAL}
+    rf = PuzzleResultFunction()
+    while frontier:
+        state = frontier.pop()
+        states.append(state)
+        for action in PuzzleActionsFunction().actions(state):
+            new_state = rf.result(state, action)
+            if new_state not in seen:
+                seen.add(new_state)
+                frontier.append(new_state)
+    return states
+
+
+class PatternDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build(self):
+        pdb = PatternDatabase.build(create_problem(GOAL), TilesAbstraction((1, 2)))
+
+        self.assertEqual(0, pdb.get_distance(GOAL))
+        # tiles 1 and 2 are one step away from their positions
+        self.assertEqual(2, pdb.get_distance((0, 1, 2, 3, 4, 5)))
+        # only moves of pattern tiles are counted
+        self.assertEqual(0, pdb.get_distance((1, 2, 3, 4, 0, 5)))
+
+    def test_admissible_and_additive(self):
+        pdb1 = PatternDatabase.build(create_problem(GOAL), TilesAbstraction((1, 2, 3)))
+        pdb2 = PatternDatabase.build(create_problem(GOAL), TilesAbstraction((4, 5)))
+        hf = PatternDatabaseHeuristicFunction([pdb1, pdb2])
+
+        bfs = BreadthFirstSearch()
+        for state in all_states()[::20]:
+            cost = len(bfs.search(create_problem(state))) if state != GOAL else 0
+            self.assertTrue(hf.h(state) <= cost)
+
+    def test_save_and_load(self):
+        abstraction = TilesAbstraction((1, 2, 3))
+        pdb = PatternDatabase.build(create_problem(GOAL), abstraction)
+        path = os.path.join(self.directory, "123.pdb")
+        pdb.save(path)
+
+        loaded = PatternDatabase.load(path, abstraction)
+        try:
+            for state in all_states():
+                self.assertEqual(pdb.get_distance(state), loaded.get_distance(state))
+        finally:
+            loaded.close()
+
+        self.assertRaises(ValueError, PatternDatabase.load, path, TilesAbstraction((1, 2)))
+
+    def test_load_truncated_file(self):
+        abstraction = TilesAbstraction((1, 2, 3))
+        path = os.path.join(self.directory, "truncated.pdb")
+        for length in [0, 5]:
+            with open(path, "wb") as f:
+                f.write(b"P" * length)
+            self.assertRaises(ValueError, PatternDatabase.load, path, abstraction)
+
+    def test_astar_search(self):
+        pdb1 = PatternDatabase.build(create_problem(GOAL), TilesAbstraction((1, 2, 3)))
+        pdb2 = PatternDatabase.build(create_problem(GOAL), TilesAbstraction((4, 5)))
+        initial_state = (0, 5, 4, 3, 2, 1)
+
+        gs = GraphSearch()
+        ass = AStarSearch(gs, PatternDatabaseHeuristicFunction([pdb1, pdb2]))
+        result = ass.search(create_problem(initial_state))
+
+        # the shortest solution found by breadth first search has 15 steps
+        self.assertEqual(15, len(result))
+        self.assertEqual(15, gs.get_path_cost())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
-from aima.core.search.framework import Problem, TreeSearch, GraphSearch
-from aima.core.search.uninformed import DepthLimitedSearch, IterativeDeepeningSearch, DepthFirstSearch, BreadthFirstSearch
+from aima.core.environment.map import RomaniaCities, get_simplified_road_map_of_part_of_romania, MapStepCostFunction, \
+    MapActionFunction, MapResultFunction, MapGoalTestFunction, MapReverseActionFunction, ExtendableMap, \
+    MapDijkstraSearch
+from aima.core.search.framework import Problem, TreeSearch, GraphSearch, BidirectionalProblem, SearchBudget
+from aima.core.search.uninformed import DepthLimitedSearch, IterativeDeepeningSearch, DepthFirstSearch, \
+    BreadthFirstSearch, BidirectionalSearch, UniformCostSearch
 from aima.core.agent import Action
 from aima.core.search.framework import GoalTest, ResultFunction, ActionFunction
 
@@ -147,5 +151,230 @@ class TestIterativeDeepeningSearch(unittest.TestCase):
         result = ids.search(problem)
         self.assertTrue(ids.is_failure(result))
 
+    def test_expansion_cache(self):
+        problem = Problem(1, TestActionsFunction(), TestResultFunction(), TestGoalTest(5))
+
+        ids = IterativeDeepeningSearch(cache_size=0)
+        self.assertEqual(4, len(ids.search(problem)))
+        self.assertEqual(0, ids.get_metrics()[IterativeDeepeningSearch.METRIC_EXPANSION_CACHE_HITS])
+        expanded = ids.get_metrics()[IterativeDeepeningSearch.METRICS_NODES_EXPANDED]
+
+        ids = IterativeDeepeningSearch(cache_size=1000)
+        self.assertEqual(4, len(ids.search(problem)))
+        # every state is expanded by problem's functions only once
+        self.assertEqual(expanded - 4, ids.get_metrics()[IterativeDeepeningSearch.METRIC_EXPANSION_CACHE_HITS])
+        self.assertEqual(expanded, ids.get_metrics()[IterativeDeepeningSearch.METRICS_NODES_EXPANDED])
+
+    def test_unhashable_states(self):
+        class ListResultFunction(ResultFunction):
+            def result(self, state, action):
+                return [state[0] + 1]
+
+        class ListGoalTest(GoalTest):
+            def is_goal_state(self, state):
+                return state == [4]
+
+        ids = IterativeDeepeningSearch()
+        result = ids.search(Problem([1], TestActionsFunction(), ListResultFunction(), ListGoalTest()))
+        self.assertEqual(3, len(result))
+
+    def test_deep_search(self):
+        dls = DepthLimitedSearch(20000)
+        problem = Problem(0, TestActionsFunction(), TestResultFunction(), TestGoalTest(15000))
+
+        result = dls.search(problem)
+        self.assertEqual(15000, len(result))
+        self.assertEqual(15000, dls.get_path_cost())
+
+class TestSearchBudget(unittest.TestCase):
+    def test_queue_search(self):
+        # goal state is never reached, so search is stopped by a budget
+        problem = Problem(1, TestActionsFunction(), TestResultFunction(), TestGoalTest(0))
+        budget = SearchBudget(max_expansions=10)
+        bfs = BreadthFirstSearch(TreeSearch())
+        bfs.set_budget(budget)
+
+        result = bfs.search(problem)
+        self.assertTrue(bfs.is_budget_exhausted(result))
+        self.assertFalse(bfs.is_failure(result))
+        self.assertEqual(10, bfs.get_metrics()[TreeSearch.METRIC_NODES_EXPANDED])
+        self.assertTrue(bfs.get_metrics()[TreeSearch.METRIC_QUEUE_SIZE] > 0)
+
+        budget = SearchBudget(max_nodes=100)
+        bfs.set_budget(budget)
+        self.assertTrue(bfs.is_budget_exhausted(bfs.search(problem)))
+        self.assertEqual(SearchBudget.REASON_NODES, budget.get_exhausted_reason())
+
+    def test_iterative_deepening_search(self):
+        problem = Problem(1, TestActionsFunction(), TestResultFunction(), TestGoalTest(0))
+        budget = SearchBudget(max_expansions=100)
+        ids = IterativeDeepeningSearch()
+        ids.set_budget(budget)
+
+        result = ids.search(problem)
+        self.assertTrue(ids.is_budget_exhausted(result))
+        # budget limits all iterations together
+        self.assertEqual(100, ids.get_metrics()[IterativeDeepeningSearch.METRICS_NODES_EXPANDED])
+
+    def test_bidirectional_search(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        problem = BidirectionalProblem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST, MapActionFunction(rm),
+                                       MapResultFunction(), MapGoalTestFunction(RomaniaCities.BUCHAREST),
+                                       MapStepCostFunction(rm), MapReverseActionFunction(rm))
+        for uniform_cost in [False, True]:
+            bs = BidirectionalSearch(uniform_cost)
+            bs.set_budget(SearchBudget(max_expansions=1))
+
+            self.assertTrue(bs.is_budget_exhausted(bs.search(problem)))
+            self.assertEqual(1, bs.get_metrics()[BidirectionalSearch.METRIC_NODES_EXPANDED])
+
+    def test_dijkstra_search(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        ds = MapDijkstraSearch(rm)
+        ds.set_budget(SearchBudget(max_expansions=3))
+        problem = Problem(RomaniaCities.ARAD, MapActionFunction(rm), MapResultFunction(),
+                          MapGoalTestFunction(RomaniaCities.BUCHAREST), MapStepCostFunction(rm))
+
+        self.assertTrue(ds.is_budget_exhausted(ds.search(problem)))
+        self.assertEqual(3, ds.get_metrics()[MapDijkstraSearch.METRIC_NODES_EXPANDED])
+
+class ComparatorUniformCostSearch(UniformCostSearch):
+    def _get_priority_key(self):
+        return None
+
+class TestUniformCostSearch(unittest.TestCase):
+    def _romania_problem(self, start, finish):
+        rm = get_simplified_road_map_of_part_of_romania()
+        return Problem(start, MapActionFunction(rm), MapResultFunction(), MapGoalTestFunction(finish),
+                       MapStepCostFunction(rm))
+
+    def test_romania(self):
+        for ucs in [UniformCostSearch(), ComparatorUniformCostSearch()]:
+            result = ucs.search(self._romania_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+            self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                              RomaniaCities.BUCHAREST], [action.location for action in result])
+            self.assertEqual(418, ucs.get_metrics()[GraphSearch.METRIC_PATH_COST])
+
+    def test_map_dijkstra_search(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        ds = MapDijkstraSearch(rm)
+        ucs = UniformCostSearch()
+
+        for finish in rm.get_locations():
+            problem = self._romania_problem(RomaniaCities.ARAD, finish)
+            expected = ucs.search(problem)
+            result = ds.search(problem)
+
+            self.assertEqual([getattr(action, "location", None) for action in expected],
+                             [getattr(action, "location", None) for action in result])
+            self.assertEqual(ucs.get_metrics()[GraphSearch.METRIC_PATH_COST],
+                             ds.get_metrics()[MapDijkstraSearch.METRIC_PATH_COST])
+
+    def test_frozen_map(self):
+        rm = get_simplified_road_map_of_part_of_romania()
+        frozen = get_simplified_road_map_of_part_of_romania()
+        frozen.freeze()
+        self.assertTrue(frozen.is_frozen())
+
+        for finish in rm.get_locations():
+            expected = UniformCostSearch().search(self._romania_problem(RomaniaCities.ARAD, finish))
+            problem = Problem(RomaniaCities.ARAD, MapActionFunction(frozen), MapResultFunction(),
+                              MapGoalTestFunction(finish), MapStepCostFunction(frozen))
+            ucs = UniformCostSearch()
+            result = ucs.search(problem)
+            ds = MapDijkstraSearch(frozen)
+
+            self.assertEqual([getattr(action, "location", None) for action in expected],
+                             [getattr(action, "location", None) for action in result])
+            self.assertEqual([getattr(action, "location", None) for action in expected],
+                             [getattr(action, "location", None) for action in ds.search(problem)])
+            self.assertEqual(ucs.get_metrics()[GraphSearch.METRIC_PATH_COST],
+                             ds.get_metrics()[MapDijkstraSearch.METRIC_PATH_COST])
+
+        self.assertEqual(140, frozen.get_distance(RomaniaCities.ARAD, RomaniaCities.SIBIU))
+        self.assertRaises(ValueError, frozen.add_location, "Unknown")
+        self.assertRaises(ValueError, frozen.add_bidirectional_link, RomaniaCities.ARAD, RomaniaCities.BUCHAREST, 1)
+        self.assertRaises(ValueError, frozen.remove_unidirectional_link, RomaniaCities.ARAD, RomaniaCities.SIBIU)
+
+    def test_frozen_map_keeps_integer_distances(self):
+        m = ExtendableMap()
+        m.add_bidirectional_link("A", "B", 3)
+        m.freeze()
+
+        self.assertEqual(3, m.get_distance("A", "B"))
+        self.assertTrue(isinstance(m.get_distance("A", "B"), int))
+
+    def test_removed_link(self):
+        m = ExtendableMap()
+        m.add_bidirectional_link("A", "B", 1)
+        m.add_bidirectional_link("B", "C", 1)
+        m.remove_bidirectional_link("B", "C")
+
+        for frozen in [False, True]:
+            if frozen:
+                m.freeze()
+            problem = Problem("A", MapActionFunction(m), MapResultFunction(), MapGoalTestFunction("C"),
+                              MapStepCostFunction(m))
+            self.assertTrue(UniformCostSearch().is_failure(UniformCostSearch().search(problem)))
+            self.assertEqual([], MapReverseActionFunction(m).actions("C"))
+
+    def test_map_dijkstra_search_failure(self):
+        m = ExtendableMap()
+        m.add_unidirectional_link("A", "B", 1)
+        m.add_location("C")
+
+        ds = MapDijkstraSearch(m)
+        result = ds.search(Problem("A", MapActionFunction(m), MapResultFunction(), MapGoalTestFunction("C")))
+
+        self.assertTrue(ds.is_failure(result))
+        self.assertEqual(2, ds.get_metrics()[MapDijkstraSearch.METRIC_NODES_EXPANDED])
+
+class TestBidirectionalSearch(unittest.TestCase):
+    def _romania_problem(self, start, finish):
+        rm = get_simplified_road_map_of_part_of_romania()
+        return BidirectionalProblem(start, finish, MapActionFunction(rm), MapResultFunction(),
+                                    MapGoalTestFunction(finish), MapStepCostFunction(rm), MapReverseActionFunction(rm))
+
+    def test_breadth_first_search(self):
+        bs = BidirectionalSearch()
+        result = bs.search(self._romania_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.FAGARAS, RomaniaCities.BUCHAREST],
+                         [action.location for action in result])
+        self.assertEqual(450, bs.get_metrics()[BidirectionalSearch.METRIC_PATH_COST])
+
+    def test_uniform_cost_search(self):
+        bs = BidirectionalSearch(uniform_cost=True)
+        result = bs.search(self._romania_problem(RomaniaCities.ARAD, RomaniaCities.BUCHAREST))
+
+        self.assertEqual([RomaniaCities.SIBIU, RomaniaCities.RIMNICU_VILCEA, RomaniaCities.PITESTI,
+                          RomaniaCities.BUCHAREST], [action.location for action in result])
+        self.assertEqual(418, bs.get_metrics()[BidirectionalSearch.METRIC_PATH_COST])
+        self.assertTrue(bs.get_metrics()[BidirectionalSearch.METRIC_NODES_EXPANDED] > 0)
+
+    def test_search_start_at_goal_state(self):
+        bs = BidirectionalSearch()
+        result = bs.search(self._romania_problem(RomaniaCities.ARAD, RomaniaCities.ARAD))
+
+        self.assertEqual(1, len(result))
+        self.assertTrue(result[0].is_noop())
+
+    def test_unidirectional_links(self):
+        m = ExtendableMap()
+        m.add_unidirectional_link("A", "B", 1)
+        m.add_unidirectional_link("B", "C", 1)
+        m.add_unidirectional_link("C", "D", 1)
+
+        for uniform_cost in [False, True]:
+            bs = BidirectionalSearch(uniform_cost)
+            problem = BidirectionalProblem("A", "D", MapActionFunction(m), MapResultFunction(),
+                                           MapGoalTestFunction("D"), MapStepCostFunction(m), MapReverseActionFunction(m))
+            self.assertEqual(["B", "C", "D"], [action.location for action in bs.search(problem)])
+
+            problem = BidirectionalProblem("D", "A", MapActionFunction(m), MapResultFunction(),
+                                           MapGoalTestFunction("A"), MapStepCostFunction(m), MapReverseActionFunction(m))
+            self.assertTrue(bs.is_failure(bs.search(problem)))
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,4 @@
-from aima.core.util.datastructure import LIFOQueue, FIFOQueue, PriorityQueue, LabeledGraph
+from aima.core.util.datastructure import LIFOQueue, FIFOQueue, PriorityQueue, LabeledGraph, LRUCache
 from aima.core.util.other import Comparator
 
 
@@ -45,6 +45,28 @@ class TestLIFOQueue(unittest.TestCase):
         self.assertEqual(3, lifo.pop())
         self.assertEqual(1, lifo.pop())
 
+    def test_indexed_remove(self):
+        lifo = LIFOQueue(indexed=True)
+
+        lifo.add(1)
+        lifo.add(2)
+        lifo.add(3)
+        lifo.add(2)
+
+        self.assertFalse(lifo.remove(5))
+        self.assertTrue(lifo.remove(3))
+        self.assertFalse(3 in lifo)
+        self.assertTrue(lifo.remove(2))
+        self.assertTrue(2 in lifo)
+
+        self.assertEqual(2, lifo.length())
+        self.assertEqual("[2, 1]", str(lifo))
+        self.assertEqual(2, lifo.element())
+        self.assertEqual(2, lifo.pop())
+        self.assertEqual(1, lifo.pop())
+        self.assertTrue(lifo.is_empty())
+        self.assertEqual(None, lifo.pop())
+
 class TestFIFOQueue(unittest.TestCase):
     def test_is_empty(self):
         fifo = FIFOQueue()
@@ -82,6 +104,36 @@ class TestFIFOQueue(unittest.TestCase):
         self.assertEqual(1, fifo.pop())
         self.assertEqual(3, fifo.pop())
         
+    def test_contains(self):
+        fifo = FIFOQueue()
+
+        fifo.add(1)
+        fifo.add(2)
+
+        self.assertTrue(1 in fifo)
+        self.assertFalse(3 in fifo)
+
+    def test_indexed_remove(self):
+        fifo = FIFOQueue(indexed=True)
+
+        fifo.add(1)
+        fifo.add(2)
+        fifo.add(3)
+
+        self.assertFalse(fifo.remove(5))
+        self.assertTrue(fifo.remove(1))
+        self.assertTrue(fifo.remove(3))
+        self.assertFalse(fifo.remove(3))
+        self.assertFalse(1 in fifo)
+        self.assertTrue(2 in fifo)
+
+        self.assertEqual(1, fifo.length())
+        self.assertEqual(2, fifo.element())
+        fifo.add(4)
+        self.assertEqual(2, fifo.pop())
+        self.assertEqual(4, fifo.pop())
+        self.assertTrue(fifo.is_empty())
+
 class TestPriorityQueue(unittest.TestCase):
     class TestComparator(Comparator):
         def compare(self, first, second):
@@ -162,6 +214,100 @@ class TestPriorityQueue(unittest.TestCase):
         self.assertEqual(10, priorityQueue.pop())
         self.assertEqual(5, priorityQueue.pop())
 
+    def test_element_skips_removed(self):
+        priorityQueue = PriorityQueue(TestPriorityQueue.TestComparator())
+
+        priorityQueue.add(5)
+        priorityQueue.add(10)
+        priorityQueue.remove(10)
+
+        self.assertEqual(5, priorityQueue.element())
+        self.assertEqual(1, priorityQueue.length())
+
+    def test_equal_priorities_popped_in_insertion_order(self):
+        class LengthComparator(Comparator):
+            def compare(self, first, second):
+                return len(first) - len(second)
+
+        priorityQueue = PriorityQueue(LengthComparator())
+        for word in ["ab", "x", "cd", "ef", "y"]:
+            priorityQueue.add(word)
+
+        self.assertEqual(["x", "y", "ab", "cd", "ef"], [priorityQueue.pop() for i in range(5)])
+
+    def test_replace(self):
+        priorityQueue = PriorityQueue(TestPriorityQueue.TestComparator())
+
+        priorityQueue.add(5)
+        priorityQueue.add(10)
+        priorityQueue.add(1)
+
+        self.assertTrue(priorityQueue.replace(1, 20))
+        self.assertFalse(1 in priorityQueue)
+        self.assertTrue(20 in priorityQueue)
+
+        self.assertEqual(3, priorityQueue.length())
+        self.assertEqual(20, priorityQueue.pop())
+        self.assertEqual(10, priorityQueue.pop())
+        self.assertEqual(5, priorityQueue.pop())
+        self.assertTrue(priorityQueue.is_empty())
+
+    def test_key(self):
+        evaluated = []
+
+        def key(element):
+            evaluated.append(element)
+            return -element
+
+        priorityQueue = PriorityQueue(key=key)
+        for i in [5, 10, 1, 11, 3]:
+            priorityQueue.add(i)
+
+        self.assertEqual(-10, priorityQueue.get_priority(10))
+        self.assertEqual(None, priorityQueue.get_priority(50))
+        self.assertEqual([11, 10, 5, 3, 1], [priorityQueue.pop() for i in range(5)])
+        # key is calculated only once for every element
+        self.assertEqual([5, 10, 1, 11, 3], evaluated)
+        self.assertEqual(5, priorityQueue.get_key_evaluations())
+
+    def test_many_removals(self):
+        priorityQueue = PriorityQueue(TestPriorityQueue.TestComparator())
+
+        for i in range(1000):
+            priorityQueue.add(i)
+        for i in range(0, 1000, 2):
+            self.assertTrue(priorityQueue.remove(i))
+
+        self.assertEqual(500, priorityQueue.length())
+        self.assertEqual(list(range(999, 0, -2)), [priorityQueue.pop() for i in range(500)])
+        self.assertEqual(None, priorityQueue.pop())
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_get(self):
+        cache = LRUCache(2)
+        cache.put(1, "a")
+
+        self.assertEqual("a", cache.get(1))
+        self.assertEqual(None, cache.get(2))
+        self.assertEqual("b", cache.get(2, "b"))
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        # 1 becomes the most recently used entry
+        cache.get(1)
+        cache.put(3, "c")
+
+        self.assertTrue(1 in cache)
+        self.assertFalse(2 in cache)
+        self.assertTrue(3 in cache)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get_evictions())
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, LRUCache, 0)
 
 class LabeledGraphTest(unittest.TestCase):
     def test_get_vertexes(self):
@@ -208,5 +354,51 @@ class LabeledGraphTest(unittest.TestCase):
         self.assertEqual(set(lg.get_successors('s1')), set(['t1', 't2', 't3']))
         self.assertEqual(set(lg.get_successors('s2')), set(['t1', 't2']))
 
+    def test_remove_edge(self):
+        lg = LabeledGraph()
+        lg.set_edge('s1', 't1', 10)
+        lg.set_edge('s1', 't2', 10)
+        lg.remove_edge('s1', 't1')
+
+        self.assertEqual(['t2'], list(lg.get_successors('s1')))
+        self.assertEqual(None, lg.get_edge('s1', 't1'))
+        self.assertEqual([('t2', 10)], list(lg.get_edges('s1')))
+
+    def test_freeze(self):
+        lg = LabeledGraph()
+        lg.set_edge('s1', 't3', 3)
+        lg.set_edge('s1', 't1', 1)
+        lg.set_edge('s2', 't1', 2.5)
+        lg.add_vertex('s3')
+
+        flg = lg.freeze()
+        self.assertEqual(set(lg.vertexes()), set(flg.vertexes()))
+        self.assertTrue('s3' in flg.vertexes())
+        self.assertEqual(set(['t1', 't3']), set(flg.get_successors('s1')))
+        self.assertEqual([], flg.get_successors('s3'))
+        self.assertEqual(None, flg.get_successors('unknown'))
+        self.assertEqual(3, flg.get_edge('s1', 't3'))
+        self.assertEqual(2.5, flg.get_edge('s2', 't1'))
+        self.assertEqual(None, flg.get_edge('s2', 't3'))
+        self.assertEqual(None, flg.get_edge('t1', 'unknown'))
+        self.assertEqual(set([('t1', 1), ('t3', 3)]), set(flg.get_edges('s1')))
+        self.assertEqual([], flg.get_edges('unknown'))
+        self.assertEqual(6, len(flg.offsets))
+
+        # edges can be iterated more than once
+        edges = flg.get_edges('s1')
+        self.assertEqual(2, len(list(edges)))
+        self.assertEqual(2, len(list(edges)))
+
+        # labels keep their types
+        self.assertTrue(isinstance(flg.get_edge('s1', 't3'), int))
+        self.assertTrue(isinstance(flg.get_edge('s2', 't1'), float))
+        lg.set_edge('s2', 't1', 2)
+        self.assertTrue(isinstance(lg.freeze().get_edge('s2', 't1'), int))
+
+        lg.set_edge('s3', 's1', None)
+        self.assertEqual(None, lg.freeze().get_edge('s3', 's1'))
+        self.assertEqual(['s1'], lg.freeze().get_successors('s3'))
+
 if __name__ == '__main__':
     unittest.main()